@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     """Application configuration loaded from environment variables."""
 
     database_url: str = Field(..., alias="DATABASE_URL")
+    database_read_url: str | None = Field(None, alias="DATABASE_READ_URL")
     superagent_url: str = Field(..., alias="SUPERAGENT_URL")
     app_env: str = Field(APP_ENV, alias="APP_ENV")
     llm_providers_enabled: list[str] | str = Field(
@@ -37,10 +38,63 @@ class Settings(BaseSettings):
     log_file: str | None = Field(None, alias="LOG_FILE")
     memory_chat_k_default: int = Field(10, alias="MEMORY_CHAT_K_DEFAULT")
     memory_semantic_k_default: int = Field(5, alias="MEMORY_SEMANTIC_K_DEFAULT")
+    knowledge_chunk_tokens: int = Field(500, alias="KNOWLEDGE_CHUNK_TOKENS")
+    knowledge_chunk_overlap: int = Field(50, alias="KNOWLEDGE_CHUNK_OVERLAP")
+    knowledge_embedding_timeout: float = Field(2.0, alias="KNOWLEDGE_EMBEDDING_TIMEOUT")
+    knowledge_search_candidates: int = Field(20, alias="KNOWLEDGE_SEARCH_CANDIDATES")
+    knowledge_cache_size: int = Field(1024, alias="KNOWLEDGE_CACHE_SIZE")
+    knowledge_cache_ttl: float = Field(300.0, alias="KNOWLEDGE_CACHE_TTL")
+    chat_cache_size: int = Field(128, alias="CHAT_CACHE_SIZE")
+    chat_cache_max_entries: int = Field(2048, alias="CHAT_CACHE_MAX_ENTRIES")
+    chat_cache_ttl: float = Field(3600.0, alias="CHAT_CACHE_TTL")
+    chat_cache_threshold: float = Field(0.95, alias="CHAT_CACHE_THRESHOLD")
+    embedding_backend: str = Field("openai", alias="EMBEDDING_BACKEND")
+    embedding_model: str | None = Field(None, alias="EMBEDDING_MODEL")
+    embedding_batch_size: int = Field(64, alias="EMBEDDING_BATCH_SIZE")
+    embedding_batch_wait: float = Field(0.005, alias="EMBEDDING_BATCH_WAIT")
+    vector_index_precision: str = Field("half", alias="VECTOR_INDEX_PRECISION")
+    vector_index_dimensions: int = Field(1536, alias="VECTOR_INDEX_DIMENSIONS")
+    vector_rerank_candidates: int = Field(100, alias="VECTOR_RERANK_CANDIDATES")
+    vector_iterative_scan: bool = Field(False, alias="VECTOR_ITERATIVE_SCAN")
+    db_pool_size: int = Field(10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(20, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30.0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(True, alias="DB_POOL_PRE_PING")
+    db_statement_cache_size: int = Field(100, alias="DB_STATEMENT_CACHE_SIZE")
+    db_pgbouncer: bool = Field(False, alias="DB_PGBOUNCER")
+    db_replica_max_lag_seconds: float = Field(5.0, alias="DB_REPLICA_MAX_LAG_SECONDS")
+    db_replica_check_interval: float = Field(5.0, alias="DB_REPLICA_CHECK_INTERVAL")
+    execution_log_retention_months: int = Field(0, alias="EXECUTION_LOG_RETENTION_MONTHS")
+    execution_log_partitions_ahead: int = Field(2, alias="EXECUTION_LOG_PARTITIONS_AHEAD")
+    execution_log_maintenance_interval: int = Field(21600, alias="EXECUTION_LOG_MAINTENANCE_INTERVAL")
+    execution_log_queue_size: int = Field(10000, alias="EXECUTION_LOG_QUEUE_SIZE")
+    execution_log_batch_size: int = Field(500, alias="EXECUTION_LOG_BATCH_SIZE")
+    execution_log_flush_interval: float = Field(1.0, alias="EXECUTION_LOG_FLUSH_INTERVAL")
+    tracing_exporters: list[str] | str = Field([], alias="TRACING_EXPORTERS")
+    tracing_sample_rate: float = Field(1.0, alias="TRACING_SAMPLE_RATE")
+    tracing_file: str = Field("traces.jsonl", alias="TRACING_FILE")
+    tracing_flush_interval: float = Field(5.0, alias="TRACING_FLUSH_INTERVAL")
+    otlp_endpoint: str = Field("http://localhost:4318", alias="OTEL_EXPORTER_OTLP_ENDPOINT")
+    otel_service_name: str = Field("gaigentic-backend", alias="OTEL_SERVICE_NAME")
+    plugin_workers: int = Field(4, alias="PLUGIN_WORKERS")
+    plugin_timeout: float = Field(10.0, alias="PLUGIN_TIMEOUT")
+    plugin_cpu_seconds: int = Field(5, alias="PLUGIN_CPU_SECONDS")
+    plugin_memory_mb: int = Field(256, alias="PLUGIN_MEMORY_MB")
+    plugin_max_tasks_per_worker: int = Field(500, alias="PLUGIN_MAX_TASKS_PER_WORKER")
+    plugin_tenant_concurrency: int = Field(2, alias="PLUGIN_TENANT_CONCURRENCY")
+    plugin_cache_ttl: float = Field(60.0, alias="PLUGIN_CACHE_TTL")
+    plugin_batch_chunk_size: int = Field(500, alias="PLUGIN_BATCH_CHUNK_SIZE")
+    bulk_run_concurrency: int = Field(16, alias="BULK_RUN_CONCURRENCY")
+    test_suite_concurrency: int = Field(8, alias="TEST_SUITE_CONCURRENCY")
+    cassette_mode: str = Field("off", alias="CASSETTE_MODE")
+    cassette_dir: str = Field("cassettes", alias="CASSETTE_DIR")
+    cassette_overrides: bool = Field(False, alias="CASSETTE_OVERRIDES")
+    event_loop_lag_interval: float = Field(0.5, alias="EVENT_LOOP_LAG_INTERVAL")
 
-    @field_validator("llm_providers_enabled", mode="after")
+    @field_validator("llm_providers_enabled", "tracing_exporters", mode="after")
     @classmethod
-    def _split_providers(cls, v: str | list[str]) -> list[str]:
+    def _split_list(cls, v: str | list[str]) -> list[str]:
         if isinstance(v, str):
             return [p.strip() for p in v.split(",") if p.strip()]
         return v
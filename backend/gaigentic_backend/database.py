@@ -1,26 +1,190 @@
 """Database setup and session management."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from collections.abc import AsyncGenerator
+from typing import Any
+from uuid import uuid4
 
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from .config import settings
+from .services.tracing import instrument_engine
 
 logger = logging.getLogger(__name__)
 
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection"
+)
+DB_POOL_IN_USE = Gauge("db_pool_connections_in_use", "DB connections currently checked out")
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "DB connection checkouts that timed out")
+DB_REPLICA_LAG = Gauge("db_replica_lag_seconds", "Observed read replica replay lag (-1 if unknown)")
+
+
+class _CheckoutTimingMixin:
+    """Record how long callers wait to obtain a connection from the pool."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+class _TimedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class _TimedNullPool(_CheckoutTimingMixin, NullPool):
+    pass
+
+
+def _statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def _engine_options(url: str) -> dict[str, Any]:
+    """Return pool and driver options for ``url`` derived from settings."""
+
+    parsed = make_url(url)
+    options: dict[str, Any] = {"future": True}
+    if parsed.get_backend_name() == "sqlite":
+        return options
+
+    options["pool_pre_ping"] = settings.db_pool_pre_ping
+    connect_args: dict[str, Any] = {}
+    if settings.db_pgbouncer:
+        # PgBouncer owns pooling in transaction mode; server-side prepared
+        # statements cannot be reused across its backends.
+        options["poolclass"] = _TimedNullPool
+        if parsed.get_driver_name() == "asyncpg":
+            connect_args.update(
+                statement_cache_size=0,
+                prepared_statement_cache_size=0,
+                prepared_statement_name_func=_statement_name,
+            )
+    else:
+        options.update(
+            poolclass=_TimedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+        if parsed.get_driver_name() == "asyncpg":
+            connect_args["prepared_statement_cache_size"] = settings.db_statement_cache_size
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def _instrument_pool(async_engine: AsyncEngine) -> None:
+    """Track checked out connections for Prometheus."""
+
+    @event.listens_for(async_engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy) -> None:  # pragma: no cover - driver callback
+        DB_POOL_IN_USE.inc()
+
+    @event.listens_for(async_engine.sync_engine, "checkin")
+    def _on_checkin(dbapi_conn, record) -> None:  # pragma: no cover - driver callback
+        DB_POOL_IN_USE.dec()
+
+
 Base = declarative_base()
-engine = create_async_engine(settings.database_url, future=True)
+engine = create_async_engine(settings.database_url, **_engine_options(settings.database_url))
+_instrument_pool(engine)
+instrument_engine(engine)
 SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+read_engine: AsyncEngine | None = None
+if settings.database_read_url:
+    read_engine = create_async_engine(
+        settings.database_read_url, **_engine_options(settings.database_read_url)
+    )
+    _instrument_pool(read_engine)
+    instrument_engine(read_engine)
+
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class _ReadSessionRouter:
+    """Session factory for read-mostly queries.
+
+    Sessions are bound to the read replica while it is healthy and within the
+    configured lag, otherwise to the primary. Health is updated by
+    :func:`monitor_replica`; until the first successful check the primary is used.
+    """
+
+    def __init__(self, replica: AsyncEngine | None) -> None:
+        self._replica = (
+            async_sessionmaker(bind=replica, class_=AsyncSession, expire_on_commit=False)
+            if replica is not None
+            else None
+        )
+        self.healthy = False
+
+    def __call__(self) -> AsyncSession:
+        if self._replica is not None and self.healthy:
+            return self._replica()
+        return SessionLocal()
+
+
+ReadSessionLocal = _ReadSessionRouter(read_engine)
+
+
+async def check_replica_lag() -> float | None:
+    """Return replica replay lag in seconds, or ``None`` if it is unreachable."""
+
+    if read_engine is None:
+        return None
+    try:
+        async with read_engine.connect() as conn:
+            return float(await conn.scalar(_REPLICA_LAG_SQL) or 0)
+    except Exception as exc:  # pragma: no cover - runtime connectivity
+        logger.warning("Read replica check failed: %s", exc)
+        return None
+
+
+async def monitor_replica() -> None:
+    """Periodically refresh replica health for :data:`ReadSessionLocal`."""
+
+    while True:
+        lag = await check_replica_lag()
+        healthy = lag is not None and lag <= settings.db_replica_max_lag_seconds
+        if healthy != ReadSessionLocal.healthy:
+            logger.info("Read replica %s (lag=%s)", "enabled" if healthy else "bypassed", lag)
+        ReadSessionLocal.healthy = healthy
+        DB_REPLICA_LAG.set(-1 if lag is None else lag)
+        await asyncio.sleep(settings.db_replica_check_interval)
+
 def get_engine() -> AsyncEngine:
-    """Create the database engine."""
-    return create_async_engine(settings.database_url, future=True)
+    """Return the shared application database engine."""
+    return engine
 
 
 async def async_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency that yields an async SQLAlchemy session."""
     async with SessionLocal() as session:
         yield session
+
+
+async def async_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency yielding a session routed to the read replica if healthy."""
+    async with ReadSessionLocal() as session:
+        yield session
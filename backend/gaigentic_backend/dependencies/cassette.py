@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from fastapi import HTTPException, status
+
+from ..config import settings
+from ..services.cassette import MODES
+
+
+def cassette_mode(cassette: str | None = None) -> str | None:
+    """Optional ``?cassette=`` query override of the tool/LLM recording mode."""
+
+    if cassette is None:
+        return None
+    if not settings.cassette_overrides:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cassette overrides are disabled")
+    if cassette not in MODES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown cassette mode")
+    return cassette
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import uuid
 import os
@@ -13,7 +14,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from sqlalchemy import text, select
 
-from .database import engine, SessionLocal
+from .database import engine, read_engine, SessionLocal, monitor_replica
 from .routes import (
     api_router,
     agents,
@@ -26,12 +27,17 @@ from .routes import (
     plugins,
     testing,
 )
-from .routes.metrics import REQUEST_LATENCY
-from .middleware import RateLimitMiddleware, MetricsMiddleware
+from .routes.metrics import REQUEST_LATENCY, monitor_event_loop_lag
+from .middleware import CassetteMiddleware, RateLimitMiddleware, MetricsMiddleware
 from .models.user import User, RoleEnum
 from .models.tenant import Tenant
 from .config import settings
 from .services.security import hash_password
+from .services.log_partitions import run_partition_maintenance
+from .services.log_sink import execution_log_sink
+from .services.plugin_executor import plugin_pool
+from .services.tenant_partitions import ensure_tenant_partitions
+from .services.tracing import reset_request_id, set_request_id, shutdown_tracer, span, start_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -41,13 +47,27 @@ if settings.log_file and settings.app_env == "production":
 
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Ensure each request contains an ``X-Request-ID`` header."""
+    """Ensure each request has an ``X-Request-ID`` and runs inside a root trace span."""
 
     async def dispatch(self, request: Request, call_next):
-        if "X-Request-ID" not in request.headers:
+        request_id = request.headers.get("X-Request-ID")
+        if request_id is None:
             request_id = str(uuid.uuid4())
             request.scope["headers"].append((b"x-request-id", request_id.encode()))
-        response = await call_next(request)
+        token = set_request_id(request_id)
+        try:
+            with span(
+                f"{request.method} {request.url.path}",
+                traceparent=request.headers.get("traceparent"),
+                **{"http.method": request.method, "http.target": request.url.path},
+            ) as root:
+                response = await call_next(request)
+                if root is not None:
+                    root.set_attribute("http.status_code", response.status_code)
+                    response.headers["traceparent"] = root.traceparent()
+        finally:
+            reset_request_id(token)
+        response.headers["X-Request-ID"] = request_id
         return response
 
 
@@ -76,13 +96,30 @@ async def lifespan(app: FastAPI):
                     role=RoleEnum.admin,
                 )
                 session.add(user)
+                await session.flush()
+                await ensure_tenant_partitions(await session.connection(), tenant.id)
                 await session.commit()
 
-    yield
+    background = [asyncio.create_task(run_partition_maintenance()), asyncio.create_task(monitor_event_loop_lag())]
+    if read_engine is not None:
+        background.append(asyncio.create_task(monitor_replica()))
+    execution_log_sink.start()
+    start_tracer()
+    plugin_pool.start()
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        await execution_log_sink.stop()
+        await plugin_pool.close()
+        await shutdown_tracer()
 
 
 app = FastAPI(title="Gaigentic Backend", lifespan=lifespan)
 app.add_middleware(RequestIDMiddleware)
+if settings.cassette_overrides:
+    app.add_middleware(CassetteMiddleware)
 app.add_middleware(MetricsMiddleware, histogram=REQUEST_LATENCY)
 app.add_middleware(RateLimitMiddleware, max_requests=settings.rate_limit_per_minute)
 if settings.app_env == "production":
@@ -8,6 +8,8 @@ from typing import Callable, Awaitable
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from .services.cassette import MODES, use_cassette
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """Simple in-memory rate limiter per client IP."""
@@ -42,3 +44,13 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         self.histogram.labels(request.method, request.url.path).observe(time.time() - start)
         return response
 
+
+class CassetteMiddleware(BaseHTTPMiddleware):
+    """Apply the ``X-Cassette-Mode`` header to tool and LLM calls of the request."""
+
+    async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        mode = request.headers.get("X-Cassette-Mode")
+        if mode is not None and mode not in MODES:
+            return Response(status_code=400, content=f"Unknown cassette mode {mode}")
+        with use_cassette(mode):
+            return await call_next(request)
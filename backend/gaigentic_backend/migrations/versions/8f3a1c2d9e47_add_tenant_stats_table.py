@@ -0,0 +1,43 @@
+"""add tenant stats rollup table"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "8f3a1c2d9e47"
+down_revision = "1bbcb5c02f13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tenant_stats",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("agent_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("ingested_file_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("execution_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("total_duration_ms", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenant.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "ix_transactions_tenant_source_file", "transactions", ["tenant_id", "source_file_name"]
+    )
+    op.execute(
+        """
+        INSERT INTO tenant_stats (tenant_id, agent_count, ingested_file_count, execution_count, total_duration_ms)
+        SELECT t.id,
+               (SELECT count(*) FROM agent a WHERE a.tenant_id = t.id),
+               (SELECT count(DISTINCT x.source_file_name) FROM transactions x WHERE x.tenant_id = t.id),
+               (SELECT count(*) FROM execution_log e WHERE e.tenant_id = t.id),
+               (SELECT coalesce(sum(e.duration_ms), 0) FROM execution_log e WHERE e.tenant_id = t.id)
+        FROM tenant t
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_tenant_source_file", table_name="transactions")
+    op.drop_table("tenant_stats")
@@ -0,0 +1,30 @@
+"""add full-text search column to knowledge chunks"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "a6d1e3f5c7b9"
+down_revision = "f2c9a7d3e8b4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "knowledge_chunk",
+        sa.Column(
+            "text_tsv",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', text)", persisted=True),
+        ),
+    )
+    op.create_index(
+        "ix_knowledge_chunk_text_tsv", "knowledge_chunk", ["text_tsv"], postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_knowledge_chunk_text_tsv", table_name="knowledge_chunk")
+    op.drop_column("knowledge_chunk", "text_tsv")
@@ -0,0 +1,18 @@
+"""add batch flag to plugin"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "a9e5d3c7f2b4"
+down_revision = "f4c8a2e6b9d1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("plugin", sa.Column("batch", sa.Boolean(), server_default="false", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("plugin", "batch")
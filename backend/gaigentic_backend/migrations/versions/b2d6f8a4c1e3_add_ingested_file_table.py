@@ -0,0 +1,31 @@
+"""add ingested file table"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "b2d6f8a4c1e3"
+down_revision = "a9e5d3c7f2b4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingested_file",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("source_file_name", sa.String(length=255), primary_key=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenant.id"], ondelete="CASCADE"),
+    )
+    op.execute(
+        """
+        INSERT INTO ingested_file (tenant_id, source_file_name)
+        SELECT DISTINCT tenant_id, source_file_name FROM transactions
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ingested_file")
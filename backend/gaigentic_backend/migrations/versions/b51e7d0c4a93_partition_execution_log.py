@@ -0,0 +1,87 @@
+"""partition execution log by month"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "b51e7d0c4a93"
+down_revision = "8f3a1c2d9e47"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    "id, tenant_id, agent_id, workflow_snapshot, input_context, output_result, "
+    "status, duration_ms, started_at, finished_at"
+)
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("agent_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("workflow_snapshot", postgresql.JSONB(), nullable=False),
+        sa.Column("input_context", postgresql.JSONB(), nullable=False),
+        sa.Column("output_result", postgresql.JSONB(), nullable=True),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenant.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["agent_id"], ["agent.id"], ondelete="CASCADE"),
+    ]
+
+
+def upgrade() -> None:
+    op.rename_table("execution_log", "execution_log_legacy")
+    op.execute("ALTER TABLE execution_log_legacy RENAME CONSTRAINT execution_log_pkey TO execution_log_legacy_pkey")
+
+    op.create_table(
+        "execution_log",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "started_at"),
+        postgresql_partition_by="RANGE (started_at)",
+    )
+    op.execute("CREATE TABLE execution_log_default PARTITION OF execution_log DEFAULT")
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            m date;
+            last_month date;
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(started_at), now()) AT TIME ZONE 'UTC')::date
+              INTO m FROM execution_log_legacy;
+            last_month := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months')::date;
+            WHILE m <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF execution_log FOR VALUES FROM (%L) TO (%L)',
+                    'execution_log_p' || to_char(m, 'YYYYMM'),
+                    m::text || ' 00:00:00+00',
+                    (m + interval '1 month')::date::text || ' 00:00:00+00'
+                );
+                m := (m + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute(f"INSERT INTO execution_log ({_COLUMNS}) SELECT {_COLUMNS} FROM execution_log_legacy")
+    op.drop_table("execution_log_legacy")
+
+    op.create_index(
+        "ix_execution_log_tenant_agent_started",
+        "execution_log",
+        ["tenant_id", "agent_id", sa.text("started_at DESC")],
+    )
+    op.create_index(
+        "ix_execution_log_started_brin", "execution_log", ["started_at"], postgresql_using="brin"
+    )
+
+
+def downgrade() -> None:
+    op.rename_table("execution_log", "execution_log_partitioned")
+    op.create_table("execution_log", *_columns(), sa.PrimaryKeyConstraint("id", name="execution_log_flat_pkey"))
+    op.execute(f"INSERT INTO execution_log ({_COLUMNS}) SELECT {_COLUMNS} FROM execution_log_partitioned")
+    op.drop_table("execution_log_partitioned")
+    op.execute("ALTER TABLE execution_log RENAME CONSTRAINT execution_log_flat_pkey TO execution_log_pkey")
@@ -0,0 +1,144 @@
+"""partition knowledge chunks and message history by tenant"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from pgvector.sqlalchemy import Vector
+
+revision = "c3f8b1d6e2a4"
+down_revision = "a6d1e3f5c7b9"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = {
+    "knowledge_chunk": "id, tenant_id, agent_id, source_file, chunk_index, text, content_hash, embedding, created_at",
+    "message_history": "id, tenant_id, agent_id, role, content, embedding, created_at",
+}
+
+
+def _columns(table: str) -> list[sa.Column]:
+    columns = [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("agent_id", postgresql.UUID(as_uuid=True), nullable=False),
+    ]
+    if table == "knowledge_chunk":
+        columns += [
+            sa.Column("source_file", sa.String(length=255), nullable=False),
+            sa.Column("chunk_index", sa.Integer(), nullable=False),
+            sa.Column("text", sa.Text(), nullable=False),
+            sa.Column("content_hash", sa.String(length=64), nullable=False),
+            sa.Column(
+                "text_tsv",
+                postgresql.TSVECTOR(),
+                sa.Computed("to_tsvector('english', text)", persisted=True),
+            ),
+        ]
+    else:
+        columns += [
+            sa.Column("role", sa.String(length=10), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+        ]
+    return columns + [
+        sa.Column("embedding", Vector(1536), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenant.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["agent_id"], ["agent.id"], ondelete="CASCADE"),
+    ]
+
+
+def _create_tenant_partitions(table: str) -> None:
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            t uuid;
+        BEGIN
+            FOR t IN SELECT id FROM tenant LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF {table} FOR VALUES IN (%L)',
+                    '{table}_t' || replace(t::text, '-', ''),
+                    t
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+
+
+def upgrade() -> None:
+    op.drop_index("ix_knowledge_chunk_text_tsv", table_name="knowledge_chunk")
+    op.drop_constraint("uq_knowledge_chunk_agent_file_hash", "knowledge_chunk", type_="unique")
+    for table in _COLUMNS:
+        op.rename_table(table, f"{table}_legacy")
+        op.execute(f"ALTER TABLE {table}_legacy RENAME CONSTRAINT {table}_pkey TO {table}_legacy_pkey")
+
+    op.create_table(
+        "knowledge_chunk",
+        *_columns("knowledge_chunk"),
+        sa.PrimaryKeyConstraint("id", "tenant_id"),
+        sa.UniqueConstraint(
+            "tenant_id", "agent_id", "source_file", "content_hash", name="uq_knowledge_chunk_agent_file_hash"
+        ),
+        postgresql_partition_by="LIST (tenant_id)",
+    )
+    op.create_table(
+        "message_history",
+        *_columns("message_history"),
+        sa.PrimaryKeyConstraint("id", "tenant_id"),
+        postgresql_partition_by="LIST (tenant_id)",
+    )
+    for table, columns in _COLUMNS.items():
+        _create_tenant_partitions(table)
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_legacy")
+        op.drop_table(f"{table}_legacy")
+
+    # Indexes on the partitioned parents are built per partition, so each
+    # tenant's vector search walks only its own graph.
+    op.create_index(
+        "ix_knowledge_chunk_text_tsv", "knowledge_chunk", ["text_tsv"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_knowledge_chunk_embedding_hnsw",
+        "knowledge_chunk",
+        ["embedding"],
+        postgresql_using="hnsw",
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
+    op.create_index(
+        "ix_message_history_embedding_hnsw",
+        "message_history",
+        ["embedding"],
+        postgresql_using="hnsw",
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
+    op.create_index(
+        "ix_message_history_agent_created",
+        "message_history",
+        ["agent_id", sa.text("created_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    for table in _COLUMNS:
+        op.rename_table(table, f"{table}_partitioned")
+    op.execute("ALTER INDEX ix_knowledge_chunk_text_tsv RENAME TO ix_knowledge_chunk_text_tsv_partitioned")
+    op.execute(
+        "ALTER TABLE knowledge_chunk_partitioned "
+        "RENAME CONSTRAINT uq_knowledge_chunk_agent_file_hash TO uq_knowledge_chunk_partitioned"
+    )
+
+    for table, columns in _COLUMNS.items():
+        op.create_table(table, *_columns(table), sa.PrimaryKeyConstraint("id", name=f"{table}_flat_pkey"))
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_partitioned")
+        op.drop_table(f"{table}_partitioned")
+        op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {table}_flat_pkey TO {table}_pkey")
+
+    op.create_unique_constraint(
+        "uq_knowledge_chunk_agent_file_hash", "knowledge_chunk", ["agent_id", "source_file", "content_hash"]
+    )
+    op.create_index(
+        "ix_knowledge_chunk_text_tsv", "knowledge_chunk", ["text_tsv"], postgresql_using="gin"
+    )
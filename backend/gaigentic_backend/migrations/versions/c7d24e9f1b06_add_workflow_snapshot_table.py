@@ -0,0 +1,73 @@
+"""deduplicate execution log workflow snapshots"""
+from __future__ import annotations
+
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "c7d24e9f1b06"
+down_revision = "b51e7d0c4a93"
+branch_labels = None
+depends_on = None
+
+_BATCH_SIZE = 500
+
+_snapshots = sa.table(
+    "workflow_snapshot",
+    sa.column("hash", sa.String),
+    sa.column("workflow", postgresql.JSONB),
+)
+
+
+def _snapshot_hash(workflow) -> str:
+    # Must match services.workflow_snapshots.snapshot_hash so migrated
+    # snapshots are shared with new runs of the same workflow.
+    canonical = json.dumps(workflow, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workflow_snapshot",
+        sa.Column("hash", sa.String(length=64), primary_key=True, nullable=False),
+        sa.Column("workflow", postgresql.JSONB(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.add_column("execution_log", sa.Column("workflow_hash", sa.String(length=64), nullable=True))
+    conn = op.get_bind()
+    result = conn.execution_options(stream_results=True).execute(
+        sa.text("SELECT DISTINCT workflow_snapshot FROM execution_log")
+    )
+    while batch := result.fetchmany(_BATCH_SIZE):
+        conn.execute(
+            postgresql.insert(_snapshots).on_conflict_do_nothing(index_elements=["hash"]),
+            [{"hash": _snapshot_hash(workflow), "workflow": workflow} for (workflow,) in batch],
+        )
+    op.execute(
+        "UPDATE execution_log e SET workflow_hash = w.hash "
+        "FROM workflow_snapshot w WHERE w.workflow = e.workflow_snapshot"
+    )
+    op.alter_column("execution_log", "workflow_hash", nullable=False)
+    op.create_foreign_key(
+        "execution_log_workflow_hash_fkey",
+        "execution_log",
+        "workflow_snapshot",
+        ["workflow_hash"],
+        ["hash"],
+    )
+    op.drop_column("execution_log", "workflow_snapshot")
+
+
+def downgrade() -> None:
+    op.add_column("execution_log", sa.Column("workflow_snapshot", postgresql.JSONB(), nullable=True))
+    op.execute(
+        "UPDATE execution_log e SET workflow_snapshot = w.workflow "
+        "FROM workflow_snapshot w WHERE w.hash = e.workflow_hash"
+    )
+    op.alter_column("execution_log", "workflow_snapshot", nullable=False)
+    op.drop_constraint("execution_log_workflow_hash_fkey", "execution_log", type_="foreignkey")
+    op.drop_column("execution_log", "workflow_hash")
+    op.drop_table("workflow_snapshot")
@@ -0,0 +1,30 @@
+"""index embeddings at half precision"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "d8e2f4a6b1c3"
+down_revision = "c3f8b1d6e2a4"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("knowledge_chunk", "message_history")
+
+
+def upgrade() -> None:
+    # Full vectors stay in the table for exact re-ranking; only the index is
+    # halved. scripts/rebuild_vector_indexes.py applies other precisions.
+    for table in _TABLES:
+        op.drop_index(f"ix_{table}_embedding_hnsw", table_name=table)
+        op.execute(
+            f"CREATE INDEX ix_{table}_embedding_hnsw ON {table} "
+            "USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)"
+        )
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.drop_index(f"ix_{table}_embedding_hnsw", table_name=table)
+        op.execute(
+            f"CREATE INDEX ix_{table}_embedding_hnsw ON {table} USING hnsw (embedding vector_cosine_ops)"
+        )
@@ -0,0 +1,64 @@
+"""add execution step timing table"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "d93b6a2e5f18"
+down_revision = "c7d24e9f1b06"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "execution_step",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("execution_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("agent_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("node_id", sa.String(length=255), nullable=False),
+        sa.Column("tool", sa.String(length=255), nullable=True),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("start_ms", sa.Float(), nullable=False),
+        sa.Column("end_ms", sa.Float(), nullable=False),
+        sa.Column("queue_wait_ms", sa.Float(), nullable=False),
+        sa.Column("tool_ms", sa.Float(), nullable=False),
+        sa.Column("duration_ms", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenant.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["agent_id"], ["agent.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", "started_at"),
+        postgresql_partition_by="RANGE (started_at)",
+    )
+    op.execute("CREATE TABLE execution_step_default PARTITION OF execution_step DEFAULT")
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            m date := date_trunc('month', now() AT TIME ZONE 'UTC')::date;
+            last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months')::date;
+        BEGIN
+            WHILE m <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF execution_step FOR VALUES FROM (%L) TO (%L)',
+                    'execution_step_p' || to_char(m, 'YYYYMM'),
+                    m::text || ' 00:00:00+00',
+                    (m + interval '1 month')::date::text || ' 00:00:00+00'
+                );
+                m := (m + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+    op.create_index(
+        "ix_execution_step_tenant_agent_started",
+        "execution_step",
+        ["tenant_id", "agent_id", sa.text("started_at DESC")],
+    )
+    op.create_index("ix_execution_step_execution", "execution_step", ["execution_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("execution_step")
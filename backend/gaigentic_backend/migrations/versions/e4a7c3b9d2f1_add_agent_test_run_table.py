@@ -0,0 +1,38 @@
+"""add agent test run history table"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "e4a7c3b9d2f1"
+down_revision = "d93b6a2e5f18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "agent_test_run",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("agent_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("test_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("suite_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("duration_ms", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenant.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["agent_id"], ["agent.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["test_id"], ["agent_test.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "ix_agent_test_run_agent_created", "agent_test_run", ["agent_id", sa.text("created_at DESC")]
+    )
+    op.create_index(
+        "ix_agent_test_run_test_created", "agent_test_run", ["test_id", sa.text("created_at DESC")]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("agent_test_run")
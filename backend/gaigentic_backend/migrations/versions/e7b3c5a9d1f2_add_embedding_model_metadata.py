@@ -0,0 +1,40 @@
+"""record embedding model and dimensions, add tenant config"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "e7b3c5a9d1f2"
+down_revision = "d8e2f4a6b1c3"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("knowledge_chunk", "message_history")
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tenant", sa.Column("config", postgresql.JSONB(), server_default="{}", nullable=False)
+    )
+    for table in _TABLES:
+        # Everything stored so far came from OpenAI text-embedding-3-small.
+        op.add_column(
+            table,
+            sa.Column(
+                "embedding_model",
+                sa.String(length=128),
+                server_default="openai:text-embedding-3-small",
+                nullable=False,
+            ),
+        )
+        op.add_column(table, sa.Column("embedding_dim", sa.SmallInteger(), server_default="1536", nullable=False))
+        op.alter_column(table, "embedding_model", server_default=None)
+        op.alter_column(table, "embedding_dim", server_default=None)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.drop_column(table, "embedding_dim")
+        op.drop_column(table, "embedding_model")
+    op.drop_column("tenant", "config")
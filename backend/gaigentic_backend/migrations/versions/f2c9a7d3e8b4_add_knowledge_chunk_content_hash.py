@@ -0,0 +1,35 @@
+"""add content hash to knowledge chunks"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "f2c9a7d3e8b4"
+down_revision = "e4a7c3b9d2f1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("knowledge_chunk", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.execute("UPDATE knowledge_chunk SET content_hash = encode(sha256(convert_to(text, 'UTF8')), 'hex')")
+    # Re-uploads stored every chunk again; keep the oldest copy of each.
+    op.execute(
+        """
+        DELETE FROM knowledge_chunk a
+        USING knowledge_chunk b
+        WHERE a.agent_id = b.agent_id
+          AND a.source_file = b.source_file
+          AND a.content_hash = b.content_hash
+          AND (a.created_at, a.id) > (b.created_at, b.id)
+        """
+    )
+    op.alter_column("knowledge_chunk", "content_hash", nullable=False)
+    op.create_unique_constraint(
+        "uq_knowledge_chunk_agent_file_hash", "knowledge_chunk", ["agent_id", "source_file", "content_hash"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_knowledge_chunk_agent_file_hash", "knowledge_chunk", type_="unique")
+    op.drop_column("knowledge_chunk", "content_hash")
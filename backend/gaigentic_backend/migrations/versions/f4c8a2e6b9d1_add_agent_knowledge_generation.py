@@ -0,0 +1,20 @@
+"""add knowledge generation to agent"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "f4c8a2e6b9d1"
+down_revision = "e7b3c5a9d1f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "agent", sa.Column("knowledge_generation", sa.Integer(), server_default="0", nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("agent", "knowledge_generation")
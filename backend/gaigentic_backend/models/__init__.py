@@ -5,12 +5,17 @@ from .agent import Agent
 from .transaction import Transaction
 from .chat_session import ChatSession
 from .execution_log import ExecutionLog
+from .execution_step import ExecutionStep
 from .user import User
 from .template import Template
 from .knowledge_chunk import KnowledgeChunk
 from .plugin import Plugin
 from .agent_test import AgentTest
+from .agent_test_run import AgentTestRun
 from .message_history import MessageHistory
+from .tenant_stats import TenantStats
+from .ingested_file import IngestedFile
+from .workflow_snapshot import WorkflowSnapshot
 
 __all__ = [
     "Tenant",
@@ -18,10 +23,15 @@ __all__ = [
     "Transaction",
     "ChatSession",
     "ExecutionLog",
+    "ExecutionStep",
     "User",
     "Template",
     "KnowledgeChunk",
     "Plugin",
     "AgentTest",
+    "AgentTestRun",
     "MessageHistory",
+    "TenantStats",
+    "IngestedFile",
+    "WorkflowSnapshot",
 ]
@@ -3,14 +3,18 @@ from __future__ import annotations
 
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, func
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from ..database import Base
 
 
 class Agent(Base):
-    """Agent entity."""
+    """Agent entity.
+
+    ``knowledge_generation`` is bumped whenever the agent's knowledge chunks
+    change, invalidating cached search results (see services.knowledge_cache).
+    """
 
     __tablename__ = "agent"
 
@@ -18,4 +22,5 @@ class Agent(Base):
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(255), nullable=False)
     config = Column(JSONB, nullable=False)
+    knowledge_generation = Column(Integer, nullable=False, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
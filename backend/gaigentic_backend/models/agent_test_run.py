@@ -0,0 +1,31 @@
+"""Agent test run history model."""
+from __future__ import annotations
+
+from uuid import uuid4
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class AgentTestRun(Base):
+    """Outcome of one execution of an agent test.
+
+    Runs started together by the suite endpoint share a ``suite_id``.
+    """
+
+    __tablename__ = "agent_test_run"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
+    agent_id = Column(UUID(as_uuid=True), ForeignKey("agent.id", ondelete="CASCADE"), nullable=False)
+    test_id = Column(UUID(as_uuid=True), ForeignKey("agent_test.id", ondelete="CASCADE"), nullable=False)
+    suite_id = Column(UUID(as_uuid=True), nullable=True)
+    status = Column(String(16), nullable=False)
+    duration_ms = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+Index("ix_agent_test_run_agent_created", AgentTestRun.agent_id, AgentTestRun.created_at.desc())
+Index("ix_agent_test_run_test_created", AgentTestRun.test_id, AgentTestRun.created_at.desc())
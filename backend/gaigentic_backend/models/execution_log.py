@@ -3,24 +3,38 @@ from __future__ import annotations
 
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from ..database import Base
 
 
 class ExecutionLog(Base):
-    """Record of a workflow execution."""
+    """Record of a workflow execution.
+
+    The table is range partitioned by month on ``started_at``; partitions are
+    created and expired by ``services.log_partitions``.
+    """
 
     __tablename__ = "execution_log"
+    __table_args__ = {"postgresql_partition_by": "RANGE (started_at)"}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
     agent_id = Column(UUID(as_uuid=True), ForeignKey("agent.id", ondelete="CASCADE"), nullable=False)
-    workflow_snapshot = Column(JSONB, nullable=False)
+    workflow_hash = Column(String(64), ForeignKey("workflow_snapshot.hash"), nullable=False)
     input_context = Column(JSONB, nullable=False)
     output_result = Column(JSONB, nullable=True)
     status = Column(String(32), nullable=False)
     duration_ms = Column(Integer, nullable=False)
-    started_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     finished_at = Column(DateTime(timezone=True), nullable=False)
+
+
+Index(
+    "ix_execution_log_tenant_agent_started",
+    ExecutionLog.tenant_id,
+    ExecutionLog.agent_id,
+    ExecutionLog.started_at.desc(),
+)
+Index("ix_execution_log_started_brin", ExecutionLog.started_at, postgresql_using="brin")
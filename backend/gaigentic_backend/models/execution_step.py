@@ -0,0 +1,43 @@
+"""Per-node workflow execution timing model."""
+from __future__ import annotations
+
+from uuid import uuid4
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class ExecutionStep(Base):
+    """Timing of a single workflow node within an execution.
+
+    Offsets are milliseconds from the start of the run. Partitioned by month on
+    ``started_at`` alongside ``execution_log``.
+    """
+
+    __tablename__ = "execution_step"
+    __table_args__ = {"postgresql_partition_by": "RANGE (started_at)"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    execution_id = Column(UUID(as_uuid=True), nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
+    agent_id = Column(UUID(as_uuid=True), ForeignKey("agent.id", ondelete="CASCADE"), nullable=False)
+    node_id = Column(String(255), nullable=False)
+    tool = Column(String(255), nullable=True)
+    status = Column(String(32), nullable=False)
+    started_at = Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    start_ms = Column(Float, nullable=False)
+    end_ms = Column(Float, nullable=False)
+    queue_wait_ms = Column(Float, nullable=False)
+    tool_ms = Column(Float, nullable=False)
+    duration_ms = Column(Float, nullable=False)
+
+
+Index(
+    "ix_execution_step_tenant_agent_started",
+    ExecutionStep.tenant_id,
+    ExecutionStep.agent_id,
+    ExecutionStep.started_at.desc(),
+)
+Index("ix_execution_step_execution", ExecutionStep.execution_id)
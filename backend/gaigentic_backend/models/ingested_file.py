@@ -0,0 +1,17 @@
+"""Ingested transaction file model."""
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class IngestedFile(Base):
+    """One row per distinct source file a tenant has ingested transactions from."""
+
+    __tablename__ = "ingested_file"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), primary_key=True)
+    source_file_name = Column(String(255), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
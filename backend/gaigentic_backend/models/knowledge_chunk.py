@@ -2,23 +2,51 @@ from __future__ import annotations
 
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from pgvector.sqlalchemy import Vector
 
 from ..database import Base
 
 
 class KnowledgeChunk(Base):
-    """Stored text chunk for retrieval."""
+    """Stored text chunk for retrieval.
+
+    The table is list partitioned by ``tenant_id``; partitions are created by
+    ``services.tenant_partitions``. The HNSW index on ``embedding`` is built at
+    the precision configured in ``services.vector_index``.
+    """
 
     __tablename__ = "knowledge_chunk"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "agent_id", "source_file", "content_hash", name="uq_knowledge_chunk_agent_file_hash"
+        ),
+        Index("ix_knowledge_chunk_text_tsv", "text_tsv", postgresql_using="gin"),
+        {"postgresql_partition_by": "LIST (tenant_id)"},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), primary_key=True)
     agent_id = Column(UUID(as_uuid=True), ForeignKey("agent.id", ondelete="CASCADE"), nullable=False)
     source_file = Column(String(255), nullable=False)
     chunk_index = Column(Integer, nullable=False)
     text = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    text_tsv = Column(TSVECTOR, Computed("to_tsvector('english', text)", persisted=True))
     embedding = Column(Vector(1536), nullable=False)
+    embedding_model = Column(String(128), nullable=False)
+    embedding_dim = Column(SmallInteger, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, SmallInteger, String, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from pgvector.sqlalchemy import Vector
 
@@ -10,14 +10,25 @@ from ..database import Base
 
 
 class MessageHistory(Base):
-    """Persistent chat message for agent memory."""
+    """Persistent chat message for agent memory.
+
+    The table is list partitioned by ``tenant_id``; partitions are created by
+    ``services.tenant_partitions``. The HNSW index on ``embedding`` is built at
+    the precision configured in ``services.vector_index``.
+    """
 
     __tablename__ = "message_history"
+    __table_args__ = (
+        Index("ix_message_history_agent_created", "agent_id", text("created_at DESC")),
+        {"postgresql_partition_by": "LIST (tenant_id)"},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), primary_key=True)
     agent_id = Column(UUID(as_uuid=True), ForeignKey("agent.id", ondelete="CASCADE"), nullable=False)
     role = Column(String(10), nullable=False)
     content = Column(Text, nullable=False)
     embedding = Column(Vector(1536), nullable=False)
+    embedding_model = Column(String(128), nullable=False)
+    embedding_dim = Column(SmallInteger, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
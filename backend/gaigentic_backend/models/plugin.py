@@ -9,7 +9,11 @@ from ..database import Base
 
 
 class Plugin(Base):
-    """Custom plugin tool defined by a tenant."""
+    """Custom plugin tool defined by a tenant.
+
+    ``batch`` plugins read a chunk of records from ``inputs`` or ``columns``
+    and set ``outputs``; the others map one ``input`` to one ``output``.
+    """
 
     __tablename__ = "plugin"
     __table_args__ = (
@@ -23,4 +27,5 @@ class Plugin(Base):
     code = Column(Text, nullable=False)
     created_by = Column(UUID(as_uuid=True), ForeignKey("user_account.id", ondelete="SET NULL"))
     is_active = Column(Boolean, nullable=False, server_default="true")
+    batch = Column(Boolean, nullable=False, server_default="false")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
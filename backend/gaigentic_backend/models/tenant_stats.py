@@ -0,0 +1,20 @@
+"""Per-tenant statistics rollup model."""
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class TenantStats(Base):
+    """Incrementally maintained counters backing the tenant dashboard."""
+
+    __tablename__ = "tenant_stats"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), primary_key=True)
+    agent_count = Column(Integer, nullable=False, server_default="0")
+    ingested_file_count = Column(Integer, nullable=False, server_default="0")
+    execution_count = Column(BigInteger, nullable=False, server_default="0")
+    total_duration_ms = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, String, func
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID
 
 from ..database import Base
@@ -12,6 +12,9 @@ class Transaction(Base):
     """Financial transaction record."""
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_tenant_source_file", "tenant_id", "source_file_name"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,17 @@
+"""Content-addressed workflow snapshot model."""
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from ..database import Base
+
+
+class WorkflowSnapshot(Base):
+    """Workflow definition stored once and referenced by its content hash."""
+
+    __tablename__ = "workflow_snapshot"
+
+    hash = Column(String(64), primary_key=True)
+    workflow = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
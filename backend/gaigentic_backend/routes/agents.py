@@ -3,24 +3,32 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from ..database import async_session
 from ..models.agent import Agent
-from ..schemas.agent import AgentCreate, AgentOut
+from ..config import settings
+from ..schemas.agent import AgentCreate, AgentOut, BulkRunRequest
 from ..dependencies.auth import get_current_tenant_id, require_role
+from ..dependencies.cassette import cassette_mode
 from ..services.tool_executor import execute_tool
+from ..services.embedding import backend_for
 from ..services.flow_validator import validate_workflow
 from ..services.workflow_translator import translate_to_superagent
 from ..services.superagent_client import get_superagent_client
 from ..services.logging_executor import run_logged_workflow
-from ..services.workflow_executor import run_workflow_stream
+from ..services.workflow_executor import build_plan, run_workflow_stream
+from ..services.bulk_executor import iterate_inputs, run_bulk, transaction_inputs
+from ..services.tenant_stats import bump_tenant_stats
+from ..services.cassette import use_cassette
 from ..schemas.chat import WorkflowDraft
 import httpx
 
@@ -38,9 +46,14 @@ async def create_agent(
 ) -> AgentOut:
     """Create a new agent tied to the current tenant."""
 
+    try:
+        backend_for(payload.config, None)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
     agent = Agent(name=payload.name, config=payload.config, tenant_id=tenant_id)
     session.add(agent)
     try:
+        await bump_tenant_stats(session, tenant_id, agents=1)
         await session.commit()
         await session.refresh(agent)
     except SQLAlchemyError as exc:  # pragma: no cover - runtime path
@@ -154,6 +167,40 @@ async def execute_workflow(
     return await run_logged_workflow(agent_id, input_context, tenant_id)
 
 
+@router.post("/{agent_id}/run/batch")
+async def execute_workflow_batch(
+    agent_id: UUID,
+    payload: BulkRunRequest,
+    session: AsyncSession = Depends(async_session),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    _user=Depends(require_role({"admin", "user"})),
+) -> StreamingResponse:
+    """Execute the workflow for many inputs and stream results as NDJSON.
+
+    Each line is ``{"index", "status", "output" | "error"}`` in completion order,
+    followed by a final ``{"summary": ...}`` line.
+    """
+
+    agent = await session.get(Agent, agent_id)
+    if agent is None or agent.tenant_id != tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
+    plan = build_plan(agent)
+
+    if payload.inputs is not None:
+        inputs = iterate_inputs(payload.inputs)
+        log_context = {"count": len(payload.inputs)}
+    else:
+        inputs = transaction_inputs(tenant_id, payload.source_file)
+        log_context = {"source_file": payload.source_file}
+    concurrency = min(payload.concurrency or settings.bulk_run_concurrency, settings.bulk_run_concurrency)
+
+    async def ndjson():
+        async for event in run_bulk(agent, plan, inputs, tenant_id, concurrency, log_context):
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @router.post("/{agent_id}/simulate")
 async def simulate_workflow(
     agent_id: UUID,
@@ -161,6 +208,7 @@ async def simulate_workflow(
     session: AsyncSession = Depends(async_session),
     tenant_id: UUID = Depends(get_current_tenant_id),
     _user=Depends(require_role({"admin", "user"})),
+    cassette: str | None = Depends(cassette_mode),
 ) -> dict:
     """Execute the workflow without persistence and return trace."""
 
@@ -169,8 +217,9 @@ async def simulate_workflow(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
 
     trace: List[dict] = []
-    async for step in run_workflow_stream(agent_id, input_context, tenant_id):
-        trace.append(step)
+    with use_cassette(cassette):
+        async for step in run_workflow_stream(agent_id, input_context, tenant_id, agent):
+            trace.append(step)
     return {"trace": trace}
 
 
@@ -4,15 +4,18 @@ from __future__ import annotations
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import async_session
+from ..database import async_read_session
 from ..models.agent import Agent
-from ..models.transaction import Transaction
 from ..models.execution_log import ExecutionLog
+from ..models.execution_step import ExecutionStep
+from ..models.tenant_stats import TenantStats
+from ..schemas.chat import WorkflowDraft
 from ..dependencies.auth import get_current_tenant_id, require_role
+from ..services.profiling import critical_path, summarize_steps
 
 router = APIRouter()
 
@@ -20,7 +23,7 @@ router = APIRouter()
 @router.get("/agents/{agent_id}/runs")
 async def get_agent_runs(
     agent_id: UUID,
-    session: AsyncSession = Depends(async_session),
+    session: AsyncSession = Depends(async_read_session),
     tenant_id: UUID = Depends(get_current_tenant_id),
     _user=Depends(require_role({"admin", "user", "readonly"})),
 ) -> List[dict]:
@@ -39,10 +42,73 @@ async def get_agent_runs(
     return [dict(r) for r in result.all()]
 
 
+@router.get("/agents/{agent_id}/profile")
+async def get_agent_profile(
+    agent_id: UUID,
+    runs: int = Query(50, ge=1, le=500),
+    session: AsyncSession = Depends(async_read_session),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    _user=Depends(require_role({"admin", "user", "readonly"})),
+) -> dict:
+    """Return per-node latency percentiles and the critical path over recent runs."""
+
+    agent = await session.get(Agent, agent_id)
+    if agent is None or agent.tenant_id != tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
+
+    recent = await session.execute(
+        select(ExecutionLog.id, ExecutionLog.started_at)
+        .where(ExecutionLog.agent_id == agent_id, ExecutionLog.tenant_id == tenant_id)
+        .order_by(ExecutionLog.started_at.desc())
+        .limit(runs)
+    )
+    recent_runs = recent.all()
+    steps = []
+    if recent_runs:
+        result = await session.execute(
+            select(
+                ExecutionStep.node_id,
+                ExecutionStep.tool,
+                ExecutionStep.status,
+                ExecutionStep.duration_ms,
+                ExecutionStep.queue_wait_ms,
+                ExecutionStep.tool_ms,
+            ).where(
+                ExecutionStep.execution_id.in_([r.id for r in recent_runs]),
+                ExecutionStep.started_at >= min(r.started_at for r in recent_runs),
+            )
+        )
+        steps = [dict(r._mapping) for r in result.all()]
+    nodes = summarize_steps(steps)
+
+    path: dict = {"path": [], "length_ms": 0.0, "slack_ms": {}}
+    workflow_data = (agent.config or {}).get("workflow")
+    if workflow_data:
+        try:
+            draft = WorkflowDraft.model_validate(workflow_data)
+            path = critical_path(
+                [n.id for n in draft.nodes],
+                [(e.source, e.target) for e in draft.edges],
+                {nid: stats["duration_ms"]["p50"] for nid, stats in nodes.items()},
+            )
+        except ValueError:
+            pass
+    for nid, slack in path["slack_ms"].items():
+        if nid in nodes:
+            nodes[nid]["slack_ms"] = slack
+
+    return {
+        "runs": len(recent_runs),
+        "nodes": nodes,
+        "critical_path": path["path"],
+        "critical_path_ms": path["length_ms"],
+    }
+
+
 @router.get("/tenants/{tenant_id}/stats")
 async def tenant_stats(
     tenant_id: UUID,
-    session: AsyncSession = Depends(async_session),
+    session: AsyncSession = Depends(async_read_session),
     current: UUID = Depends(get_current_tenant_id),
     _user=Depends(require_role({"admin", "user", "readonly"})),
 ) -> dict:
@@ -51,26 +117,14 @@ async def tenant_stats(
     if tenant_id != current:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    agent_count = await session.scalar(
-        select(func.count(Agent.id)).where(Agent.tenant_id == tenant_id)
-    )
-    file_count = await session.scalar(
-        select(func.count(func.distinct(Transaction.source_file_name))).where(
-            Transaction.tenant_id == tenant_id
-        )
-    )
-    exec_count = await session.scalar(
-        select(func.count(ExecutionLog.id)).where(ExecutionLog.tenant_id == tenant_id)
-    )
-    avg_duration = await session.scalar(
-        select(func.coalesce(func.avg(ExecutionLog.duration_ms), 0)).where(
-            ExecutionLog.tenant_id == tenant_id
-        )
-    )
+    stats = await session.get(TenantStats, tenant_id)
+    if stats is None:
+        return {"agents": 0, "ingested_files": 0, "executions": 0, "avg_duration_ms": 0}
+    executions = stats.execution_count or 0
     return {
-        "agents": agent_count or 0,
-        "ingested_files": file_count or 0,
-        "executions": exec_count or 0,
-        "avg_duration_ms": int(avg_duration or 0),
+        "agents": stats.agent_count,
+        "ingested_files": stats.ingested_file_count,
+        "executions": executions,
+        "avg_duration_ms": int(stats.total_duration_ms / executions) if executions else 0,
     }
 
@@ -11,6 +11,7 @@ from ..database import async_session
 from ..models.user import User, RoleEnum
 from ..models.tenant import Tenant
 from ..services.security import create_access_token, hash_password, verify_password
+from ..services.tenant_partitions import ensure_tenant_partitions
 from ..dependencies.auth import get_current_user
 
 router = APIRouter()
@@ -40,16 +41,21 @@ async def register_user(
     existing = await session.scalar(select(User).where(User.email == payload.email))
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
+    password_hash = hash_password(payload.password)
     tenant = Tenant(name=payload.tenant_name)
     session.add(tenant)
     await session.flush()
     user = User(
         tenant_id=tenant.id,
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
         role=RoleEnum.admin,
     )
     session.add(user)
+    await session.flush()
+    # Attaching partitions locks the default partitions; do it last so the
+    # commit follows immediately.
+    await ensure_tenant_partitions(await session.connection(), tenant.id)
     await session.commit()
     token = create_access_token({"sub": str(user.id)})
     return TokenResponse(access_token=token)
@@ -13,8 +13,10 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import async_session
+from ..models.agent import Agent
 from ..models.chat_session import ChatSession
 from ..schemas.chat import ChatRequest, ChatResponse
+from ..services.embedding import backend_for_agent
 from ..services.flow_validator import validate_workflow
 from ..services.llm_chat import ChatSME
 from ..services.memory_adapter import store_message
@@ -35,8 +37,14 @@ async def chat_endpoint(
     tenant_id: UUID = Depends(get_current_tenant_id),
     _user=Depends(require_role({"admin", "user"})),
 ) -> ChatResponse:
-    """Handle chat messages and optionally store workflow drafts."""
+    """Handle chat messages and optionally store workflow drafts.
 
+    With ``agent_id``, answers to opening questions are cached per agent.
+    """
+
+    agent = await session.get(Agent, agent_id) if agent_id else None
+    if agent is not None and agent.tenant_id != tenant_id:
+        agent = None
     cfg = payload.llm
     llm = ChatSME(
         provider=cfg.provider.value if cfg else None,
@@ -45,7 +53,8 @@ async def chat_endpoint(
         max_tokens=cfg.max_tokens if cfg else None,
     )
     try:
-        response = await llm.chat(payload.messages)
+        backend = await backend_for_agent(session, agent.id) if agent is not None else None
+        response = await llm.chat(payload.messages, agent=agent, backend=backend)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover - runtime errors
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import async_session
 from ..models.transaction import Transaction
 from ..services.file_parser import parse_file
+from ..services.tenant_stats import record_ingested_file
 from ..dependencies.auth import get_current_tenant_id, require_role
 
 logger = logging.getLogger(__name__)
@@ -28,6 +29,7 @@ async def ingest_transactions(
     """Upload a CSV or XLSX file and store transactions."""
 
     records = parse_file(file)
+    source_file_name = file.filename or ""
     transactions: List[Transaction] = []
     for rec in records:
         transactions.append(
@@ -37,12 +39,14 @@ async def ingest_transactions(
                 amount=rec["amount"],
                 description=rec.get("description"),
                 type=rec.get("type"),
-                source_file_name=file.filename or "",
+                source_file_name=source_file_name,
             )
         )
 
-    session.add_all(transactions)
     try:
+        session.add_all(transactions)
+        if transactions:
+            await record_ingested_file(session, tenant_id, source_file_name)
         await session.commit()
     except SQLAlchemyError as exc:  # pragma: no cover - runtime path
         logger.exception("Failed to ingest transactions: %s", exc)
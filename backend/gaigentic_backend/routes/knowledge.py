@@ -2,20 +2,23 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import List
+from typing import List, Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from ..database import async_session
+from ..database import async_read_session, async_session
 from ..models.agent import Agent
 from ..models.knowledge_chunk import KnowledgeChunk
 from ..dependencies.auth import get_current_tenant_id, require_role
 from ..services.file_loader import load_file
-from ..services.chunking import split_text
-from ..services.embedding import get_embedding
+from ..config import settings
+from ..services.chunking import iter_chunks
+from ..services import knowledge_cache
+from ..services.embedding import EmbeddingMismatchError, backend_for_agent
+from ..services.knowledge_search import hybrid_search
+from ..services.knowledge_store import sync_knowledge_file
 
 logger = logging.getLogger(__name__)
 
@@ -38,25 +41,17 @@ async def upload_knowledge(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
 
     text = await load_file(file)
-    parts = split_text(text, max_tokens=500)
-
-    records: List[KnowledgeChunk] = []
-    for idx, chunk in enumerate(parts):
-        embedding = await get_embedding(chunk)
-        records.append(
-            KnowledgeChunk(
-                tenant_id=tenant_id,
-                agent_id=agent_id,
-                source_file=file.filename or "",
-                chunk_index=idx,
-                text=chunk,
-                embedding=embedding,
-            )
-        )
-
-    session.add_all(records)
+    chunks = iter_chunks(text, settings.knowledge_chunk_tokens, settings.knowledge_chunk_overlap)
+
     try:
+        backend = await backend_for_agent(session, agent_id)
+        result = await sync_knowledge_file(session, tenant_id, agent_id, file.filename or "", chunks, backend)
+        if result["embedded"] or result["moved"] or result["deleted"]:
+            await knowledge_cache.bump_generation(session, agent_id)
         await session.commit()
+    except EmbeddingMismatchError as exc:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover - runtime path
         logger.exception("Failed to store knowledge chunks: %s", exc)
         await session.rollback()
@@ -64,34 +59,59 @@ async def upload_knowledge(
 
     elapsed = int((time.time() - start) * 1000)
     logger.info(
-        "Ingested %s chunks from %s for agent %s in %sms", len(records), file.filename, agent_id, elapsed
+        "Synced %s chunks from %s for agent %s in %sms (%s embedded, %s deleted)",
+        result["chunks"],
+        file.filename,
+        agent_id,
+        elapsed,
+        result["embedded"],
+        result["deleted"],
     )
-    return {"chunks": len(records)}
+    return result
 
 
 @router.get("/agents/{agent_id}/knowledge/search")
 async def search_knowledge(
     agent_id: UUID,
     q: str,
-    session: AsyncSession = Depends(async_session),
+    mode: Literal["hybrid", "lexical", "vector"] = "hybrid",
+    session: AsyncSession = Depends(async_read_session),
     tenant_id: UUID = Depends(get_current_tenant_id),
     _user=Depends(require_role({"admin", "user", "readonly"})),
 ) -> List[dict]:
-    """Return top 5 knowledge chunks most similar to the query."""
+    """Return the top 5 knowledge chunks for the query.
+
+    ``hybrid`` fuses full-text and vector rankings, falling back to full-text
+    results when the query cannot be embedded in time. Results are cached per
+    agent until its knowledge changes; fallback results are not cached.
+    """
 
     agent = await session.get(Agent, agent_id)
     if agent is None or agent.tenant_id != tenant_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
 
-    query_vec = await get_embedding(q)
-    stmt = (
-        select(KnowledgeChunk.source_file, KnowledgeChunk.chunk_index, KnowledgeChunk.text)
-        .where(
-            KnowledgeChunk.agent_id == agent_id,
-            KnowledgeChunk.tenant_id == tenant_id,
-        )
-        .order_by(KnowledgeChunk.embedding.cosine_distance(query_vec))
-        .limit(5)
+    cache_key = knowledge_cache.cache_key(agent_id, agent.knowledge_generation, mode, q)
+    cached = knowledge_cache.get_cached(cache_key)
+    if cached is not None:
+        return cached
+
+    degraded: List[bool] = []
+    rows = await hybrid_search(
+        session,
+        q,
+        KnowledgeChunk.id,
+        KnowledgeChunk.source_file,
+        KnowledgeChunk.chunk_index,
+        KnowledgeChunk.text,
+        agent_id=agent_id,
+        tenant_id=tenant_id,
+        limit=5,
+        key=lambda row: row.id,
+        mode=mode,
+        backend=await backend_for_agent(session, agent_id),
+        on_fallback=lambda: degraded.append(True),
     )
-    result = await session.execute(stmt)
-    return [dict(r) for r in result.all()]
+    results = [{"source_file": r.source_file, "chunk_index": r.chunk_index, "text": r.text} for r in rows]
+    if not degraded:
+        knowledge_cache.store(cache_key, results)
+    return results
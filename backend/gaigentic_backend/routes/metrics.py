@@ -1,15 +1,17 @@
 """Prometheus metrics endpoint."""
 from __future__ import annotations
 
+import asyncio
 import time
 from fastapi import APIRouter, Depends, Response
 from prometheus_client import CONTENT_TYPE_LATEST, Gauge, Histogram, generate_latest
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import async_session
+from ..config import settings
+from ..database import async_read_session
 from ..models.agent import Agent
-from ..models.execution_log import ExecutionLog
+from ..models.tenant_stats import TenantStats
 
 START_TIME = time.time()
 REQUEST_LATENCY = Histogram(
@@ -18,15 +20,30 @@ REQUEST_LATENCY = Histogram(
 UPTIME = Gauge("uptime_seconds", "Application uptime")
 AGENTS = Gauge("agents_total", "Number of agents")
 EXECUTIONS = Gauge("executions_total", "Number of executions")
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event loop wake-up and when it ran",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
 
 router = APIRouter()
 
 
+async def monitor_event_loop_lag() -> None:
+    """Sample how late the event loop runs timers, a direct measure of blocking work."""
+
+    interval = settings.event_loop_lag_interval
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, time.perf_counter() - start - interval))
+
+
 @router.get("/metrics")
-async def metrics(session: AsyncSession = Depends(async_session)) -> Response:
+async def metrics(session: AsyncSession = Depends(async_read_session)) -> Response:
     """Return Prometheus metrics."""
     AGENTS.set(await session.scalar(select(func.count(Agent.id))) or 0)
-    EXECUTIONS.set(await session.scalar(select(func.count(ExecutionLog.id))) or 0)
+    EXECUTIONS.set(await session.scalar(select(func.sum(TenantStats.execution_count))) or 0)
     UPTIME.set(int(time.time() - START_TIME))
     data = generate_latest()
     return Response(content=data, media_type=CONTENT_TYPE_LATEST)
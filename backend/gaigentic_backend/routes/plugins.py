@@ -10,9 +10,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import async_session
 from ..models.plugin import Plugin
-from ..schemas.plugin import PluginCreate, PluginOut
+from ..models.transaction import Transaction
+from ..schemas.plugin import PluginBatchOut, PluginBatchRequest, PluginCreate, PluginOut
 from ..dependencies.auth import get_current_tenant_id, require_role
-from ..services.plugin_executor import run_plugin
+from ..services.plugin_executor import run_plugin, run_plugin_batch, validate_plugin
+from ..services.plugin_registry import invalidate_plugin, register_plugin
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +34,11 @@ async def create_plugin(
     if exists:
         raise HTTPException(status_code=400, detail="Plugin name already exists")
     try:
-        await run_plugin(payload.code, {})
+        digest = validate_plugin(payload.code)
+        if payload.batch:
+            await run_plugin_batch(payload.code, [{}], tenant_id, digest, batch=True)
+        else:
+            await run_plugin(payload.code, {}, tenant_id, digest)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     plugin = Plugin(
@@ -42,6 +48,7 @@ async def create_plugin(
         code=payload.code,
         created_by=user.id,
         is_active=True,
+        batch=payload.batch,
     )
     session.add(plugin)
     try:
@@ -51,6 +58,7 @@ async def create_plugin(
         logger.exception("Failed to create plugin: %s", exc)
         await session.rollback()
         raise HTTPException(status_code=500, detail="Could not create plugin") from exc
+    register_plugin(plugin)
     return PluginOut.model_validate(plugin)
 
 
@@ -81,12 +89,56 @@ async def test_plugin(
     if not plugin.is_active:
         raise HTTPException(status_code=400, detail="Plugin disabled")
     try:
-        return await run_plugin(plugin.code, input_data)
+        entry = register_plugin(plugin)
+        return await run_plugin(entry.code, input_data, tenant_id, entry.digest)
     except Exception as exc:  # pragma: no cover - runtime failure
         logger.exception("Plugin test failed: %s", exc)
         return {"error": str(exc)}
 
 
+@router.post("/{plugin_id}/batch", response_model=PluginBatchOut)
+async def run_plugin_over_records(
+    plugin_id: UUID,
+    payload: PluginBatchRequest,
+    session: AsyncSession = Depends(async_session),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    _user=Depends(require_role({"admin", "user"})),
+) -> PluginBatchOut:
+    """Apply a plugin to many records in one call."""
+
+    plugin = await session.get(Plugin, plugin_id)
+    if plugin is None or plugin.tenant_id != tenant_id:
+        raise HTTPException(status_code=404, detail="Plugin not found")
+    if not plugin.is_active:
+        raise HTTPException(status_code=400, detail="Plugin disabled")
+    records = payload.records
+    if records is None:
+        result = await session.execute(
+            select(
+                Transaction.id, Transaction.date, Transaction.amount, Transaction.type, Transaction.description
+            ).where(Transaction.tenant_id == tenant_id, Transaction.source_file_name == payload.source_file)
+        )
+        records = [
+            {
+                "id": str(row.id),
+                "date": row.date.isoformat(),
+                "amount": row.amount,
+                "type": row.type,
+                "description": row.description,
+            }
+            for row in result
+        ]
+    entry = register_plugin(plugin)
+    try:
+        results = await run_plugin_batch(
+            entry.code, records, tenant_id, entry.digest, batch=entry.batch, columnar=payload.columnar
+        )
+    except Exception as exc:  # pragma: no cover - runtime failure
+        logger.exception("Plugin batch failed: %s", exc)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return PluginBatchOut(count=len(results), results=results)
+
+
 @router.post("/{plugin_id}/disable")
 async def toggle_plugin(
     plugin_id: UUID,
@@ -104,6 +156,7 @@ async def toggle_plugin(
         logger.exception("Failed to toggle plugin: %s", exc)
         await session.rollback()
         raise HTTPException(status_code=500, detail="Could not update plugin") from exc
+    invalidate_plugin(plugin.id)
     status_str = "enabled" if plugin.is_active else "disabled"
     return {"status": status_str}
 
@@ -123,4 +176,5 @@ async def purge_plugin(
         raise HTTPException(status_code=404, detail="Plugin not found")
     await session.delete(plugin)
     await session.commit()
+    invalidate_plugin(plugin_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -15,6 +15,7 @@ from ..models.agent import Agent
 from ..schemas.template import TemplateCreate, TemplateOut
 from ..schemas.chat import WorkflowDraft
 from ..services.flow_validator import validate_workflow
+from ..services.tenant_stats import bump_tenant_stats
 from ..config import settings
 from ..dependencies.auth import get_current_tenant_id, require_role
 
@@ -121,6 +122,7 @@ async def clone_template(
     )
     session.add(agent)
     try:
+        await bump_tenant_stats(session, tenant_id, agents=1)
         await session.commit()
         await session.refresh(agent)
     except SQLAlchemyError as exc:
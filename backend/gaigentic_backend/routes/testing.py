@@ -1,19 +1,27 @@
 from __future__ import annotations
 
+import json
 import logging
+import time
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import settings
 from ..database import async_session
 from ..models.agent import Agent
 from ..models.agent_test import AgentTest
-from ..schemas.agent_test import AgentTestCreate, AgentTestOut
+from ..models.agent_test_run import AgentTestRun
+from ..schemas.agent_test import AgentTestCreate, AgentTestOut, AgentTestRunOut
 from ..dependencies.auth import get_current_tenant_id, require_role
-from ..services.test_runner import run_test
+from ..dependencies.cassette import cassette_mode
+from ..services.cassette import use_cassette
+from ..services.test_runner import record_test_runs, run_test, run_test_suite
+from ..services.workflow_executor import build_plan
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +37,7 @@ async def create_agent_test(
     tenant_id: UUID = Depends(get_current_tenant_id),
 ) -> AgentTestOut:
     agent = await session.get(Agent, agent_id)
-    if agent is None or agent.tenant_id.__eq__(tenant_id).is_(False):
+    if agent is None or agent.tenant_id != tenant_id:
         raise HTTPException(status_code=404, detail="Agent not found")
 
     count = await session.scalar(
@@ -64,11 +72,81 @@ async def run_agent_test(
     session: AsyncSession = Depends(async_session),
     tenant_id: UUID = Depends(get_current_tenant_id),
     _user=Depends(require_role({"admin", "user"})),
+    cassette: str | None = Depends(cassette_mode),
 ) -> dict:
     test = await session.get(AgentTest, test_id)
-    if test is None or test.agent_id.__eq__(agent_id).is_(False) or test.tenant_id.__eq__(tenant_id).is_(False):
+    if test is None or test.agent_id != agent_id or test.tenant_id != tenant_id:
         raise HTTPException(status_code=404, detail="Test not found")
-    return await run_test(agent_id, dict(test.input_context), dict(test.expected_output), tenant_id)
+    start = time.perf_counter()
+
+    async def record(run_status: str) -> None:
+        await record_test_runs(
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "agent_id": agent_id,
+                    "test_id": test_id,
+                    "status": run_status,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                }
+            ]
+        )
+
+    try:
+        with use_cassette(cassette):
+            result = await run_test(agent_id, dict(test.input_context), dict(test.expected_output), tenant_id)
+    except Exception:
+        await record("error")
+        raise
+    await record(result["status"])
+    return result
+
+
+@router.post("/{agent_id}/tests/run")
+async def run_agent_test_suite(
+    agent_id: UUID,
+    concurrency: int | None = None,
+    session: AsyncSession = Depends(async_session),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    _user=Depends(require_role({"admin", "user"})),
+    cassette: str | None = Depends(cassette_mode),
+) -> StreamingResponse:
+    """Run every test of the agent concurrently, streaming NDJSON progress."""
+
+    agent = await session.get(Agent, agent_id)
+    if agent is None or agent.tenant_id != tenant_id:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    plan = build_plan(agent)
+    result = await session.execute(
+        select(AgentTest)
+        .where(AgentTest.agent_id == agent_id, AgentTest.tenant_id == tenant_id)
+        .order_by(AgentTest.created_at)
+    )
+    tests = result.scalars().all()
+    limit = max(1, min(concurrency or settings.test_suite_concurrency, settings.test_suite_concurrency))
+
+    async def ndjson():
+        async for event in run_test_suite(agent, plan, tests, tenant_id, limit, cassette):
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.get("/{agent_id}/tests/history", response_model=list[AgentTestRunOut])
+async def agent_test_history(
+    agent_id: UUID,
+    limit: int = 100,
+    session: AsyncSession = Depends(async_session),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    _user=Depends(require_role({"admin", "user", "readonly"})),
+) -> list[AgentTestRunOut]:
+    result = await session.execute(
+        select(AgentTestRun)
+        .where(AgentTestRun.agent_id == agent_id, AgentTestRun.tenant_id == tenant_id)
+        .order_by(AgentTestRun.created_at.desc())
+        .limit(min(limit, 1000))
+    )
+    return [AgentTestRunOut.model_validate(r) for r in result.scalars().all()]
 
 
 @router.get("/{agent_id}/tests", response_model=list[AgentTestOut])
@@ -79,7 +157,9 @@ async def list_agent_tests(
     _user=Depends(require_role({"admin", "user", "readonly"})),
 ) -> list[AgentTestOut]:
     result = await session.execute(
-        select(AgentTest).where(AgentTest.agent_id == agent_id, AgentTest.tenant_id == tenant_id).order_by(AgentTest.created_at)
+        select(AgentTest)
+        .where(AgentTest.agent_id == agent_id, AgentTest.tenant_id == tenant_id)
+        .order_by(AgentTest.created_at)
     )
     tests = result.scalars().all()
     return [AgentTestOut.model_validate(t) for t in tests]
@@ -94,9 +174,9 @@ async def delete_agent_test(
     user=Depends(require_role({"admin", "user"})),
 ) -> Response:
     test = await session.get(AgentTest, test_id)
-    if test is None or test.agent_id.__ne__(agent_id).is_(True) or test.tenant_id.__ne__(tenant_id).is_(True):
+    if test is None or test.agent_id != agent_id or test.tenant_id != tenant_id:
         raise HTTPException(status_code=404, detail="Test not found")
-    if test.created_by.__ne__(user.id).is_(True):
+    if test.created_by != user.id:
         raise HTTPException(status_code=403, detail="Forbidden")
     await session.delete(test)
     await session.commit()
@@ -4,7 +4,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class AgentCreate(BaseModel):
@@ -25,3 +25,17 @@ class AgentOut(BaseModel):
     model_config = {
         "json_encoders": {datetime: lambda v: v.isoformat()},
     }
+
+
+class BulkRunRequest(BaseModel):
+    """Input contexts for a bulk run, given inline or as an ingested transaction file."""
+
+    inputs: list[dict] | None = Field(None, description="Input contexts to execute")
+    source_file: str | None = Field(None, description="Ingested transaction file to execute per row")
+    concurrency: int | None = Field(None, ge=1, description="Parallel runs (capped by server setting)")
+
+    @model_validator(mode="after")
+    def _one_source(self) -> "BulkRunRequest":
+        if (self.inputs is None) == (self.source_file is None):
+            raise ValueError("provide exactly one of inputs or source_file")
+        return self
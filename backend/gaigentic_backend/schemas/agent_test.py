@@ -26,3 +26,15 @@ class AgentTestOut(BaseModel):
 
     model_config = {"json_encoders": {datetime: lambda v: v.isoformat()}}
 
+
+class AgentTestRunOut(BaseModel):
+    """Recorded outcome of an agent test run."""
+
+    id: UUID
+    test_id: UUID
+    suite_id: UUID | None = None
+    status: str
+    duration_ms: float
+    created_at: datetime
+
+    model_config = {"from_attributes": True, "json_encoders": {datetime: lambda v: v.isoformat()}}
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class PluginCreate(BaseModel):
     name: str = Field(..., max_length=255)
     description: str | None = None
     code: str
+    batch: bool = False
 
 
 class PluginOut(BaseModel):
@@ -17,6 +19,26 @@ class PluginOut(BaseModel):
     name: str
     description: str | None = None
     is_active: bool
+    batch: bool = False
     created_at: datetime
 
     model_config = {"json_encoders": {datetime: lambda v: v.isoformat()}}
+
+
+class PluginBatchRequest(BaseModel):
+    """Records to score, given inline or as an ingested transaction file."""
+
+    records: list[dict[str, Any]] | None = None
+    source_file: str | None = None
+    columnar: bool = False
+
+    @model_validator(mode="after")
+    def _one_source(self) -> "PluginBatchRequest":
+        if (self.records is None) == (self.source_file is None):
+            raise ValueError("provide exactly one of records or source_file")
+        return self
+
+
+class PluginBatchOut(BaseModel):
+    count: int
+    results: list[dict[str, Any]]
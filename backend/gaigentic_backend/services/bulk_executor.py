@@ -0,0 +1,135 @@
+"""Execute one workflow over many input contexts with bounded concurrency."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from ..database import ReadSessionLocal
+from ..models.agent import Agent
+from ..models.transaction import Transaction
+from .log_sink import execution_log_sink
+from .workflow_executor import WorkflowPlan, run_workflow
+
+logger = logging.getLogger(__name__)
+
+_MAX_LOGGED_ERRORS = 20
+_DONE = object()
+
+
+async def iterate_inputs(inputs: Iterable[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    for item in inputs:
+        yield item
+
+
+async def transaction_inputs(tenant_id: UUID, source_file: str) -> AsyncIterator[Dict[str, Any]]:
+    """Yield ``{"transaction": {...}}`` contexts for every row of an ingested file."""
+
+    async with ReadSessionLocal() as session:
+        result = await session.stream(
+            select(
+                Transaction.id, Transaction.date, Transaction.amount, Transaction.type, Transaction.description
+            )
+            .where(Transaction.tenant_id == tenant_id, Transaction.source_file_name == source_file)
+            .execution_options(yield_per=1000)
+        )
+        async for row in result:
+            yield {
+                "transaction": {
+                    "id": str(row.id),
+                    "date": row.date.isoformat(),
+                    "amount": row.amount,
+                    "type": row.type,
+                    "description": row.description,
+                }
+            }
+
+
+async def run_bulk(
+    agent: Agent,
+    plan: WorkflowPlan,
+    inputs: AsyncIterable[Dict[str, Any]],
+    tenant_id: UUID,
+    concurrency: int,
+    log_context: Dict[str, Any] | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run ``plan`` for every input and yield results as they complete.
+
+    Each result carries the input's ``index``. A final ``summary`` event is
+    yielded and a single aggregated execution log record is queued.
+    """
+
+    started = datetime.now(tz=timezone.utc)
+    pending: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    totals = {"total": 0, "succeeded": 0, "failed": 0}
+    errors: list[Dict[str, Any]] = []
+
+    async def feed() -> None:
+        index = 0
+        async for context in inputs:
+            await pending.put((index, context))
+            index += 1
+        for _ in range(concurrency):
+            await pending.put(_DONE)
+
+    async def work() -> None:
+        while (item := await pending.get()) is not _DONE:
+            index, context = item
+            try:
+                output = await run_workflow(agent.id, context, tenant_id, agent, plan=plan)
+                await results.put({"index": index, "status": "success", "output": output})
+            except HTTPException as exc:
+                await results.put({"index": index, "status": "error", "error": exc.detail})
+            except Exception as exc:  # pragma: no cover - runtime path
+                logger.exception("Bulk run item %s failed: %s", index, exc)
+                await results.put({"index": index, "status": "error", "error": str(exc)})
+
+    async def run_all() -> None:
+        try:
+            await asyncio.gather(feed(), *(work() for _ in range(concurrency)))
+        finally:
+            await results.put(_DONE)
+
+    runner = asyncio.create_task(run_all())
+    try:
+        while (event := await results.get()) is not _DONE:
+            totals["total"] += 1
+            if event["status"] == "success":
+                totals["succeeded"] += 1
+            else:
+                totals["failed"] += 1
+                if len(errors) < _MAX_LOGGED_ERRORS:
+                    errors.append({"index": event["index"], "error": event["error"]})
+            yield event
+        await runner
+    finally:
+        runner.cancel()
+        finished = datetime.now(tz=timezone.utc)
+        if totals["failed"] == 0:
+            status = "success"
+        elif totals["succeeded"] == 0:
+            status = "failure"
+        else:
+            status = "partial"
+        await execution_log_sink.submit(
+            {
+                "id": uuid4(),
+                "tenant_id": tenant_id,
+                "agent_id": agent.id,
+                "workflow": (agent.config or {}).get("workflow") or {},
+                "input_context": {"bulk": True, **(log_context or {})},
+                "output_result": {**totals, "errors": errors},
+                "status": status,
+                "duration_ms": int((finished - started).total_seconds() * 1000),
+                "started_at": started,
+                "finished_at": finished,
+                "steps": [],
+            }
+        )
+    yield {"summary": {**totals, "status": status}}
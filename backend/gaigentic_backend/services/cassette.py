@@ -0,0 +1,120 @@
+"""Record and replay of external tool and LLM calls.
+
+In ``record`` mode responses are saved under a hash of the normalized
+request; ``replay`` serves them back without network access and fails on a
+miss; ``auto`` replays when an entry exists and records otherwise. The mode
+defaults to ``CASSETTE_MODE`` and can be overridden for a request or test run
+with :func:`use_cassette`.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "record", "replay", "auto")
+
+_mode: contextvars.ContextVar[str | None] = contextvars.ContextVar("cassette_mode", default=None)
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when no recording matches the request."""
+
+
+def current_mode() -> str:
+    return _mode.get() or settings.cassette_mode
+
+
+@contextmanager
+def use_cassette(mode: str | None) -> Iterator[None]:
+    """Override the cassette mode for calls made inside the block."""
+
+    if mode is None:
+        yield
+        return
+    if mode not in MODES:
+        raise ValueError(f"unknown cassette mode {mode}")
+    token = _mode.set(mode)
+    try:
+        yield
+    finally:
+        _mode.reset(token)
+
+
+def request_key(payload: Any) -> str:
+    """Hash of ``payload`` with dict ordering normalized."""
+
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CassetteStore:
+    """Recorded responses stored as ``<root>/<kind>/<key>.json`` files."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._cache: Dict[tuple[str, str], Any] = {}
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, kind, f"{key}.json")
+
+    def _read(self, path: str) -> Dict[str, Any] | None:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path: str, entry: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh, default=str)
+        os.replace(tmp, path)
+
+    async def get(self, kind: str, key: str) -> tuple[bool, Any]:
+        if (kind, key) in self._cache:
+            return True, self._cache[kind, key]
+        entry = await asyncio.to_thread(self._read, self._path(kind, key))
+        if entry is None:
+            return False, None
+        self._cache[kind, key] = entry["response"]
+        return True, entry["response"]
+
+    async def put(self, kind: str, key: str, request: Any, response: Any) -> None:
+        self._cache[kind, key] = response
+        entry = {"kind": kind, "request": request, "response": response}
+        await asyncio.to_thread(self._write, self._path(kind, key), entry)
+
+
+cassette_store = CassetteStore(settings.cassette_dir)
+
+
+async def through_cassette(kind: str, request: Any, call: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``call`` subject to the current cassette mode."""
+
+    mode = current_mode()
+    if mode == "off":
+        return await call()
+    key = request_key(request)
+    if mode in ("replay", "auto"):
+        found, response = await cassette_store.get(kind, key)
+        if found:
+            return response
+        if mode == "replay":
+            raise CassetteMiss(f"no recorded {kind} response for {key[:12]}")
+    response = await call()
+    try:
+        await cassette_store.put(kind, key, request, response)
+    except OSError as exc:  # pragma: no cover - filesystem errors
+        logger.warning("Could not record %s cassette entry: %s", kind, exc)
+    return response
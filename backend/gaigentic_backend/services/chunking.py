@@ -1,16 +1,123 @@
+"""Structure-aware text chunking for knowledge ingestion."""
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
 import tiktoken
 
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class _Unit(NamedTuple):
+    text: str
+    tokens: int
+    sep: str  # joins this unit to the one before it
+
+
+@lru_cache(maxsize=None)
+def get_encoder(name: str = "cl100k_base") -> tiktoken.Encoding:
+    """Return the tokenizer, loading it once per process."""
+
+    return tiktoken.get_encoding(name)
+
+
+def iter_paragraphs(source: str | Iterable[str]) -> Iterator[str]:
+    """Yield paragraphs from text or a stream of text pieces as soon as they are complete.
+
+    Line breaks inside a paragraph (lists, tables) are kept.
+    """
+
+    pieces = [source] if isinstance(source, str) else source
+    buffer = ""
+    for piece in pieces:
+        scan = max(0, len(buffer) - 8)  # a break may straddle two pieces
+        buffer += piece.replace("\r\n", "\n")
+        start = 0
+        for match in _PARAGRAPH_BREAK.finditer(buffer, scan):
+            paragraph = buffer[start : match.start()].strip()
+            if paragraph:
+                yield paragraph
+            start = match.end()
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def _units(text: str, sep: str, max_tokens: int, enc: tiktoken.Encoding) -> Iterator[_Unit]:
+    """Break ``text`` into units of at most ``max_tokens``, preferring lines, then sentences."""
+
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        yield _Unit(text, len(tokens), sep)
+        return
+    if "\n" in text:
+        parts, inner = text.split("\n"), "\n"
+    else:
+        parts, inner = _SENTENCE_END.split(text), " "
+    parts = [part.strip() for part in parts if part.strip()]
+    if len(parts) <= 1:
+        for i in range(0, len(tokens), max_tokens):
+            window = tokens[i : i + max_tokens]
+            yield _Unit(enc.decode(window), len(window), sep if i == 0 else "")
+        return
+    for i, part in enumerate(parts):
+        yield from _units(part, sep if i == 0 else inner, max_tokens, enc)
+
+
+def _join(window: List[_Unit]) -> str:
+    return window[0].text + "".join(unit.sep + unit.text for unit in window[1:])
+
+
+def _overlap(window: List[_Unit], overlap: int, enc: tiktoken.Encoding) -> Tuple[List[_Unit], int]:
+    """Trailing units of ``window`` worth at most ``overlap`` tokens, and their size."""
+
+    tail: List[_Unit] = []
+    size = 0
+    for unit in reversed(window):
+        if size + unit.tokens + 1 > overlap:
+            break
+        tail.insert(0, unit)
+        size += unit.tokens + 1
+    if not tail and overlap:
+        tokens = enc.encode(window[-1].text)[-overlap:]
+        tail, size = [_Unit(enc.decode(tokens), len(tokens), window[-1].sep)], len(tokens) + 1
+    return tail, size
+
+
+def iter_chunks(source: str | Iterable[str], max_tokens: int = 500, overlap: int = 0) -> Iterator[str]:
+    """Yield chunks of at most ``max_tokens`` tokens split on paragraph and sentence boundaries.
+
+    ``source`` may be a string or an iterable of text pieces, which is consumed
+    lazily. Each chunk after the first starts with up to ``overlap`` tokens from
+    the end of the previous one.
+    """
+
+    if not 0 <= overlap < max_tokens:
+        raise ValueError("overlap must be between 0 and max_tokens")
+    enc = get_encoder()
+    window: List[_Unit] = []
+    size = 0  # tokens in window, counting one per separator
+    pending = False  # window holds text not yet emitted
+    for paragraph in iter_paragraphs(source):
+        for unit in _units(paragraph, "\n\n", max_tokens, enc):
+            if window and size + unit.tokens > max_tokens:
+                if pending:
+                    yield _join(window)
+                window, size = _overlap(window, overlap, enc)
+                while window and size + unit.tokens > max_tokens:
+                    size -= window.pop(0).tokens + 1
+                pending = False
+            window.append(unit)
+            size += unit.tokens + 1
+            pending = True
+    if pending:
+        yield _join(window)
+
 
-def split_text(text: str, max_tokens: int = 500) -> list[str]:
+def split_text(text: str, max_tokens: int = 500, overlap: int = 0) -> list[str]:
     """Split text into token-aware chunks."""
 
-    enc = tiktoken.get_encoding("cl100k_base")
-    normalized = " ".join(text.split())
-    tokens = enc.encode(normalized)
-    chunks = []
-    for i in range(0, len(tokens), max_tokens):
-        chunk_tokens = tokens[i : i + max_tokens]
-        chunks.append(enc.decode(chunk_tokens))
-    return chunks
+    return list(iter_chunks(text, max_tokens, overlap))
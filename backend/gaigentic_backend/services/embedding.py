@@ -1,28 +1,294 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from typing import List
+import math
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Set
+from uuid import UUID
 
+import httpx
 import openai
+from prometheus_client import Counter, Histogram
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import settings
+from ..models.agent import Agent
+from ..models.tenant import Tenant
+from .tracing import span
+from .vector_index import EMBEDDING_DIMENSIONS
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_REQUESTS = Counter("embedding_requests_total", "Texts submitted for embedding")
+EMBEDDING_COALESCED = Counter(
+    "embedding_requests_coalesced_total", "Embedding requests served by an identical in-flight request"
+)
+EMBEDDING_BATCH_SIZE = Histogram(
+    "embedding_batch_size", "Texts per embedding API call", buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+
+_TOKEN = re.compile(r"\w+")
+
+
+class EmbeddingMismatchError(ValueError):
+    """Raised when vectors from different models or dimensions would be mixed."""
+
+
+class EmbeddingBackend(ABC):
+    """Source of embeddings for one model.
+
+    Vectors are zero-padded to the storage width of the vector columns, which
+    leaves cosine distances between vectors of the same model unchanged.
+    ``requested_dimensions`` is the configured width, if any; ``dimensions``
+    is the model's actual width, learned from the first response when not
+    configured.
+    """
+
+    name = ""
+    default_model = ""
+    # Whether a prefix of the model's vectors is itself an embedding.
+    prefix_embeddings = False
+
+    def __init__(self, model: str, dimensions: int | None = None) -> None:
+        if dimensions is not None and not 0 < dimensions <= EMBEDDING_DIMENSIONS:
+            raise ValueError(f"Embedding dimensions must be between 1 and {EMBEDDING_DIMENSIONS}")
+        self.model = model
+        self.requested_dimensions = dimensions
+        self.dimensions = dimensions
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}:{self.model}"
+
+    def fits_index(self, index_dimensions: int) -> bool:
+        """Whether an index of the leading ``index_dimensions`` can serve this model's vectors."""
+
+        if self.prefix_embeddings or index_dimensions >= EMBEDDING_DIMENSIONS:
+            return True
+        # Narrower vectors are indexed whole, zero padding included.
+        return self.requested_dimensions is not None and self.requested_dimensions <= index_dimensions
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Return the model's vectors for ``texts``, unpadded and in order."""
+
+    async def __call__(self, texts: List[str]) -> List[List[float]]:
+        vectors = await self.embed(texts)
+        for vector in vectors:
+            if self.dimensions is None:
+                if len(vector) > EMBEDDING_DIMENSIONS:
+                    raise EmbeddingMismatchError(f"{self.key} returns {len(vector)} dimensions")
+                self.dimensions = len(vector)
+            if len(vector) != self.dimensions:
+                raise EmbeddingMismatchError(
+                    f"{self.key} returned {len(vector)} dimensions, expected {self.dimensions}"
+                )
+        padding = [0.0] * (EMBEDDING_DIMENSIONS - (self.dimensions or EMBEDDING_DIMENSIONS))
+        return [list(vector) + padding for vector in vectors]
+
+
+class OpenAIEmbeddings(EmbeddingBackend):
+    name = "openai"
+    default_model = "text-embedding-3-small"
+
+    @property
+    def prefix_embeddings(self) -> bool:
+        return self.model.startswith("text-embedding-3")
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        if not settings.openai_api_key:
+            raise RuntimeError("OpenAI API key not configured")
+
+        client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+        # Only models that support shortening accept ``dimensions``, so send it
+        # only when configured, never the width learned from a response.
+        options = {"dimensions": self.requested_dimensions} if self.requested_dimensions else {}
+        try:
+            with span("embedding.create", backend=self.name, model=self.model, inputs=len(texts)):
+                resp = await client.embeddings.create(model=self.model, input=texts, **options)
+        except Exception as exc:  # pragma: no cover - runtime errors
+            logger.exception("Embedding request failed: %s", exc)
+            raise
+        return [item.embedding for item in sorted(resp.data, key=lambda item: item.index)]
+
+
+class OllamaEmbeddings(EmbeddingBackend):
+    name = "ollama"
+    default_model = "nomic-embed-text"
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        base = settings.ollama_base_url or "http://localhost:11434"
+        async with httpx.AsyncClient(timeout=20) as client:
+            with span("embedding.create", backend=self.name, model=self.model, inputs=len(texts)):
+                resp = await client.post(f"{base}/api/embed", json={"model": self.model, "input": texts})
+            resp.raise_for_status()
+        return resp.json()["embeddings"]
+
+
+class HashEmbeddings(EmbeddingBackend):
+    """Deterministic signed feature hashing of word tokens; needs no network.
+
+    Texts sharing words get similar vectors, which is enough for tests,
+    benchmarks and offline development, not for production retrieval.
+    """
+
+    name = "hash"
+    default_model = "sha256"
+
+    def __init__(self, model: str, dimensions: int | None = None) -> None:
+        super().__init__(model, dimensions or EMBEDDING_DIMENSIONS)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in _TOKEN.findall(text.lower()):
+            digest = hashlib.sha256(f"{self.model}:{token}".encode()).digest()
+            vector[int.from_bytes(digest[:4], "big") % self.dimensions] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
 
-async def get_embedding(text: str) -> List[float]:
-    """Return embedding vector for the given text."""
 
-    if not settings.openai_api_key:
-        raise RuntimeError("OpenAI API key not configured")
+BACKENDS = {backend.name: backend for backend in (OpenAIEmbeddings, OllamaEmbeddings, HashEmbeddings)}
 
-    client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
-    try:
-        resp = await client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text,
+
+@lru_cache(maxsize=None)
+def _backend(name: str, model: str, dimensions: int | None) -> EmbeddingBackend:
+    return BACKENDS[name](model, dimensions)
+
+
+def get_backend(spec: Dict[str, Any] | None = None) -> EmbeddingBackend:
+    """Return the backend described by ``spec`` (``backend``, ``model``, ``dimensions``).
+
+    Missing keys fall back to ``EMBEDDING_BACKEND`` and ``EMBEDDING_MODEL``.
+    Raises ``ValueError`` for an unknown backend or unsupported dimensions,
+    including vectors that a ``VECTOR_INDEX_DIMENSIONS`` prefix would cut.
+    """
+
+    spec = spec or {}
+    name = spec.get("backend") or settings.embedding_backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {name!r}")
+    model = spec.get("model")
+    if not model and name == settings.embedding_backend:
+        model = settings.embedding_model
+    dimensions = spec.get("dimensions")
+    if dimensions is not None and not 0 < int(dimensions) <= EMBEDDING_DIMENSIONS:
+        raise ValueError(f"Embedding dimensions must be between 1 and {EMBEDDING_DIMENSIONS}")
+    backend = _backend(name, model or BACKENDS[name].default_model, int(dimensions) if dimensions else None)
+    if not backend.fits_index(settings.vector_index_dimensions):
+        raise ValueError(
+            f"{backend.key} vectors cannot be cut to the {settings.vector_index_dimensions} dimensions of the "
+            "vector index; configure at most that many dimensions or set VECTOR_INDEX_DIMENSIONS=1536"
         )
-    except Exception as exc:  # pragma: no cover - runtime errors
-        logger.exception("Embedding request failed: %s", exc)
-        raise
-    return resp.data[0].embedding
+    return backend
+
+
+def backend_for(agent_config: Dict[str, Any] | None, tenant_config: Dict[str, Any] | None) -> EmbeddingBackend:
+    """The ``embedding`` setting of the agent, else of its tenant, else the default."""
+
+    for config in (agent_config, tenant_config):
+        spec = (config or {}).get("embedding")
+        if spec:
+            return get_backend(spec)
+    return get_backend()
+
+
+async def backend_for_agent(session: AsyncSession, agent_id: UUID) -> EmbeddingBackend:
+    """Resolve the embedding backend configured for ``agent_id``."""
+
+    agent = await session.get(Agent, agent_id)
+    if agent is None:
+        return get_backend()
+    tenant = await session.get(Tenant, agent.tenant_id)
+    return backend_for(agent.config, tenant.config if tenant is not None else None)
+
+
+class EmbeddingDispatcher:
+    """Coalesce concurrent embedding requests into batched calls of ``embed``.
+
+    Identical texts already waiting or in flight share one future. Distinct
+    texts submitted within ``max_wait`` seconds of the first waiting one go
+    out together, up to ``max_batch`` per call.
+    """
+
+    def __init__(
+        self, embed: Callable[[List[str]], Awaitable[List[List[float]]]], max_batch: int, max_wait: float
+    ) -> None:
+        self._embed = embed
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[str] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._sending: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> List[float]:
+        EMBEDDING_REQUESTS.inc()
+        future = self._inflight.get(text)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[text] = future
+            self._pending.append(text)
+            if len(self._pending) >= self.max_batch or self.max_wait <= 0:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        else:
+            EMBEDDING_COALESCED.inc()
+        # Shielded so one caller timing out does not fail the others.
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch, self._pending = self._pending[: self.max_batch], self._pending[self.max_batch :]
+            task = asyncio.ensure_future(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: List[str]) -> None:
+        EMBEDDING_BATCH_SIZE.observe(len(batch))
+        try:
+            vectors = await self._embed(batch)
+            if len(vectors) != len(batch):
+                raise RuntimeError(f"Expected {len(batch)} embeddings, got {len(vectors)}")
+        except Exception as exc:
+            for text in batch:
+                future = self._inflight.pop(text)
+                future.set_exception(exc)
+                future.exception()  # retrieved here in case every caller gave up
+            return
+        for text, vector in zip(batch, vectors):
+            self._inflight.pop(text).set_result(vector)
+
+
+_dispatchers: Dict[EmbeddingBackend, EmbeddingDispatcher] = {}
+
+
+def _dispatcher(backend: EmbeddingBackend) -> EmbeddingDispatcher:
+    dispatcher = _dispatchers.get(backend)
+    if dispatcher is None:
+        dispatcher = EmbeddingDispatcher(backend, settings.embedding_batch_size, settings.embedding_batch_wait)
+        _dispatchers[backend] = dispatcher
+    return dispatcher
+
+
+async def get_embedding(text: str, backend: EmbeddingBackend | None = None) -> List[float]:
+    """Return embedding vector for the given text."""
+
+    return await _dispatcher(backend or get_backend()).embed(text)
+
+
+async def get_embeddings(texts: List[str], backend: EmbeddingBackend | None = None) -> List[List[float]]:
+    """Return embedding vectors for ``texts``, batched with any concurrent requests."""
+
+    dispatcher = _dispatcher(backend or get_backend())
+    return list(await asyncio.gather(*(dispatcher.embed(text) for text in texts)))
@@ -32,7 +32,7 @@ async def load_file(file: UploadFile) -> str:
         elif filename.endswith(".docx"):
             data = await file.read()
             doc = Document(BytesIO(data))
-            text = "\n".join(p.text for p in doc.paragraphs)
+            text = "\n\n".join(p.text for p in doc.paragraphs)
         elif filename.endswith(".txt"):
             text = (await file.read()).decode("utf-8", "ignore")
         else:
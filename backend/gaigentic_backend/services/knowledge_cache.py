@@ -0,0 +1,84 @@
+"""In-process cache of knowledge search results, invalidated by knowledge generation."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Tuple
+from uuid import UUID
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.agent import Agent
+
+KNOWLEDGE_CACHE_HITS = Counter("knowledge_search_cache_hits_total", "Knowledge searches answered from the cache")
+KNOWLEDGE_CACHE_MISSES = Counter("knowledge_search_cache_misses_total", "Knowledge searches run against the database")
+KNOWLEDGE_CACHE_ENTRIES = Gauge("knowledge_search_cache_entries", "Knowledge search results cached in this worker")
+
+
+class CachedSearch(NamedTuple):
+    results: Any
+    stored_at: float
+
+
+CacheKey = Tuple[UUID, int, str, str]
+
+_results: "OrderedDict[CacheKey, CachedSearch]" = OrderedDict()
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold ``query`` and collapse whitespace so trivial variants share an entry."""
+
+    return " ".join(query.casefold().split())
+
+
+def cache_key(agent_id: UUID, generation: int, mode: str, query: str) -> CacheKey:
+    return agent_id, generation, mode, normalize_query(query)
+
+
+def get_cached(key: CacheKey) -> Any | None:
+    """Return the results stored under ``key`` unless missing or older than ``KNOWLEDGE_CACHE_TTL``."""
+
+    entry = _results.get(key)
+    if entry is None or time.monotonic() - entry.stored_at >= settings.knowledge_cache_ttl:
+        if entry is not None:
+            del _results[key]
+            KNOWLEDGE_CACHE_ENTRIES.set(len(_results))
+        KNOWLEDGE_CACHE_MISSES.inc()
+        return None
+    _results.move_to_end(key)
+    KNOWLEDGE_CACHE_HITS.inc()
+    return entry.results
+
+
+def store(key: CacheKey, results: Any) -> None:
+    """Cache ``results``, evicting the least recently used entries beyond ``KNOWLEDGE_CACHE_SIZE``."""
+
+    if settings.knowledge_cache_size <= 0:
+        return
+    _results[key] = CachedSearch(results, time.monotonic())
+    _results.move_to_end(key)
+    while len(_results) > settings.knowledge_cache_size:
+        _results.popitem(last=False)
+    KNOWLEDGE_CACHE_ENTRIES.set(len(_results))
+
+
+def clear() -> None:
+    _results.clear()
+    KNOWLEDGE_CACHE_ENTRIES.set(0)
+
+
+async def bump_generation(session: AsyncSession, agent_id: UUID) -> None:
+    """Invalidate cached results for ``agent_id`` in every worker once ``session`` commits.
+
+    Entries of older generations are never looked up again and age out of the
+    cache; the generation lives on the agent row so all workers see the change.
+    """
+
+    await session.execute(
+        update(Agent)
+        .where(Agent.id == agent_id)
+        .values(knowledge_generation=Agent.knowledge_generation + 1)
+    )
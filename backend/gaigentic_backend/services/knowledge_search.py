@@ -0,0 +1,150 @@
+"""Hybrid lexical and vector retrieval over knowledge chunks."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable, List, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.knowledge_chunk import KnowledgeChunk
+from .embedding import EmbeddingBackend, get_backend, get_embedding
+from .vector_index import nearest, widen_scan
+
+logger = logging.getLogger(__name__)
+
+RRF_K = 60
+
+
+def _scope(stmt: Select, agent_id: UUID, tenant_id: UUID | None) -> Select:
+    stmt = stmt.where(KnowledgeChunk.agent_id == agent_id)
+    if tenant_id is not None:
+        stmt = stmt.where(KnowledgeChunk.tenant_id == tenant_id)
+    return stmt
+
+
+def lexical_query(query: str, *columns: Any, agent_id: UUID, tenant_id: UUID | None = None, limit: int) -> Select:
+    """Chunks matching ``query`` as a web-style full-text search, best ``ts_rank_cd`` first."""
+
+    tsquery = func.websearch_to_tsquery("english", query)
+    stmt = select(*columns).where(KnowledgeChunk.text_tsv.op("@@")(tsquery))
+    return (
+        _scope(stmt, agent_id, tenant_id)
+        .order_by(func.ts_rank_cd(KnowledgeChunk.text_tsv, tsquery).desc())
+        .limit(limit)
+    )
+
+
+def vector_query(
+    query_vec: List[float],
+    *columns: Any,
+    agent_id: UUID,
+    tenant_id: UUID | None = None,
+    limit: int,
+    max_distance: float | None = None,
+    embedding_model: str | None = None,
+) -> Select:
+    """Chunks nearest to ``query_vec`` by cosine distance.
+
+    Pass the query's ``embedding_model`` so chunks embedded by another model
+    are never compared with it.
+    """
+
+    stmt = _scope(select(*columns), agent_id, tenant_id)
+    if embedding_model is not None:
+        stmt = stmt.where(KnowledgeChunk.embedding_model == embedding_model)
+    return nearest(stmt, KnowledgeChunk.embedding, KnowledgeChunk.id, query_vec, limit, max_distance)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Any]], key: Callable[[Any], Hashable], k: int = RRF_K) -> List[Any]:
+    """Merge ranked result lists, scoring each item by the sum of ``1 / (k + rank)``."""
+
+    scores: dict[Hashable, float] = {}
+    items: dict[Hashable, Any] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            item_key = key(item)
+            scores[item_key] = scores.get(item_key, 0.0) + 1.0 / (k + rank)
+            items.setdefault(item_key, item)
+    return [items[item_key] for item_key in sorted(scores, key=scores.__getitem__, reverse=True)]
+
+
+async def embed_query(
+    text: str,
+    embed: Callable[..., Awaitable[List[float]]] | None = None,
+    backend: EmbeddingBackend | None = None,
+) -> List[float] | None:
+    """Embed a search query, or return ``None`` if that fails or exceeds the configured timeout."""
+
+    try:
+        return await asyncio.wait_for(
+            (embed or get_embedding)(text, backend), settings.knowledge_embedding_timeout
+        )
+    except Exception as exc:
+        logger.warning("Query embedding unavailable, using lexical search only: %r", exc)
+        return None
+
+
+async def hybrid_search(
+    session: AsyncSession,
+    query: str,
+    *columns: Any,
+    agent_id: UUID,
+    tenant_id: UUID | None = None,
+    limit: int,
+    key: Callable[[Any], Hashable],
+    mode: str = "hybrid",
+    backend: EmbeddingBackend | None = None,
+    on_fallback: Callable[[], None] | None = None,
+) -> List[Any]:
+    """Return up to ``limit`` rows of ``columns`` for ``query``.
+
+    In ``hybrid`` mode the lexical query runs while the query embedding is
+    being computed; if the embedding fails or is too slow the lexical results
+    are returned alone (after calling ``on_fallback``), otherwise both rankings
+    are fused. ``backend`` is the agent's embedding backend, the default one if
+    omitted.
+    """
+
+    backend = backend or get_backend()
+    if mode == "vector":
+        query_vec = await get_embedding(query, backend)
+        await widen_scan(session, limit)
+        result = await session.execute(
+            vector_query(
+                query_vec, *columns, agent_id=agent_id, tenant_id=tenant_id, limit=limit, embedding_model=backend.key
+            )
+        )
+        return result.all()
+
+    candidates = max(limit, settings.knowledge_search_candidates)
+    embedding = asyncio.ensure_future(embed_query(query, backend=backend)) if mode == "hybrid" else None
+    try:
+        result = await session.execute(
+            lexical_query(query, *columns, agent_id=agent_id, tenant_id=tenant_id, limit=candidates)
+        )
+        lexical = result.all()
+        query_vec = await embedding if embedding is not None else None
+    finally:
+        if embedding is not None:
+            embedding.cancel()
+    if query_vec is None:
+        if embedding is not None and on_fallback is not None:
+            on_fallback()
+        return lexical[:limit]
+
+    await widen_scan(session, candidates)
+    result = await session.execute(
+        vector_query(
+            query_vec,
+            *columns,
+            agent_id=agent_id,
+            tenant_id=tenant_id,
+            limit=candidates,
+            embedding_model=backend.key,
+        )
+    )
+    return reciprocal_rank_fusion([lexical, result.all()], key)[:limit]
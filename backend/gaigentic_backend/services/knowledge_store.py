@@ -0,0 +1,130 @@
+"""Incremental storage of knowledge file chunks keyed by content hash."""
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Iterable, List
+from uuid import UUID
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.knowledge_chunk import KnowledgeChunk
+from .embedding import EmbeddingBackend, EmbeddingMismatchError, get_backend, get_embeddings
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 of the chunk text, matching the migration backfill."""
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+async def _check_compatible(
+    session: AsyncSession, tenant_id: UUID, agent_id: UUID, backend: EmbeddingBackend
+) -> None:
+    """Raise ``EmbeddingMismatchError`` if the agent has chunks from another model or width."""
+
+    differs = KnowledgeChunk.embedding_model != backend.key
+    if backend.dimensions is not None:
+        differs = or_(differs, KnowledgeChunk.embedding_dim != backend.dimensions)
+    result = await session.execute(
+        select(KnowledgeChunk.embedding_model, KnowledgeChunk.embedding_dim)
+        .where(KnowledgeChunk.agent_id == agent_id, KnowledgeChunk.tenant_id == tenant_id, differs)
+        .limit(1)
+    )
+    stored = result.first()
+    if stored is not None:
+        raise EmbeddingMismatchError(
+            f"Agent knowledge is embedded with {stored.embedding_model} ({stored.embedding_dim} dimensions), "
+            f"not {backend.key}; remove it before switching models"
+        )
+
+
+async def sync_knowledge_file(
+    session: AsyncSession,
+    tenant_id: UUID,
+    agent_id: UUID,
+    source_file: str,
+    chunks: Iterable[str],
+    backend: EmbeddingBackend | None = None,
+) -> Dict[str, int]:
+    """Make the stored chunks of ``source_file`` match ``chunks`` within ``session``.
+
+    Only chunks whose content is not stored yet are embedded, in batches;
+    unchanged chunks keep their rows (re-indexed if they moved) and chunks no
+    longer present are deleted. Repeated chunks within the file are stored
+    once. Raises ``EmbeddingMismatchError`` if ``backend`` differs from the
+    model the agent's knowledge was embedded with. The caller commits.
+    """
+
+    backend = backend or get_backend()
+
+    rows = await session.execute(
+        select(KnowledgeChunk.id, KnowledgeChunk.content_hash, KnowledgeChunk.chunk_index).where(
+            KnowledgeChunk.agent_id == agent_id,
+            KnowledgeChunk.tenant_id == tenant_id,
+            KnowledgeChunk.source_file == source_file,
+        )
+    )
+    existing = {row.content_hash: (row.id, row.chunk_index) for row in rows.all()}
+
+    seen: set[str] = set()
+    new_rows: List[dict] = []
+    moved: List[dict] = []
+    for text in chunks:
+        digest = content_hash(text)
+        if digest in seen:
+            continue
+        index = len(seen)
+        seen.add(digest)
+        if digest in existing:
+            row_id, old_index = existing[digest]
+            if old_index != index:
+                moved.append({"id": row_id, "tenant_id": tenant_id, "chunk_index": index})
+            continue
+        new_rows.append(
+            {
+                "tenant_id": tenant_id,
+                "agent_id": agent_id,
+                "source_file": source_file,
+                "chunk_index": index,
+                "text": text,
+                "content_hash": digest,
+            }
+        )
+
+    if new_rows:
+        known_width = backend.dimensions is not None
+        await _check_compatible(session, tenant_id, agent_id, backend)
+        # One slice at a time keeps a large upload from flooding the provider.
+        step = settings.embedding_batch_size
+        for start in range(0, len(new_rows), step):
+            batch = new_rows[start : start + step]
+            for row, vector in zip(batch, await get_embeddings([row["text"] for row in batch], backend)):
+                row["embedding"] = vector
+        if not known_width:  # learned from the responses just received
+            await _check_compatible(session, tenant_id, agent_id, backend)
+        for row in new_rows:
+            row["embedding_model"] = backend.key
+            row["embedding_dim"] = backend.dimensions
+
+    removed = [row_id for digest, (row_id, _) in existing.items() if digest not in seen]
+    if removed:
+        await session.execute(
+            delete(KnowledgeChunk).where(KnowledgeChunk.id.in_(removed), KnowledgeChunk.tenant_id == tenant_id)
+        )
+    if moved:
+        await session.execute(update(KnowledgeChunk), moved)
+    if new_rows:
+        await session.execute(
+            insert(KnowledgeChunk).on_conflict_do_nothing(constraint="uq_knowledge_chunk_agent_file_hash"),
+            new_rows,
+        )
+    return {
+        "chunks": len(seen),
+        "embedded": len(new_rows),
+        "unchanged": len(seen) - len(new_rows),
+        "moved": len(moved),
+        "deleted": len(removed),
+    }
@@ -1,11 +1,15 @@
 """LLM-powered chat service."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import List
 
 from ..config import settings
+from ..models.agent import Agent
 from ..schemas.chat import ChatMessage, ChatResponse, WorkflowDraft
+from ..services import response_cache
+from ..services.embedding import EmbeddingBackend, get_backend, get_embedding
 from ..services.llm_router import run_llm
 
 logger = logging.getLogger(__name__)
@@ -36,8 +40,31 @@ class ChatSME:
         if self.provider not in settings.llm_providers_enabled:
             raise ValueError("provider not enabled")
 
-    async def chat(self, messages: List[ChatMessage]) -> ChatResponse:
-        """Send chat messages to the LLM and return the response."""
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        agent: Agent | None = None,
+        backend: EmbeddingBackend | None = None,
+    ) -> ChatResponse:
+        """Send chat messages to the LLM and return the response.
+
+        With ``agent``, an opening question close enough to one the agent has
+        already answered at its current knowledge generation gets that answer
+        back without an LLM call. ``backend`` embeds the question, the
+        default embedding backend if omitted.
+        """
+
+        scope = vector = None
+        if agent is not None and settings.chat_cache_size > 0 and _is_opening_question(messages):
+            backend = backend or get_backend()
+            vector = await _embed_question(messages[0].content, backend)
+            if vector is not None:
+                # Answers depend on the sampling options too, e.g. a small max_tokens truncates them.
+                scope = (agent.id, self.provider, self.model, self.temperature, self.max_tokens)
+                cached = response_cache.lookup(scope, agent.knowledge_generation, vector)
+                if cached is not None:
+                    logger.info("Answered from chat cache for agent %s", agent.id)
+                    return cached
 
         history = [
             {"role": m.role, "content": m.content}
@@ -53,7 +80,26 @@ class ChatSME:
         )
         logger.debug("LLM raw response: %s", content)
         reply, draft = _extract_draft(content)
-        return ChatResponse(reply=reply, workflow_draft=draft)
+        response = ChatResponse(reply=reply, workflow_draft=draft)
+        if vector is not None:
+            response_cache.store(scope, agent.knowledge_generation, vector, response)
+        return response
+
+
+def _is_opening_question(messages: List[ChatMessage]) -> bool:
+    """Only a conversation's first message is answered independently of earlier turns."""
+
+    return len(messages) == 1 and messages[0].role == "user"
+
+
+async def _embed_question(text: str, backend: EmbeddingBackend) -> List[float] | None:
+    try:
+        vector = await asyncio.wait_for(get_embedding(text, backend), settings.knowledge_embedding_timeout)
+    except Exception as exc:
+        logger.warning("Question embedding unavailable, skipping chat cache: %r", exc)
+        return None
+    # Drop the zero padding; it does not change cosine similarity.
+    return vector[: backend.dimensions]
 
 
 def _extract_draft(content: str) -> tuple[str, WorkflowDraft | None]:
@@ -9,6 +9,8 @@ import httpx
 import openai
 
 from ..config import settings
+from .cassette import through_cassette
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,17 @@ async def _post_json(url: str, headers: dict[str, str], payload: dict[str, Any])
 async def run_llm(provider: str, model: str, messages: List[dict[str, Any]], config: dict) -> str:
     """Execute a chat completion call for the given provider."""
 
+    with span("llm.call", provider=provider, model=model, messages=len(messages)):
+        return await through_cassette(
+            "llm",
+            {"provider": provider, "model": model, "messages": messages, "config": config},
+            lambda: _call_provider(provider, model, messages, config),
+        )
+
+
+async def _call_provider(provider: str, model: str, messages: List[dict[str, Any]], config: dict) -> str:
+    """Send the chat completion request to ``provider``, retrying once on failure."""
+
     if provider not in settings.llm_providers_enabled:
         raise ValueError("provider not enabled")
 
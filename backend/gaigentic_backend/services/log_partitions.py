@@ -0,0 +1,112 @@
+"""Monthly partition management and retention for execution history tables."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Iterable, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..config import settings
+from ..database import engine
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("execution_log", "execution_step")
+_PARTITION_RE = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})(?P<month>\d{2})$")
+# Arbitrary constant so only one worker runs maintenance at a time.
+_ADVISORY_LOCK_ID = 0x6C6F67
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Return the partition of ``table`` holding rows for ``month``."""
+    return f"{table}_p{month:%Y%m}"
+
+
+def expired_partitions(table: str, names: Iterable[str], cutoff: date) -> List[str]:
+    """Return partitions of ``table`` whose whole month lies before ``cutoff``."""
+
+    expired = []
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if not match or match.group("table") != table:
+            continue
+        month = date(int(match.group("year")), int(match.group("month")), 1)
+        if _add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, table: str, months_ahead: int, today: date | None = None
+) -> None:
+    """Create partitions of ``table`` from the current month through ``months_ahead`` months."""
+
+    current = (today or datetime.now(tz=timezone.utc).date()).replace(day=1)
+    for offset in range(months_ahead + 1):
+        start = _add_months(current, offset)
+        end = _add_months(start, 1)
+        await conn.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{partition_name(table, start)}" PARTITION OF {table} '
+                f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+            )
+        )
+
+
+async def drop_expired_partitions(
+    conn: AsyncConnection, table: str, retention_months: int, today: date | None = None
+) -> List[str]:
+    """Detach and drop partitions of ``table`` older than ``retention_months`` full months."""
+
+    current = (today or datetime.now(tz=timezone.utc).date()).replace(day=1)
+    cutoff = _add_months(current, -retention_months)
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ),
+        {"parent": table},
+    )
+    expired = expired_partitions(table, (r[0] for r in result.all()), cutoff)
+    for name in expired:
+        await conn.execute(text(f'ALTER TABLE {table} DETACH PARTITION "{name}"'))
+        await conn.execute(text(f'DROP TABLE "{name}"'))
+        logger.info("Dropped expired partition %s", name)
+    return expired
+
+
+async def maintain_partitions() -> None:
+    """Run one round of partition creation and retention."""
+
+    if engine.dialect.name != "postgresql":
+        return
+    async with engine.begin() as conn:
+        locked = await conn.scalar(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+        if not locked:
+            return
+        for table in PARTITIONED_TABLES:
+            await ensure_partitions(conn, table, settings.execution_log_partitions_ahead)
+            if settings.execution_log_retention_months > 0:
+                await drop_expired_partitions(conn, table, settings.execution_log_retention_months)
+
+
+async def run_partition_maintenance() -> None:
+    """Background loop keeping execution history partitions current."""
+
+    while True:
+        try:
+            await maintain_partitions()
+        except Exception as exc:  # pragma: no cover - runtime DB errors
+            logger.exception("Execution log partition maintenance failed: %s", exc)
+        await asyncio.sleep(settings.execution_log_maintenance_interval)
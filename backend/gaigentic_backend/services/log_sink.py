@@ -0,0 +1,212 @@
+"""Background writer batching execution log inserts off the request path."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List
+from uuid import uuid4
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import insert
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.execution_log import ExecutionLog
+from ..models.execution_step import ExecutionStep
+from .tenant_stats import bump_tenant_stats
+from .workflow_snapshots import mark_stored, store_snapshot
+
+logger = logging.getLogger(__name__)
+
+LOG_QUEUE_DEPTH = Gauge("execution_log_queue_depth", "Execution log records waiting to be written")
+LOG_RECORDS_WRITTEN = Counter("execution_log_records_written_total", "Execution log records persisted")
+LOG_RECORDS_DROPPED = Counter("execution_log_records_dropped_total", "Execution log records lost on write failure")
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def json_size_exceeds(value: Any, limit: int) -> bool:
+    """Return ``True`` if ``value`` would serialize to more than ``limit`` bytes.
+
+    Walks the structure estimating the encoded size and stops as soon as the
+    limit is crossed. Raises ``TypeError`` for values JSON cannot represent.
+    """
+
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            total += len(item) + 2
+        elif isinstance(item, dict):
+            total += 2 + len(item)
+            for key, val in item.items():
+                if not isinstance(key, _JSON_SCALARS):
+                    raise TypeError(f"unsupported key type {type(key).__name__}")
+                total += len(str(key)) + 3
+                stack.append(val)
+        elif isinstance(item, (list, tuple)):
+            total += 2 + len(item)
+            stack.extend(item)
+        elif isinstance(item, _JSON_SCALARS):
+            total += len(str(item))
+        else:
+            raise TypeError(f"unsupported type {type(item).__name__}")
+        if total > limit:
+            return True
+    return False
+
+
+async def write_records(records: List[Dict[str, Any]]) -> None:
+    """Persist execution records and their step timings.
+
+    The batch is written in one transaction. If that fails, each half is
+    retried on its own, so only the records that cannot be stored by
+    themselves are dropped.
+    """
+
+    if not records:
+        return
+    try:
+        await _write_batch(records)
+    except Exception:
+        if len(records) == 1:
+            logger.exception("Failed to store execution log record %s", records[0].get("id"))
+            LOG_RECORDS_DROPPED.inc()
+            return
+        logger.warning("Failed to store %s execution log records, retrying in halves", len(records))
+        middle = len(records) // 2
+        await write_records(records[:middle])
+        await write_records(records[middle:])
+
+
+async def _write_batch(records: List[Dict[str, Any]]) -> None:
+    """Write ``records`` in a single transaction, raising if it fails."""
+
+    async with SessionLocal() as session:
+        try:
+            hashes: Dict[int, str] = {}
+            rows = []
+            step_rows = []
+            stats: Dict[Any, List[int]] = defaultdict(lambda: [0, 0])
+            for rec in records:
+                workflow = rec["workflow"]
+                key = id(workflow)
+                if key not in hashes:
+                    hashes[key] = await store_snapshot(session, workflow)
+                row = {k: v for k, v in rec.items() if k not in ("workflow", "steps")}
+                row["workflow_hash"] = hashes[key]
+                rows.append(row)
+                for step in rec.get("steps") or ():
+                    step_rows.append(
+                        {
+                            **step,
+                            "id": uuid4(),
+                            "execution_id": rec["id"],
+                            "tenant_id": rec["tenant_id"],
+                            "agent_id": rec["agent_id"],
+                            "started_at": rec["started_at"] + timedelta(milliseconds=step["start_ms"]),
+                        }
+                    )
+                tenant_stats = stats[rec["tenant_id"]]
+                tenant_stats[0] += 1
+                tenant_stats[1] += rec["duration_ms"]
+            await session.execute(insert(ExecutionLog), rows)
+            if step_rows:
+                await session.execute(insert(ExecutionStep), step_rows)
+            for tenant_id, (count, duration) in stats.items():
+                await bump_tenant_stats(session, tenant_id, executions=count, duration_ms=duration)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+    for digest in set(hashes.values()):
+        mark_stored(digest)
+    LOG_RECORDS_WRITTEN.inc(len(records))
+
+
+class ExecutionLogSink:
+    """Bounded queue of execution records flushed in batches by a background task."""
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval: float) -> None:
+        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._task: asyncio.Task | None = None
+        self._writing: asyncio.Future | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything queued and stop the background task."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._writing is not None:
+            await self._writing
+            self._writing = None
+        while not self._queue.empty():
+            await write_records(self._take(self.batch_size))
+        LOG_QUEUE_DEPTH.set(0)
+
+    async def submit(self, record: Dict[str, Any]) -> None:
+        """Queue ``record``; waits when the queue is full and writes inline if not running."""
+
+        if not self.running:
+            await write_records([record])
+            return
+        await self._queue.put(record)
+        LOG_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _take(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch: List[Dict[str, Any]] = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    batch.extend(self._take(self.batch_size - len(batch)))
+                    remaining = deadline - time.monotonic()
+                    if len(batch) >= self.batch_size or remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                if batch:
+                    self._writing = asyncio.ensure_future(write_records(batch))
+                raise
+            LOG_QUEUE_DEPTH.set(self._queue.qsize())
+            # Shielded so a shutdown cancel lets the batch finish; stop() awaits it.
+            self._writing = asyncio.ensure_future(write_records(batch))
+            await asyncio.shield(self._writing)
+            self._writing = None
+
+
+execution_log_sink = ExecutionLogSink(
+    settings.execution_log_queue_size,
+    settings.execution_log_batch_size,
+    settings.execution_log_flush_interval,
+)
@@ -2,46 +2,56 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Dict, List
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-import tiktoken
 
-from ..database import SessionLocal
+from ..database import ReadSessionLocal, SessionLocal
 from ..models.agent import Agent
 from ..models.message_history import MessageHistory
 from ..models.knowledge_chunk import KnowledgeChunk
-from ..services.embedding import get_embedding
+from ..services.chunking import get_encoder
+from ..services.embedding import EmbeddingBackend, backend_for_agent, get_embedding
+from ..services.knowledge_search import embed_query, lexical_query, reciprocal_rank_fusion, vector_query
+from ..services.vector_index import nearest, widen_scan
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
-_ENCODER = tiktoken.get_encoding("cl100k_base")
 _MAX_TOKENS = 1800
 
 
 def _count_tokens(text: str) -> int:
-    return len(_ENCODER.encode(text))
+    return len(get_encoder().encode(text))
 
 
 async def store_message(agent_id: UUID, role: str, content: str) -> None:
-    """Persist a chat message with its embedding."""
+    """Persist a chat message with its embedding from the agent's backend.
+
+    No connection is held while the message is embedded.
+    """
 
-    embedding = await get_embedding(content)
     async with SessionLocal() as session:  # type: AsyncSession
         agent = await session.get(Agent, agent_id)
         if agent is None:
             logger.error("Agent %s not found when storing message", agent_id)
             return
+        tenant_id = agent.tenant_id
+        backend = await backend_for_agent(session, agent_id)
+    embedding = await get_embedding(content, backend)
+    async with SessionLocal() as session:  # type: AsyncSession
         record = MessageHistory(
-            tenant_id=agent.tenant_id,
+            tenant_id=tenant_id,
             agent_id=agent_id,
             role=role,
             content=content,
             embedding=embedding,
+            embedding_model=backend.key,
+            embedding_dim=backend.dimensions,
         )
         session.add(record)
         try:
@@ -56,54 +66,89 @@ async def fetch_context_for_agent(
     current_user_message: str,
     chat_k: int = settings.memory_chat_k_default,
     semantic_k: int = settings.memory_semantic_k_default,
+    *,
+    tenant_id: UUID | None = None,
+    backend: EmbeddingBackend | None = None,
 ) -> List[Dict]:
-    """Return combined chat and semantic memory for an agent."""
-
-    query_vec = await get_embedding(current_user_message)
-    async with SessionLocal() as session:  # type: AsyncSession
-        chat_stmt = (
-            select(
-                MessageHistory.role,
-                MessageHistory.content,
-                MessageHistory.created_at,
+    """Return combined chat and semantic memory for an agent.
+
+    Recent chat and full-text knowledge matches are queried while the message
+    is being embedded; vector matches are fused in when the embedding arrives
+    in time. Passing ``tenant_id`` confines every query to that tenant's
+    partitions. ``backend`` defaults to the agent's embedding backend, and
+    only vectors from that model are searched.
+    """
+
+    if backend is None:
+        async with ReadSessionLocal() as session:  # type: AsyncSession
+            backend = await backend_for_agent(session, agent_id)
+    history_scope = [MessageHistory.agent_id == agent_id]
+    if tenant_id is not None:
+        history_scope.append(MessageHistory.tenant_id == tenant_id)
+
+    embedding = asyncio.ensure_future(embed_query(current_user_message, get_embedding, backend))
+    try:
+        async with ReadSessionLocal() as session:  # type: AsyncSession
+            chat_stmt = (
+                select(
+                    MessageHistory.role,
+                    MessageHistory.content,
+                    MessageHistory.created_at,
+                )
+                .where(*history_scope)
+                .order_by(MessageHistory.created_at.desc())
+                .limit(chat_k)
             )
-            .where(MessageHistory.agent_id == agent_id)
-            .order_by(MessageHistory.created_at.desc())
-            .limit(chat_k)
-        )
-        chat_res = await session.execute(chat_stmt)
-        chat_messages = [dict(r) for r in chat_res.all()]
-        chat_messages.reverse()
-
-        kc_stmt = (
-            select(
-                KnowledgeChunk.text.label("content"),
-                KnowledgeChunk.created_at,
-            )
-            .where(KnowledgeChunk.agent_id == agent_id)
-            .where(KnowledgeChunk.embedding.cosine_distance(query_vec) < 0.35)
-            .order_by(KnowledgeChunk.embedding.cosine_distance(query_vec))
-            .limit(semantic_k)
-        )
-        kc_res = await session.execute(kc_stmt)
-        knowledge_hits = [
-            {"role": "system", "content": r.content, "created_at": r.created_at}
-            for r in kc_res.all()
-        ]
-
-        hist_stmt = (
-            select(
-                MessageHistory.role,
-                MessageHistory.content,
-                MessageHistory.created_at,
+            chat_res = await session.execute(chat_stmt)
+            chat_messages = [dict(r) for r in chat_res.all()]
+            chat_messages.reverse()
+
+            kc_columns = (KnowledgeChunk.text.label("content"), KnowledgeChunk.created_at)
+            lexical_res = await session.execute(
+                lexical_query(
+                    current_user_message, *kc_columns, agent_id=agent_id, tenant_id=tenant_id, limit=semantic_k
+                )
             )
-            .where(MessageHistory.agent_id == agent_id)
-            .where(MessageHistory.embedding.cosine_distance(query_vec) < 0.35)
-            .order_by(MessageHistory.embedding.cosine_distance(query_vec))
-            .limit(semantic_k)
-        )
-        hist_res = await session.execute(hist_stmt)
-        semantic_hits = [dict(r) for r in hist_res.all()]
+            kc_rankings = [lexical_res.all()]
+            semantic_hits: List[Dict] = []
+
+            query_vec = await embedding
+            if query_vec is not None:
+                await widen_scan(session, semantic_k)
+                kc_res = await session.execute(
+                    vector_query(
+                        query_vec,
+                        *kc_columns,
+                        agent_id=agent_id,
+                        tenant_id=tenant_id,
+                        limit=semantic_k,
+                        max_distance=0.35,
+                        embedding_model=backend.key,
+                    )
+                )
+                kc_rankings.append(kc_res.all())
+
+                hist_stmt = nearest(
+                    select(
+                        MessageHistory.role,
+                        MessageHistory.content,
+                        MessageHistory.created_at,
+                    ).where(*history_scope, MessageHistory.embedding_model == backend.key),
+                    MessageHistory.embedding,
+                    MessageHistory.id,
+                    query_vec,
+                    semantic_k,
+                    max_distance=0.35,
+                )
+                hist_res = await session.execute(hist_stmt)
+                semantic_hits = [dict(r) for r in hist_res.all()]
+    finally:
+        embedding.cancel()
+
+    knowledge_hits = [
+        {"role": "system", "content": r.content, "created_at": r.created_at}
+        for r in reciprocal_rank_fusion(kc_rankings, key=lambda r: r.content)[:semantic_k]
+    ]
 
     combined = chat_messages + knowledge_hits + semantic_hits
     combined.sort(key=lambda r: r["created_at"])  # chronological
@@ -2,11 +2,21 @@ from __future__ import annotations
 
 import asyncio
 import builtins
+import hashlib
 import json
 import logging
+import multiprocessing
 import re
-from types import MappingProxyType
-from typing import Any, Dict
+from multiprocessing.connection import Connection
+from types import CodeType, MappingProxyType
+from typing import Any, Dict, Hashable, List
+
+from ..config import settings
+
+try:  # pragma: no cover - platform dependent
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None
 
 logger = logging.getLogger(__name__)
 
@@ -35,29 +45,303 @@ SAFE_BUILTINS = MappingProxyType({
     ]
 })
 
+# Per-worker cache of compiled plugins keyed by code hash.
+_COMPILED_LIMIT = 256
+_compiled: Dict[str, CodeType] = {}
+# Code hashes that passed validation in this process.
+_validated: set[str] = set()
+
+_MP = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _set_cpu_budget(seconds: int) -> None:
+    """Allow the worker ``seconds`` more CPU time before the kernel kills it."""
+
+    if resource is None or seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(usage.ru_utime + usage.ru_stime) + seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _exec_single(compiled: CodeType, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    scope = {"__builtins__": SAFE_BUILTINS, "input": input_data, "output": None}
+    exec(compiled, scope)
+    result = scope.get("output")
+    return result if isinstance(result, dict) else {"result": result}
+
+
+def _exec_batch(compiled: CodeType, mode: str, payload: Any) -> List[Dict[str, Any]]:
+    """Run a chunk of records.
+
+    In ``each`` mode a single-record plugin is applied to each record of the
+    list in turn. In ``rows`` and ``columns`` mode a batch plugin reads
+    ``inputs`` (a list of records) or ``columns`` (a dict of equal-length
+    lists) and sets ``outputs`` to one result per record, as a list or as
+    columns.
+    """
+
+    if mode == "each":
+        return [_exec_single(compiled, row) for row in payload]
+    rows = payload if mode == "rows" else [dict(zip(payload, values)) for values in zip(*payload.values())]
+    scope = {
+        "__builtins__": SAFE_BUILTINS,
+        "inputs": rows if mode == "rows" else None,
+        "columns": payload if mode == "columns" else None,
+        "outputs": None,
+    }
+    exec(compiled, scope)
+    outputs = scope.get("outputs")
+    if isinstance(outputs, dict):
+        outputs = [dict(zip(outputs, values)) for values in zip(*outputs.values())]
+    if not isinstance(outputs, list) or len(outputs) != len(rows):
+        raise ValueError("batch plugin must set outputs with one result per input record")
+    return [item if isinstance(item, dict) else {"result": item} for item in outputs]
+
+
+def _worker_main(conn: Connection, cpu_seconds: int, memory_mb: int) -> None:
+    """Worker process loop: execute plugin code received over ``conn``."""
+
+    if resource is not None and memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        digest, code, mode, payload = job
+        _set_cpu_budget(cpu_seconds)
+        try:
+            compiled = _compiled.get(digest)
+            if compiled is None:
+                if len(_compiled) >= _COMPILED_LIMIT:
+                    _compiled.clear()
+                compiled = _compiled[digest] = compile(code, "<plugin>", "exec")
+            if mode == "single":
+                conn.send(("ok", _exec_single(compiled, payload)))
+            else:
+                conn.send(("ok", _exec_batch(compiled, mode, payload)))
+        except BaseException as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+
+
+class _Worker:
+    """Handle on one warm plugin process."""
+
+    def __init__(self, cpu_seconds: int, memory_mb: int) -> None:
+        self.conn, child = _MP.Pipe()
+        self.process = _MP.Process(target=_worker_main, args=(child, cpu_seconds, memory_mb), daemon=True)
+        self.process.start()
+        child.close()
+        self.executions = 0
+
+    async def run(self, digest: str, code: str, mode: str, payload: Any, timeout: float) -> tuple[str, Any]:
+        """Send a job and return the worker's reply.
+
+        Pickling and pipe transfers of batch chunks can take a while, so they
+        run in a thread; the event loop only waits for the reply's first byte.
+        """
+
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = self.conn.fileno()
+        await asyncio.to_thread(self.conn.send, (digest, code, mode, payload))
+        self.executions += 1
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await asyncio.wait_for(ready, timeout)
+        finally:
+            loop.remove_reader(fd)
+        return await asyncio.to_thread(self.conn.recv)
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.conn.close()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class _TenantSlot:
+    """Concurrency cap of one tenant and the number of runs holding or awaiting it."""
+
+    def __init__(self, limit: int) -> None:
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class PluginWorkerPool:
+    """Pre-forked plugin processes with hard timeouts and per-tenant caps.
 
-async def run_plugin(code: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Execute plugin code safely and return result."""
+    Workers run under CPU and address-space rlimits, are killed and replaced
+    when a plugin overruns ``timeout`` or crashes, and are recycled after
+    ``max_tasks`` executions. A tenant's slot is dropped once none of its
+    runs hold or await it.
+    """
 
+    def __init__(
+        self,
+        size: int,
+        timeout: float,
+        cpu_seconds: int,
+        memory_mb: int,
+        max_tasks: int,
+        tenant_concurrency: int,
+    ) -> None:
+        self.size = size
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.max_tasks = max_tasks
+        self.tenant_concurrency = tenant_concurrency
+        self._idle: asyncio.Queue[_Worker] | None = None
+        self._workers: set[_Worker] = set()
+        self._tenant_slots: Dict[Hashable, _TenantSlot] = {}
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self.cpu_seconds, self.memory_mb)
+        self._workers.add(worker)
+        return worker
+
+    def _retire(self, worker: _Worker, *, kill: bool) -> None:
+        self._workers.discard(worker)
+        worker.kill() if kill else worker.stop()
+
+    def start(self) -> None:
+        """Fork the warm workers; called lazily on first use if not at startup."""
+
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(self._spawn())
+
+    async def close(self) -> None:
+        for worker in list(self._workers):
+            self._retire(worker, kill=False)
+        self._idle = None
+        self._tenant_slots.clear()
+
+    def _slot(self, tenant_id: Hashable | None) -> _TenantSlot | None:
+        if tenant_id is None or self.tenant_concurrency <= 0:
+            return None
+        slot = self._tenant_slots.get(tenant_id)
+        if slot is None:
+            slot = self._tenant_slots[tenant_id] = _TenantSlot(self.tenant_concurrency)
+        return slot
+
+    async def run(
+        self,
+        code: str,
+        payload: Any,
+        tenant_id: Hashable | None = None,
+        digest: str | None = None,
+        mode: str = "single",
+    ) -> Any:
+        """Execute ``code`` on ``payload``; ``mode`` is ``single``, ``each``, ``rows`` or ``columns``."""
+
+        digest = digest or code_hash(code)
+        slot = self._slot(tenant_id)
+        if slot is None:
+            return await self._run(digest, code, mode, payload)
+        slot.users += 1
+        try:
+            async with slot.semaphore:
+                return await self._run(digest, code, mode, payload)
+        finally:
+            slot.users -= 1
+            if not slot.users and self._tenant_slots.get(tenant_id) is slot:
+                del self._tenant_slots[tenant_id]
+
+    async def _run(self, digest: str, code: str, mode: str, payload: Any) -> Any:
+        self.start()
+        idle = self._idle
+        worker = await idle.get()
+        replacement = True
+        try:
+            status, result = await worker.run(digest, code, mode, payload, self.timeout)
+            replacement = worker.executions >= self.max_tasks
+        except asyncio.TimeoutError as exc:
+            logger.warning("Plugin exceeded %ss; killing worker %s", self.timeout, worker.process.pid)
+            raise TimeoutError("plugin timed out") from exc
+        except (EOFError, OSError) as exc:
+            logger.warning("Plugin worker %s died (exit code %s)", worker.process.pid, worker.process.exitcode)
+            raise RuntimeError("plugin worker crashed or exceeded its resource limits") from exc
+        finally:
+            if replacement:
+                self._retire(worker, kill=True)
+                if idle is self._idle:
+                    idle.put_nowait(self._spawn())
+            elif idle is self._idle:
+                idle.put_nowait(worker)
+            else:
+                self._retire(worker, kill=False)
+        if status == "error":
+            raise RuntimeError(result)
+        return result
+
+
+plugin_pool = PluginWorkerPool(
+    size=settings.plugin_workers,
+    timeout=settings.plugin_timeout,
+    cpu_seconds=settings.plugin_cpu_seconds,
+    memory_mb=settings.plugin_memory_mb,
+    max_tasks=settings.plugin_max_tasks_per_worker,
+    tenant_concurrency=settings.plugin_tenant_concurrency,
+)
+
+
+def code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode()).hexdigest()
+
+
+def validate_plugin(code: str) -> str:
+    """Check plugin code once and return its hash; later calls for the same code are free."""
+
+    digest = code_hash(code)
+    if digest in _validated:
+        return digest
     if FORBIDDEN_RE.search(code):
         raise ValueError("disallowed keywords present")
     try:
-        compiled = compile(code, "<plugin>", "exec")
+        compile(code, "<plugin>", "exec")
     except SyntaxError as exc:
         raise ValueError("syntax error") from exc
+    _validated.add(digest)
+    return digest
 
-    def _exec() -> Dict[str, Any]:
-        scope = {"__builtins__": SAFE_BUILTINS, "input": input_data, "output": None}
-        exec(compiled, scope)
-        result = scope.get("output")
-        if isinstance(result, dict):
-            return result
-        return {"result": result}
 
-    try:
-        result = await asyncio.wait_for(asyncio.to_thread(_exec), timeout=10)
-    except asyncio.TimeoutError as exc:
-        raise TimeoutError("plugin timed out") from exc
+async def run_plugin(
+    code: str,
+    input_data: Dict[str, Any],
+    tenant_id: Hashable | None = None,
+    digest: str | None = None,
+) -> Dict[str, Any]:
+    """Execute plugin code safely and return result.
+
+    ``digest`` is the hash returned by :func:`validate_plugin`; passing it skips
+    re-validating code that is already known to be safe.
+    """
+
+    if digest is None or digest not in _validated:
+        digest = validate_plugin(code)
+    result = await plugin_pool.run(code, input_data, tenant_id, digest)
 
     try:
         text = json.dumps(result)
@@ -67,3 +351,54 @@ async def run_plugin(code: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         text = text[:1000] + "..."
     logger.info("Plugin executed with output: %s", text)
     return result
+
+
+def _to_columns(records: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    keys = list(dict.fromkeys(key for record in records for key in record))
+    return {key: [record.get(key) for record in records] for key in keys}
+
+
+async def run_plugin_batch(
+    code: str,
+    records: List[Dict[str, Any]],
+    tenant_id: Hashable | None = None,
+    digest: str | None = None,
+    *,
+    batch: bool = False,
+    columnar: bool = False,
+    chunk_size: int | None = None,
+) -> List[Dict[str, Any]]:
+    """Apply a plugin to many records, one result per record in input order.
+
+    Records are split into chunks executed in parallel on the worker pool
+    (subject to the tenant's concurrency cap). A ``batch`` plugin receives
+    each chunk at once, as ``columns`` instead of ``inputs`` with
+    ``columnar``; other plugins run once per record inside the worker.
+    """
+
+    if digest is None or digest not in _validated:
+        digest = validate_plugin(code)
+    size = chunk_size or settings.plugin_batch_chunk_size
+    columnar = columnar and batch
+    mode = ("columns" if columnar else "rows") if batch else "each"
+    tasks = [
+        asyncio.ensure_future(
+            plugin_pool.run(
+                code,
+                _to_columns(records[i : i + size]) if columnar else records[i : i + size],
+                tenant_id,
+                digest,
+                mode,
+            )
+        )
+        for i in range(0, len(records), size)
+    ]
+    try:
+        chunks = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    results = [row for chunk in chunks for row in chunk]
+    logger.info("Plugin batch executed over %s records in %s chunks", len(records), len(tasks))
+    return results
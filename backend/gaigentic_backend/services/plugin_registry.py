@@ -0,0 +1,55 @@
+"""In-process cache of validated plugins to avoid per-node database lookups."""
+from __future__ import annotations
+
+import time
+from typing import Dict, NamedTuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models.plugin import Plugin
+from .plugin_executor import validate_plugin
+
+
+class CachedPlugin(NamedTuple):
+    tenant_id: UUID
+    code: str
+    digest: str
+    batch: bool
+    loaded_at: float
+
+
+_plugins: Dict[UUID, CachedPlugin] = {}
+
+
+def register_plugin(plugin: Plugin) -> CachedPlugin:
+    """Validate ``plugin`` and cache it under its id and code hash."""
+
+    entry = CachedPlugin(
+        plugin.tenant_id, plugin.code, validate_plugin(plugin.code), bool(plugin.batch), time.monotonic()
+    )
+    _plugins[plugin.id] = entry
+    return entry
+
+
+def invalidate_plugin(plugin_id: UUID) -> None:
+    _plugins.pop(plugin_id, None)
+
+
+async def get_active_plugin(session: AsyncSession, plugin_id: UUID, tenant_id: UUID) -> CachedPlugin | None:
+    """Return the active plugin for ``tenant_id``, loading it only on a cache miss.
+
+    Entries expire after ``PLUGIN_CACHE_TTL`` seconds so a plugin disabled
+    through another worker process stops running within that window.
+    """
+
+    entry = _plugins.get(plugin_id)
+    if entry is not None and time.monotonic() - entry.loaded_at < settings.plugin_cache_ttl:
+        return entry if entry.tenant_id == tenant_id else None
+    plugin = await session.get(Plugin, plugin_id)
+    if plugin is None or not plugin.is_active:
+        invalidate_plugin(plugin_id)
+        return None
+    entry = register_plugin(plugin)
+    return entry if entry.tenant_id == tenant_id else None
@@ -0,0 +1,102 @@
+"""Aggregation of per-node execution timings into workflow profiles."""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+_METRICS = ("duration_ms", "queue_wait_ms", "tool_ms")
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the ``q`` percentile (0-100) of ``values`` using linear interpolation."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def summarize_steps(steps: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Group step timing rows by node and compute p50/p95 per metric.
+
+    Skipped steps take no time, so they are counted under ``skipped`` and left
+    out of ``samples`` and the percentiles.
+    """
+
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for step in steps:
+        entry = grouped.setdefault(
+            step["node_id"],
+            {"tool": step.get("tool"), "samples": 0, "skipped": 0, **{m: [] for m in _METRICS}},
+        )
+        if step.get("status") == "skipped":
+            entry["skipped"] += 1
+            continue
+        entry["samples"] += 1
+        entry["tool"] = entry["tool"] or step.get("tool")
+        for metric in _METRICS:
+            entry[metric].append(float(step[metric]))
+
+    for entry in grouped.values():
+        for metric in _METRICS:
+            values = entry[metric]
+            entry[metric] = {
+                "p50": round(percentile(values, 50), 3),
+                "p95": round(percentile(values, 95), 3),
+            }
+    return grouped
+
+
+def critical_path(
+    nodes: List[str], edges: List[Tuple[str, str]], durations: Dict[str, float]
+) -> Dict[str, Any]:
+    """Compute the longest duration path through the DAG and per-node slack.
+
+    Slack is how much a node could slow down before it lengthens the
+    critical path, assuming dependencies are the only ordering constraint.
+    """
+
+    preds: Dict[str, List[str]] = {n: [] for n in nodes}
+    succs: Dict[str, List[str]] = {n: [] for n in nodes}
+    for src, dst in edges:
+        if src in preds and dst in preds:
+            succs[src].append(dst)
+            preds[dst].append(src)
+
+    indegree = {n: len(preds[n]) for n in nodes}
+    queue = [n for n in nodes if indegree[n] == 0]
+    order: List[str] = []
+    while queue:
+        nid = queue.pop(0)
+        order.append(nid)
+        for nxt in succs[nid]:
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                queue.append(nxt)
+    if len(order) != len(nodes):
+        raise ValueError("workflow graph has cycle")
+
+    earliest_start: Dict[str, float] = {}
+    earliest_finish: Dict[str, float] = {}
+    for nid in order:
+        earliest_start[nid] = max((earliest_finish[p] for p in preds[nid]), default=0.0)
+        earliest_finish[nid] = earliest_start[nid] + durations.get(nid, 0.0)
+    length = max(earliest_finish.values(), default=0.0)
+
+    latest_finish: Dict[str, float] = {}
+    for nid in reversed(order):
+        latest_finish[nid] = min(
+            (latest_finish[s] - durations.get(s, 0.0) for s in succs[nid]), default=length
+        )
+    slack = {nid: round(latest_finish[nid] - earliest_finish[nid], 3) for nid in order}
+
+    path: List[str] = []
+    if order:
+        current = max(order, key=lambda n: earliest_finish[n])
+        while current is not None:
+            path.append(current)
+            current = max(preds[current], key=lambda p: earliest_finish[p], default=None)
+        path.reverse()
+    return {"path": path, "length_ms": round(length, 3), "slack_ms": slack}
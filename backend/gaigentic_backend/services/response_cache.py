@@ -0,0 +1,99 @@
+"""In-process semantic cache of chat answers, keyed by question embedding."""
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections import OrderedDict, deque
+from operator import mul
+from typing import Any, Deque, Hashable, List, NamedTuple, Sequence
+
+from prometheus_client import Counter
+
+from ..config import settings
+
+CHAT_CACHE_HITS = Counter("chat_cache_hits_total", "Chat questions answered from the semantic cache")
+CHAT_CACHE_MISSES = Counter("chat_cache_misses_total", "Cacheable chat questions sent to the LLM")
+
+
+class CachedAnswer(NamedTuple):
+    vector: array
+    generation: int
+    response: Any
+    stored_at: float
+
+
+# Scopes in least recently used order; ``_size`` counts answers across all of them.
+_answers: "OrderedDict[Hashable, Deque[CachedAnswer]]" = OrderedDict()
+_size = 0
+
+
+def _unit(vector: Sequence[float]) -> array:
+    """Normalise ``vector`` into single-precision floats (4 bytes per dimension)."""
+
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return array("f", (value / norm for value in vector))
+
+
+def _discard(scope: Hashable, entry: CachedAnswer) -> None:
+    global _size
+    entries = _answers[scope]
+    entries.remove(entry)
+    _size -= 1
+    if not entries:
+        del _answers[scope]
+
+
+def lookup(scope: Hashable, generation: int, vector: List[float]) -> Any | None:
+    """Return the answer to the most similar cached question of ``scope``.
+
+    Only answers given at the same knowledge ``generation``, younger than
+    ``CHAT_CACHE_TTL`` and with cosine similarity of at least
+    ``CHAT_CACHE_THRESHOLD`` qualify; the others are dropped.
+    """
+
+    query = _unit(vector)
+    now = time.monotonic()
+    best, best_similarity = None, settings.chat_cache_threshold
+    for entry in list(_answers.get(scope, ())):
+        if entry.generation != generation or now - entry.stored_at >= settings.chat_cache_ttl:
+            _discard(scope, entry)
+            continue
+        similarity = sum(map(mul, query, entry.vector))
+        if similarity >= best_similarity:
+            best, best_similarity = entry, similarity
+    if best is None:
+        CHAT_CACHE_MISSES.inc()
+        return None
+    _answers.move_to_end(scope)
+    CHAT_CACHE_HITS.inc()
+    return best.response
+
+
+def store(scope: Hashable, generation: int, vector: List[float], response: Any) -> None:
+    """Remember ``response``, keeping at most ``CHAT_CACHE_SIZE`` answers per scope.
+
+    Beyond ``CHAT_CACHE_MAX_ENTRIES`` answers in total, the oldest answers of
+    the least recently used scopes are evicted.
+    """
+
+    global _size
+    if settings.chat_cache_size <= 0 or settings.chat_cache_max_entries <= 0:
+        return
+    entries = _answers.get(scope)
+    if entries is None:
+        entries = _answers[scope] = deque()
+    _answers.move_to_end(scope)
+    entries.append(CachedAnswer(_unit(vector), generation, response, time.monotonic()))
+    _size += 1
+    while len(entries) > settings.chat_cache_size:
+        _discard(scope, entries[0])
+    while _size > settings.chat_cache_max_entries:
+        oldest = next(iter(_answers))
+        _discard(oldest, _answers[oldest][0])
+
+
+def clear() -> None:
+    global _size
+    _answers.clear()
+    _size = 0
@@ -5,6 +5,7 @@ from __future__ import annotations
 import httpx
 
 from ..config import SUPERAGENT_API_KEY_PREFIX, settings
+from .tracing import propagation_headers
 
 
 class SuperagentClient:
@@ -19,7 +20,7 @@ class SuperagentClient:
     async def post(self, url: str, json: dict) -> httpx.Response:
         """Send a POST request."""
 
-        return await self._client.post(url, json=json)
+        return await self._client.post(url, json=json, headers=propagation_headers())
 
     async def aclose(self) -> None:
         """Close the underlying HTTP client."""
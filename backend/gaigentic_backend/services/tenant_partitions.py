@@ -0,0 +1,93 @@
+"""Per-tenant list partitions of the knowledge and message history tables."""
+from __future__ import annotations
+
+import logging
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..database import engine
+from ..models.knowledge_chunk import KnowledgeChunk
+from ..models.message_history import MessageHistory
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = (KnowledgeChunk.__table__, MessageHistory.__table__)
+# Arbitrary constant serialising partition creation across workers.
+_ADVISORY_LOCK_ID = 0x74656E
+
+
+def partition_name(table: str, tenant_id: UUID) -> str:
+    """Return the partition of ``table`` holding rows for ``tenant_id``."""
+    return f"{table}_t{tenant_id.hex}"
+
+
+async def _partition_exists(conn: AsyncConnection, name: str) -> bool:
+    return bool(await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}))
+
+
+async def ensure_tenant_partitions(conn: AsyncConnection, tenant_id: UUID) -> List[str]:
+    """Create the partitions of ``tenant_id`` that are missing and return their names.
+
+    Rows the tenant already has in a default partition are moved into the new
+    partition before it is attached, which builds its local indexes.
+    """
+
+    if conn.dialect.name != "postgresql":
+        return []
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+    created = []
+    for table in PARTITIONED_TABLES:
+        name = partition_name(table.name, tenant_id)
+        if await _partition_exists(conn, name):
+            continue
+        columns = ", ".join(column.name for column in table.columns if column.computed is None)
+        await conn.execute(
+            text(f'CREATE TABLE "{name}" (LIKE {table.name} INCLUDING DEFAULTS INCLUDING GENERATED)')
+        )
+        moved = await conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {table.name}_default WHERE tenant_id = :tenant RETURNING {columns}) "
+                f'INSERT INTO "{name}" ({columns}) SELECT {columns} FROM moved'
+            ),
+            {"tenant": tenant_id},
+        )
+        await conn.execute(
+            text(f"ALTER TABLE {table.name} ATTACH PARTITION \"{name}\" FOR VALUES IN ('{tenant_id}')")
+        )
+        logger.info("Created partition %s with %d existing rows", name, moved.rowcount)
+        created.append(name)
+    return created
+
+
+async def drop_tenant_partitions(conn: AsyncConnection, tenant_id: UUID) -> List[str]:
+    """Detach and drop the partitions of ``tenant_id``, e.g. after the tenant is deleted."""
+
+    if conn.dialect.name != "postgresql":
+        return []
+    dropped = []
+    for table in PARTITIONED_TABLES:
+        name = partition_name(table.name, tenant_id)
+        if not await _partition_exists(conn, name):
+            continue
+        await conn.execute(text(f'ALTER TABLE {table.name} DETACH PARTITION "{name}"'))
+        await conn.execute(text(f'DROP TABLE "{name}"'))
+        dropped.append(name)
+    return dropped
+
+
+async def partition_all_tenants() -> List[str]:
+    """Give every tenant its own partitions, moving rows out of the default partitions."""
+
+    if engine.dialect.name != "postgresql":
+        return []
+    async with engine.connect() as conn:
+        tenant_ids = (await conn.execute(text("SELECT id FROM tenant ORDER BY created_at"))).scalars().all()
+    created = []
+    for tenant_id in tenant_ids:
+        # One transaction per tenant keeps locks on the default partition short.
+        async with engine.begin() as conn:
+            created += await ensure_tenant_partitions(conn, tenant_id)
+    return created
@@ -0,0 +1,64 @@
+"""Incremental maintenance of the per-tenant statistics rollup."""
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.ingested_file import IngestedFile
+from ..models.tenant_stats import TenantStats
+
+
+async def bump_tenant_stats(
+    session: AsyncSession,
+    tenant_id: UUID,
+    *,
+    agents: int = 0,
+    files: int = 0,
+    executions: int = 0,
+    duration_ms: int = 0,
+) -> None:
+    """Add the given deltas to the tenant's stats row within ``session``.
+
+    The caller commits, so the rollup stays consistent with the rows it counts.
+    """
+
+    stmt = insert(TenantStats).values(
+        tenant_id=tenant_id,
+        agent_count=agents,
+        ingested_file_count=files,
+        execution_count=executions,
+        total_duration_ms=duration_ms,
+    )
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TenantStats.tenant_id],
+        set_={
+            "agent_count": TenantStats.agent_count + excluded.agent_count,
+            "ingested_file_count": TenantStats.ingested_file_count + excluded.ingested_file_count,
+            "execution_count": TenantStats.execution_count + excluded.execution_count,
+            "total_duration_ms": TenantStats.total_duration_ms + excluded.total_duration_ms,
+            "updated_at": func.now(),
+        },
+    )
+    await session.execute(stmt)
+
+
+async def record_ingested_file(session: AsyncSession, tenant_id: UUID, source_file_name: str) -> bool:
+    """Count ``source_file_name`` as ingested unless the tenant already has it.
+
+    The unique insert makes concurrent ingestions of the same new file wait on
+    each other, so only one of them counts it. Returns whether it was new.
+    """
+
+    result = await session.execute(
+        insert(IngestedFile)
+        .values(tenant_id=tenant_id, source_file_name=source_file_name)
+        .on_conflict_do_nothing(index_elements=[IngestedFile.tenant_id, IngestedFile.source_file_name])
+    )
+    if result.rowcount != 1:
+        return False
+    await bump_tenant_stats(session, tenant_id, files=1)
+    return True
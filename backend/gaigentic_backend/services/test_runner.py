@@ -1,31 +1,143 @@
 """Utilities for running agent tests."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
-from typing import Any, Dict
-from uuid import UUID
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Sequence
+from uuid import UUID, uuid4
 
 from deepdiff import DeepDiff
+from fastapi import HTTPException
+from sqlalchemy import insert
 
-from .workflow_executor import run_workflow
+from ..database import SessionLocal
+from ..models.agent import Agent
+from ..models.agent_test import AgentTest
+from ..models.agent_test_run import AgentTestRun
+from .cassette import use_cassette
+from .workflow_executor import WorkflowPlan, run_workflow
 
+logger = logging.getLogger(__name__)
+
+
+def canonical_hash(value: Any) -> str:
+    """Hash of ``value`` independent of dict key order."""
+
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
 
-async def run_test(
-    agent_id: UUID, input_context: Dict[str, Any], expected_output: Dict[str, Any], tenant_id: UUID
-) -> Dict[str, Any]:
-    """Execute an agent workflow and compare output."""
 
-    actual = await run_workflow(agent_id, input_context, tenant_id)
-    diff_obj = DeepDiff(expected_output, actual, ignore_order=True)
-    diff_dict = diff_obj.to_dict()
-    lines = json.dumps(diff_dict, indent=2).splitlines()
+def compare_outputs(expected_output: Dict[str, Any], actual: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare outputs, only computing a ``DeepDiff`` when they are not trivially equal."""
+
+    if canonical_hash(expected_output) == canonical_hash(actual):
+        return {"status": "pass", "diff": ""}
+    diff_dict = DeepDiff(expected_output, actual, ignore_order=True).to_dict()
+    lines = json.dumps(diff_dict, indent=2, default=str).splitlines()
     truncated = False
     if len(lines) > 100:
         lines = lines[:100]
         truncated = True
-    diff_text = "\n".join(lines)
-    result = {"status": "pass" if not diff_dict else "fail", "diff": diff_text, "actual": actual}
+    result = {"status": "pass" if not diff_dict else "fail", "diff": "\n".join(lines)}
     if truncated:
         result["diff_truncated"] = True
     return result
 
+
+async def run_test(
+    agent_id: UUID,
+    input_context: Dict[str, Any],
+    expected_output: Dict[str, Any],
+    tenant_id: UUID,
+    agent: Agent | None = None,
+    plan: WorkflowPlan | None = None,
+) -> Dict[str, Any]:
+    """Execute an agent workflow and compare output."""
+
+    actual = await run_workflow(agent_id, input_context, tenant_id, agent, plan=plan)
+    return {**compare_outputs(expected_output, actual), "actual": actual}
+
+
+async def record_test_runs(rows: List[Dict[str, Any]]) -> None:
+    """Persist test outcomes to the run history."""
+
+    if not rows:
+        return
+    async with SessionLocal() as session:
+        try:
+            await session.execute(insert(AgentTestRun), rows)
+            await session.commit()
+        except Exception as exc:  # pragma: no cover - runtime path
+            logger.exception("Failed to record %s test runs: %s", len(rows), exc)
+            await session.rollback()
+
+
+async def run_test_suite(
+    agent: Agent,
+    plan: WorkflowPlan,
+    tests: Sequence[AgentTest],
+    tenant_id: UUID,
+    concurrency: int,
+    cassette: str | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run ``tests`` concurrently, yielding each result as it finishes and then a summary.
+
+    ``cassette`` optionally overrides the record/replay mode for the tests' tool and LLM calls.
+    """
+
+    suite_id = uuid4()
+    limit = asyncio.Semaphore(concurrency)
+    history: List[Dict[str, Any]] = []
+    counts = {"pass": 0, "fail": 0, "error": 0}
+    started = time.perf_counter()
+
+    async def run_one(test: AgentTest) -> Dict[str, Any]:
+        async with limit:
+            start = time.perf_counter()
+            try:
+                with use_cassette(cassette):
+                    result = await run_test(
+                        agent.id, dict(test.input_context), dict(test.expected_output), tenant_id, agent, plan
+                    )
+            except HTTPException as exc:
+                result = {"status": "error", "error": exc.detail}
+            except Exception as exc:  # pragma: no cover - runtime path
+                logger.exception("Agent test %s failed to run: %s", test.id, exc)
+                result = {"status": "error", "error": str(exc)}
+            duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        return {"test_id": str(test.id), "name": test.name, "duration_ms": duration_ms, **result}
+
+    tasks = [asyncio.ensure_future(run_one(test)) for test in tests]
+    try:
+        for done in asyncio.as_completed(tasks):
+            event = await done
+            counts[event["status"]] += 1
+            history.append(
+                {
+                    "id": uuid4(),
+                    "tenant_id": tenant_id,
+                    "agent_id": agent.id,
+                    "test_id": UUID(event["test_id"]),
+                    "suite_id": suite_id,
+                    "status": event["status"],
+                    "duration_ms": event["duration_ms"],
+                }
+            )
+            yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+        await record_test_runs(history)
+    yield {
+        "summary": {
+            "suite_id": str(suite_id),
+            "total": len(tests),
+            "passed": counts["pass"],
+            "failed": counts["fail"],
+            "errors": counts["error"],
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+    }
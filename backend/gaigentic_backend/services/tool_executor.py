@@ -10,9 +10,11 @@ from fastapi import HTTPException, status
 
 from ..database import SessionLocal
 from ..models.agent import Agent
-from ..models.plugin import Plugin
 from .superagent_client import get_superagent_client
 from .plugin_executor import run_plugin
+from .plugin_registry import get_active_plugin
+from .cassette import CassetteMiss, through_cassette
+from .tracing import span
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import status
 from fastapi import HTTPException
@@ -25,6 +27,18 @@ logger = logging.getLogger(__name__)
 
 async def execute_tool(agent_id: UUID, tool_name: str, input_data: dict, tenant_id: UUID) -> dict:
     """Execute a registered tool through Superagent."""
+    with span("tool.execute", tool=tool_name, agent_id=str(agent_id), tenant_id=str(tenant_id)):
+        try:
+            return await through_cassette(
+                "tool",
+                {"tenant_id": tenant_id, "agent_id": agent_id, "tool": tool_name, "input": input_data},
+                lambda: _execute_tool(agent_id, tool_name, input_data, tenant_id),
+            )
+        except CassetteMiss as exc:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
+
+
+async def _execute_tool(agent_id: UUID, tool_name: str, input_data: dict, tenant_id: UUID) -> dict:
     async with SessionLocal() as session:  # type: AsyncSession
         agent = await session.get(Agent, agent_id)
         if agent is None or agent.tenant_id != tenant_id:
@@ -32,11 +46,11 @@ async def execute_tool(agent_id: UUID, tool_name: str, input_data: dict, tenant_
 
         if tool_name.startswith("plugin:"):
             plugin_id = UUID(tool_name.split(":", 1)[1])
-            plugin = await session.get(Plugin, plugin_id)
-            if plugin is None or plugin.tenant_id != tenant_id or not plugin.is_active:
+            plugin = await get_active_plugin(session, plugin_id, tenant_id)
+            if plugin is None:
                 raise HTTPException(status_code=404, detail="Plugin not found")
             try:
-                return await run_plugin(plugin.code, input_data)
+                return await run_plugin(plugin.code, input_data, tenant_id, plugin.digest)
             except Exception as exc:
                 logger.exception("Plugin execution failed: %s", exc)
                 raise HTTPException(status_code=400, detail=str(exc)) from exc
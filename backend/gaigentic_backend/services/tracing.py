@@ -0,0 +1,332 @@
+"""Lightweight span tracing with OpenTelemetry-compatible identifiers and export.
+
+Spans are tracked through a context variable so they nest across ``await``
+boundaries and tasks. Sampling is decided at the root span and inherited by
+children. Finished spans are buffered and exported in batches by a background
+task to the exporters named in ``TRACING_EXPORTERS`` (``jsonl`` and/or ``otlp``).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import random
+import secrets
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("current_span", default=None)
+_request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
+
+_MAX_BUFFERED_SPANS = 10_000
+_EXPORT_BATCH = 512
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "sampled", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, sampled: bool, attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, exc: BaseException) -> None:
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.sampled:
+            _tracer.record(self)
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(((self.end_ns or self.start_ns) - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """Return ``(trace_id, parent_span_id, sampled)`` from a W3C ``traceparent`` header."""
+
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+def tracing_enabled() -> bool:
+    return bool(settings.tracing_exporters)
+
+
+def start_span(name: str, traceparent: str | None = None, **attributes: Any) -> Span | None:
+    """Create a span as a child of the current one without activating it.
+
+    Returns ``None`` when tracing is disabled. Callers must call ``end()``.
+    """
+
+    if not tracing_enabled():
+        return None
+    parent = _current_span.get()
+    remote = parse_traceparent(traceparent) if parent is None else None
+    if parent is not None:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    elif remote is not None:
+        trace_id, parent_id, sampled = remote
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+        sampled = random.random() < settings.tracing_sample_rate
+    request_id = _request_id.get()
+    if request_id is not None:
+        attributes.setdefault("request.id", request_id)
+    return Span(name, trace_id, parent_id, sampled, attributes)
+
+
+@contextmanager
+def span(name: str, traceparent: str | None = None, **attributes: Any) -> Iterator[Span | None]:
+    """Context manager running the enclosed block inside a new current span."""
+
+    current = start_span(name, traceparent, **attributes)
+    if current is None:
+        yield None
+        return
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.record_error(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def set_request_id(request_id: str | None) -> contextvars.Token:
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: contextvars.Token) -> None:
+    _request_id.reset(token)
+
+
+def propagation_headers() -> Dict[str, str]:
+    """Headers carrying the current trace and request id to downstream services."""
+
+    headers: Dict[str, str] = {}
+    current = _current_span.get()
+    if current is not None:
+        headers["traceparent"] = current.traceparent()
+    request_id = _request_id.get()
+    if request_id is not None:
+        headers["X-Request-ID"] = request_id
+    return headers
+
+
+class JsonLinesExporter:
+    """Append finished spans to a local file, one JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def _write(self, lines: List[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.writelines(lines)
+
+    async def export(self, spans: List[Span]) -> None:
+        lines = [json.dumps(s.to_dict(), default=str) + "\n" for s in spans]
+        await asyncio.to_thread(self._write, lines)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPHttpExporter:
+    """Send spans to an OpenTelemetry collector using OTLP/HTTP JSON."""
+
+    def __init__(self, endpoint: str, service_name: str) -> None:
+        self.endpoint = endpoint.rstrip("/")
+        if not self.endpoint.endswith("/v1/traces"):
+            self.endpoint += "/v1/traces"
+        self.service_name = service_name
+        self._client = httpx.AsyncClient(timeout=5)
+
+    def _payload(self, spans: List[Span]) -> Dict[str, Any]:
+        otlp_spans = []
+        for s in spans:
+            item: Dict[str, Any] = {
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 1,
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+            }
+            if s.parent_id:
+                item["parentSpanId"] = s.parent_id
+            otlp_spans.append(item)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]
+                    },
+                    "scopeSpans": [{"scope": {"name": "gaigentic"}, "spans": otlp_spans}],
+                }
+            ]
+        }
+
+    async def export(self, spans: List[Span]) -> None:
+        resp = await self._client.post(self.endpoint, json=self._payload(spans))
+        resp.raise_for_status()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _build_exporters() -> List[Any]:
+    exporters: List[Any] = []
+    for name in settings.tracing_exporters:
+        if name == "jsonl":
+            exporters.append(JsonLinesExporter(settings.tracing_file))
+        elif name == "otlp":
+            exporters.append(OTLPHttpExporter(settings.otlp_endpoint, settings.otel_service_name))
+        else:
+            logger.warning("Unknown tracing exporter %s ignored", name)
+    return exporters
+
+
+class _Tracer:
+    """Buffers finished spans and exports them from a background task."""
+
+    def __init__(self) -> None:
+        self._buffer: List[Span] = []
+        self._exporters: List[Any] | None = None
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    def record(self, finished: Span) -> None:
+        if len(self._buffer) >= _MAX_BUFFERED_SPANS:
+            self.dropped += 1
+            return
+        self._buffer.append(finished)
+
+    async def flush(self) -> None:
+        if self._exporters is None:
+            self._exporters = _build_exporters()
+        while self._buffer:
+            batch, self._buffer = self._buffer[:_EXPORT_BATCH], self._buffer[_EXPORT_BATCH:]
+            for exporter in self._exporters:
+                try:
+                    await exporter.export(batch)
+                except Exception as exc:  # pragma: no cover - exporter failures
+                    logger.warning("Span export via %s failed: %s", type(exporter).__name__, exc)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.tracing_flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if tracing_enabled() and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+        exporters, self._exporters = self._exporters or [], None
+        for exporter in exporters:
+            if hasattr(exporter, "aclose"):
+                await exporter.aclose()
+
+
+_tracer = _Tracer()
+start_tracer = _tracer.start
+shutdown_tracer = _tracer.shutdown
+flush_spans = _tracer.flush
+
+
+def instrument_engine(async_engine: AsyncEngine) -> None:
+    """Emit a span for SQL statements executed through ``async_engine``.
+
+    Statements run outside any span (background maintenance, log flushing) are
+    not traced so they do not start traces of their own.
+    """
+
+    sync_engine = async_engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is None or _current_span.get() is None:
+            return
+        context._trace_span = start_span(
+            "db.query",
+            **{"db.system": sync_engine.dialect.name, "db.statement": statement[:500]},
+        )
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        db_span = getattr(context, "_trace_span", None)
+        if db_span is not None:
+            db_span.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context) -> None:
+        db_span = getattr(exception_context.execution_context, "_trace_span", None)
+        if db_span is not None:
+            db_span.record_error(exception_context.original_exception)
+            db_span.end()
@@ -0,0 +1,162 @@
+"""Reduced-precision ANN indexes over stored embeddings with exact re-ranking."""
+from __future__ import annotations
+
+import logging
+from typing import Any, List
+
+from pgvector.sqlalchemy import BIT, HALFVEC, VECTOR
+from sqlalchemy import ColumnElement, Select, bindparam, cast, func, literal_column, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..database import engine
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIMENSIONS = 1536
+INDEXED_TABLES = ("knowledge_chunk", "message_history")
+PRECISIONS = ("full", "half", "binary")
+
+# Upper bound pgvector accepts for ``hnsw.ef_search``.
+MAX_EF_SEARCH = 1000
+
+_OPS = {"full": "vector_cosine_ops", "half": "halfvec_cosine_ops", "binary": "bit_hamming_ops"}
+
+
+def index_name(table: str) -> str:
+    return f"ix_{table}_embedding_hnsw"
+
+
+def _config(precision: str | None, dimensions: int | None) -> tuple[str, int]:
+    precision = precision or settings.vector_index_precision
+    dimensions = dimensions or settings.vector_index_dimensions
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown vector index precision {precision!r}")
+    if not 0 < dimensions <= EMBEDDING_DIMENSIONS:
+        raise ValueError(f"Vector index dimensions must be between 1 and {EMBEDDING_DIMENSIONS}")
+    return precision, dimensions
+
+
+def is_reduced(precision: str | None = None, dimensions: int | None = None) -> bool:
+    """Whether the index is coarser than the stored full-precision vectors."""
+
+    return _config(precision, dimensions) != ("full", EMBEDDING_DIMENSIONS)
+
+
+def index_expression(column: Any, precision: str | None = None, dimensions: int | None = None) -> ColumnElement:
+    """The indexed form of ``column``: leading ``dimensions`` at ``precision``.
+
+    text-embedding-3 vectors are trained so that a prefix is itself a usable
+    embedding (this is what the API's ``dimensions`` parameter returns, up to
+    normalisation, which cosine distance ignores), so shorter indexes need no
+    re-embedding. Other models' vectors lose their meaning when cut, so
+    :func:`~.embedding.get_backend` only accepts them if they fit the prefix.
+    """
+
+    precision, dimensions = _config(precision, dimensions)
+    expr = column
+    if dimensions < EMBEDDING_DIMENSIONS:
+        # Literal bounds: a bound parameter would not match the index expression.
+        expr = cast(func.subvector(column, literal_column("1"), literal_column(str(dimensions))), VECTOR(dimensions))
+    if precision == "half":
+        return cast(expr, HALFVEC(dimensions))
+    if precision == "binary":
+        return cast(func.binary_quantize(expr), BIT(dimensions))
+    return expr
+
+
+def quantize(query_vec: List[float], precision: str | None = None, dimensions: int | None = None) -> Any:
+    """Convert a query vector to the indexed form, matching :func:`index_expression`."""
+
+    precision, dimensions = _config(precision, dimensions)
+    prefix = query_vec[:dimensions]
+    if precision == "binary":
+        return "".join("1" if value > 0 else "0" for value in prefix)
+    return prefix
+
+
+def coarse_distance(column: Any, query_vec: List[float]) -> ColumnElement:
+    """Distance between ``query_vec`` and ``column`` that the configured index can serve."""
+
+    precision, dimensions = _config(None, None)
+    expr = index_expression(column, precision, dimensions)
+    value = bindparam(None, quantize(query_vec, precision, dimensions), type_=expr.type)
+    return expr.op("<~>" if precision == "binary" else "<=>")(value)
+
+
+def nearest(
+    stmt: Select,
+    column: Any,
+    key: Any,
+    query_vec: List[float],
+    limit: int,
+    max_distance: float | None = None,
+) -> Select:
+    """Order ``stmt`` by exact cosine distance of ``column`` to ``query_vec``.
+
+    With a reduced index, the ``VECTOR_RERANK_CANDIDATES`` rows nearest on the
+    index expression are shortlisted by ``key`` first, so only those full
+    vectors are read and compared. Run it after :func:`widen_scan`.
+    """
+
+    distance = column.cosine_distance(query_vec)
+    if is_reduced():
+        shortlist = (
+            stmt.with_only_columns(key)
+            .order_by(coarse_distance(column, query_vec))
+            .limit(max(limit, settings.vector_rerank_candidates))
+        )
+        stmt = stmt.where(key.in_(shortlist.scalar_subquery()))
+    if max_distance is not None:
+        stmt = stmt.where(distance < max_distance)
+    return stmt.order_by(distance).limit(limit)
+
+
+async def widen_scan(session: AsyncSession, limit: int) -> None:
+    """Let HNSW scans in the current transaction of ``session`` feed ``limit`` rows.
+
+    pgvector stops an HNSW scan after ``hnsw.ef_search`` rows (40 by default)
+    and only then applies the agent, tenant and model filters, so without this
+    the ``VECTOR_RERANK_CANDIDATES`` shortlist would be cut short silently.
+    Rows of every agent and embedding model share one index per partition, so
+    an agent with few rows can still come up short; ``VECTOR_ITERATIVE_SCAN``
+    (pgvector 0.8 or later) makes the scan continue until enough rows pass the
+    filters. Call it in the transaction that runs the :func:`nearest` query.
+    """
+
+    if engine.dialect.name != "postgresql":
+        return
+    ef_search = min(MAX_EF_SEARCH, max(limit, settings.vector_rerank_candidates))
+    await session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+    if settings.vector_iterative_scan:
+        # A re-ranked shortlist may arrive slightly out of order; exact results may not.
+        order = "relaxed_order" if is_reduced() else "strict_order"
+        await session.execute(text(f"SET LOCAL hnsw.iterative_scan = {order}"))
+
+
+def index_ddl(table: str, precision: str | None = None, dimensions: int | None = None) -> str:
+    """``CREATE INDEX`` statement for the HNSW index of ``table``."""
+
+    precision, dimensions = _config(precision, dimensions)
+    expr = index_expression(text("embedding"), precision, dimensions)
+    compiled = expr.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    if is_reduced(precision, dimensions):
+        compiled = f"({compiled})"
+    return f"CREATE INDEX {index_name(table)} ON {table} USING hnsw ({compiled} {_OPS[precision]})"
+
+
+async def rebuild_vector_indexes(precision: str | None = None, dimensions: int | None = None) -> None:
+    """Replace the embedding indexes with ones matching the configuration.
+
+    Indexes on the partitioned tables are rebuilt partition by partition in a
+    single transaction, which blocks writes to those tables until it finishes.
+    """
+
+    if engine.dialect.name != "postgresql":
+        return
+    async with engine.begin() as conn:
+        for table in INDEXED_TABLES:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index_name(table)}"))
+            await conn.execute(text(index_ddl(table, precision, dimensions)))
+            logger.info("Rebuilt %s", index_name(table))
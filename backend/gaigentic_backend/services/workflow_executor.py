@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import json
 import logging
-from typing import Any, Dict, List, AsyncGenerator
+import time
+from typing import Any, Dict, List, AsyncGenerator, NamedTuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -14,6 +16,7 @@ from ..schemas.chat import WorkflowDraft, Edge, Node
 from .memory_adapter import fetch_context_for_agent
 from .tool_executor import execute_tool
 from .condition_evaluator import evaluate_condition
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -49,12 +52,43 @@ def _topological_order(draft: WorkflowDraft) -> List[str]:
     return order
 
 
-async def run_workflow_stream(
-    agent_id: UUID, input_context: Dict[str, Any], tenant_id: UUID
-) -> AsyncGenerator[Dict[str, Any], None]:
-    """Yield workflow execution results step by step."""
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _step_timing(run_start: float, ready: float, start: float, end: float, tool_s: float) -> Dict[str, float]:
+    """Timing for one node, as offsets in ms from the start of the run."""
+
+    return {
+        "start_ms": _ms(start - run_start),
+        "end_ms": _ms(end - run_start),
+        "queue_wait_ms": _ms(max(start - ready, 0.0)),
+        "tool_ms": _ms(tool_s),
+        "duration_ms": _ms(end - start),
+    }
+
+
+class WorkflowPlan(NamedTuple):
+    """Validated, ordered workflow graph that can be reused across runs."""
+
+    order: List[str]
+    node_map: Dict[str, Node]
+    edges_by_source: Dict[str, List[Edge]]
+    edges_by_target: Dict[str, List[Edge]]
+    use_memory: bool
+
+
+def _memory_query(input_context: Dict[str, Any]) -> str:
+    """Text used to retrieve memory: the run's ``message`` or ``query``, else the whole context."""
+
+    for key in ("message", "query"):
+        if isinstance(input_context.get(key), str) and input_context[key]:
+            return input_context[key]
+    return json.dumps(input_context, default=str)
+
 
-    agent = await _load_agent(agent_id, tenant_id)
+def build_plan(agent: Agent) -> WorkflowPlan:
+    """Validate the agent's stored workflow and precompute its execution order."""
 
     workflow_data = (agent.config or {}).get("workflow")
     if not workflow_data:
@@ -70,35 +104,81 @@ async def run_workflow_stream(
     if len(order) > 25:
         raise HTTPException(status_code=400, detail="Workflow exceeds step limit")
 
-    use_memory = bool((agent.config or {}).get("use_memory"))
-    memory_context: Dict[str, Any] = {}
-    if use_memory:
-        memory_context = await fetch_context_for_agent(agent_id)
-
-    node_map: Dict[str, Node] = {n.id: n for n in draft.nodes}
     edges_by_source: Dict[str, List[Edge]] = {}
     edges_by_target: Dict[str, List[Edge]] = {}
     for e in draft.edges:
         edges_by_source.setdefault(e.source, []).append(e)
         edges_by_target.setdefault(e.target, []).append(e)
+    return WorkflowPlan(
+        order=order,
+        node_map={n.id: n for n in draft.nodes},
+        edges_by_source=edges_by_source,
+        edges_by_target=edges_by_target,
+        use_memory=bool((agent.config or {}).get("use_memory")),
+    )
+
+
+async def run_workflow_stream(
+    agent_id: UUID,
+    input_context: Dict[str, Any],
+    tenant_id: UUID,
+    agent: Agent | None = None,
+    plan: WorkflowPlan | None = None,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """Yield workflow execution results step by step.
+
+    ``agent`` may be supplied by callers that already loaded it to avoid a second
+    lookup, and ``plan`` by callers running the same workflow many times.
+    Each event carries a ``timing`` dict: start/end offsets from the run start, time
+    spent waiting after the node's upstream finished, and the tool call latency.
+    """
+
+    if plan is None:
+        if agent is None:
+            agent = await _load_agent(agent_id, tenant_id)
+        plan = build_plan(agent)
+    node_map = plan.node_map
+    edges_by_source, edges_by_target = plan.edges_by_source, plan.edges_by_target
+
+    memory_context: Dict[str, Any] = {}
+    if plan.use_memory:
+        memory_context = await fetch_context_for_agent(
+            agent_id, _memory_query(input_context), tenant_id=tenant_id
+        )
 
     results: Dict[str, Any] = {}
     triggered: Dict[str, List[str]] = {}
+    finished: Dict[str, float] = {}
+    run_start = time.perf_counter()
 
-    for node_id in order:
+    for node_id in plan.order:
         node = node_map[node_id]
         incoming = edges_by_target.get(node_id, [])
         upstream_ids = triggered.get(node_id, [])
         upstream = {sid: results[sid] for sid in upstream_ids}
+        ready = max((finished[sid] for sid in upstream_ids), default=run_start)
+        start = time.perf_counter()
 
         if incoming and not upstream:
-            yield {"node_id": node_id, "status": "skipped", "reason": "no_upstream"}
+            finished[node_id] = end = time.perf_counter()
+            yield {
+                "node_id": node_id,
+                "status": "skipped",
+                "reason": "no_upstream",
+                "timing": _step_timing(run_start, ready, start, end, 0.0),
+            }
             continue
 
         cond_ctx = {"context": input_context, "memory": memory_context, "upstream": upstream}
         try:
             if not evaluate_condition(node.condition, cond_ctx):
-                yield {"node_id": node_id, "status": "skipped", "reason": "condition"}
+                finished[node_id] = end = time.perf_counter()
+                yield {
+                    "node_id": node_id,
+                    "status": "skipped",
+                    "reason": "condition",
+                    "timing": _step_timing(run_start, ready, start, end, 0.0),
+                }
                 continue
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid node condition")
@@ -111,7 +191,10 @@ async def run_workflow_stream(
         }
         agent_override = node.agent_id or agent_id
         logger.info("Executing node %s (%s) using agent %s", node_id, node.type, agent_override)
-        output = await execute_tool(agent_override, node.type, step_input, tenant_id)
+        tool_start = time.perf_counter()
+        with span("workflow.node", node_id=node_id, tool=node.type):
+            output = await execute_tool(agent_override, node.type, step_input, tenant_id)
+        tool_s = time.perf_counter() - tool_start
         logger.info("Output for node %s: %s", node_id, output)
         results[node_id] = output
         for edge in edges_by_source.get(node_id, []):
@@ -123,19 +206,36 @@ async def run_workflow_stream(
                 continue
             triggered.setdefault(edge.target, []).append(node_id)
 
+        finished[node_id] = end = time.perf_counter()
         yield {
             "node_id": node_id,
             "tool": node.type,
             "output": output,
             "status": "success",
+            "timing": _step_timing(run_start, ready, start, end, tool_s),
         }
 
 
-async def run_workflow(agent_id: UUID, input_context: Dict[str, Any], tenant_id: UUID) -> Dict[str, Any]:
-    """Execute the stored workflow for an agent and return consolidated result."""
+async def run_workflow(
+    agent_id: UUID,
+    input_context: Dict[str, Any],
+    tenant_id: UUID,
+    agent: Agent | None = None,
+    step_log: List[Dict[str, Any]] | None = None,
+    plan: WorkflowPlan | None = None,
+) -> Dict[str, Any]:
+    """Execute the stored workflow for an agent and return consolidated result.
+
+    When ``step_log`` is given, per-node status and timing are appended to it.
+    """
 
     results: Dict[str, Any] = {}
-    async for step in run_workflow_stream(agent_id, input_context, tenant_id):
-        results[step["node_id"]] = step["output"]
+    with span("workflow.run", agent_id=str(agent_id), tenant_id=str(tenant_id)):
+        async for step in run_workflow_stream(agent_id, input_context, tenant_id, agent, plan):
+            if step_log is not None:
+                step_log.append(
+                    {"node_id": step["node_id"], "tool": step.get("tool"), "status": step["status"], **step["timing"]}
+                )
+            results[step["node_id"]] = step["output"]
 
     return {"steps": results, "status": "complete"}
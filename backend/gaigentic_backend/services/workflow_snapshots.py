@@ -0,0 +1,43 @@
+"""Deduplicated storage of workflow definitions referenced by execution logs."""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.workflow_snapshot import WorkflowSnapshot
+
+# Hashes already persisted by this process; lets repeat runs skip the upsert.
+_KNOWN_HASHES: set[str] = set()
+_KNOWN_HASHES_MAX = 10_000
+
+
+def snapshot_hash(workflow: Dict[str, Any]) -> str:
+    """Return the SHA-256 of the workflow's canonical JSON form."""
+
+    canonical = json.dumps(workflow, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+async def store_snapshot(session: AsyncSession, workflow: Dict[str, Any]) -> str:
+    """Ensure ``workflow`` is stored within ``session`` and return its hash."""
+
+    digest = snapshot_hash(workflow)
+    if digest not in _KNOWN_HASHES:
+        await session.execute(
+            insert(WorkflowSnapshot)
+            .values(hash=digest, workflow=workflow)
+            .on_conflict_do_nothing(index_elements=[WorkflowSnapshot.hash])
+        )
+    return digest
+
+
+def mark_stored(digest: str) -> None:
+    """Remember ``digest`` once the transaction storing it has committed."""
+
+    if len(_KNOWN_HASHES) >= _KNOWN_HASHES_MAX:
+        _KNOWN_HASHES.clear()
+    _KNOWN_HASHES.add(digest)
@@ -0,0 +1,178 @@
+"""Local stand-ins for Superagent and the OpenAI API with configurable latency.
+
+The servers speak just enough HTTP/1.1 (keep-alive, Content-Length bodies) for
+``httpx`` and the ``openai`` client, so benchmarks and load tests can run
+without network access or API keys.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+Handler = Callable[[str, Dict[str, Any]], Dict[str, Any]]
+
+EMBEDDING_DIM = 1536
+
+
+class FakeHTTPServer:
+    """Minimal JSON-over-HTTP server dispatching on method and path regex."""
+
+    def __init__(self, routes: List[Tuple[str, str, Handler]], latency_ms: float = 0.0, jitter_ms: float = 0.0) -> None:
+        self.routes = [(method, re.compile(pattern), handler) for method, pattern, handler in routes]
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.requests = 0
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self.url
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _delay(self) -> None:
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def _dispatch(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        path = path.split("?", 1)[0]
+        for route_method, pattern, handler in self.routes:
+            if route_method == method and pattern.fullmatch(path):
+                return 200, handler(path, body)
+        return 404, {"detail": "not found"}
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                raw = await reader.readexactly(int(headers.get("content-length", 0)))
+                body = json.loads(raw) if raw else {}
+                self.requests += 1
+                await self._delay()
+                status, payload = self._dispatch(method, path, body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Not Found'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode()
+                    + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionResetError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+
+def fake_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """Deterministic unit-length pseudo embedding for ``text``."""
+
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+    rng = random.Random(seed)
+    vec = [rng.uniform(-1, 1) for _ in range(dim)]
+    norm = sum(v * v for v in vec) ** 0.5
+    return [v / norm for v in vec]
+
+
+def _tool_run(path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    tool = path.rstrip("/").split("/")[-2]
+    return {"tool": tool, "status": "ok", "score": len(json.dumps(body)) % 100}
+
+
+def _chat_completion(path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    last = (body.get("messages") or [{}])[-1].get("content", "")
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": 0,
+        "model": body.get("model", "fake"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": f"echo: {str(last)[:200]}"},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+def _embeddings(path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    inputs = body.get("input")
+    inputs = inputs if isinstance(inputs, list) else [inputs]
+    return {
+        "object": "list",
+        "data": [
+            {"object": "embedding", "index": i, "embedding": fake_embedding(str(text))}
+            for i, text in enumerate(inputs)
+        ],
+        "model": body.get("model", "fake"),
+        "usage": {"prompt_tokens": 1, "total_tokens": 1},
+    }
+
+
+def superagent_server(latency_ms: float = 0.0, jitter_ms: float = 0.0) -> FakeHTTPServer:
+    return FakeHTTPServer(
+        [
+            ("POST", r"/agents/[^/]+/tools/[^/]+/run", _tool_run),
+            ("POST", r"/agents", lambda path, body: {"id": "fake-agent"}),
+        ],
+        latency_ms,
+        jitter_ms,
+    )
+
+
+def openai_server(latency_ms: float = 0.0, jitter_ms: float = 0.0) -> FakeHTTPServer:
+    return FakeHTTPServer(
+        [
+            ("POST", r"(/v1)?/chat/completions", _chat_completion),
+            ("POST", r"(/v1)?/embeddings", _embeddings),
+        ],
+        latency_ms,
+        jitter_ms,
+    )
+
+
+async def start_fake_backends(latency_ms: float = 0.0, jitter_ms: float = 0.0) -> Dict[str, FakeHTTPServer]:
+    """Start both stand-ins and point the app's environment at them.
+
+    Must run before ``gaigentic_backend`` is imported so settings pick up the URLs.
+    """
+
+    servers = {"superagent": superagent_server(latency_ms, jitter_ms), "openai": openai_server(latency_ms, jitter_ms)}
+    os.environ["SUPERAGENT_URL"] = await servers["superagent"].start()
+    os.environ["OPENAI_BASE_URL"] = await servers["openai"].start() + "/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+    return servers
+
+
+async def stop_fake_backends(servers: Dict[str, FakeHTTPServer]) -> None:
+    await asyncio.gather(*(server.stop() for server in servers.values()))
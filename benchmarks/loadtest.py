@@ -0,0 +1,512 @@
+"""Load test harness driving mixed HTTP and WebSocket traffic against the app.
+
+By default the harness starts the fake Superagent/OpenAI servers, launches
+``uvicorn gaigentic_backend.main:app`` against them once per ``--workers``
+value and runs a closed-loop load of ``--users`` virtual users for
+``--duration`` seconds::
+
+    DATABASE_URL=postgresql+asyncpg://... JWT_SECRET_KEY=... \\
+        python benchmarks/loadtest.py --workers 1 2 4 --users 50 --duration 60
+
+``DATABASE_URL`` must point at a migrated PostgreSQL database. Pass
+``--base-url`` to target an already running deployment instead. Each virtual
+user repeatedly picks a scenario according to ``--mix``. The JSON report
+contains throughput, latency percentiles and errors per scenario, plus event
+loop lag of the load generator and of the server (from ``/metrics``).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+import httpx
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_services import start_fake_backends, stop_fake_backends  # noqa: E402
+from run import percentile  # noqa: E402
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+DEFAULT_MIX = "chat=3,ws_chat=1,run=4,ws_run=2,knowledge_upload=1,knowledge_search=3,ingest=1"
+
+SCENARIOS: Dict[str, Callable[["VirtualUser"], Awaitable[float | None]]] = {}
+
+
+def scenario(name: str):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+
+    return register
+
+
+class ScenarioError(Exception):
+    """A request that completed with an unexpected status, labelled by ``kind``."""
+
+    def __init__(self, kind: str) -> None:
+        super().__init__(kind)
+        self.kind = kind
+
+
+class VirtualUser:
+    """Connection state shared by the scenarios of one simulated client."""
+
+    def __init__(self, index: int, base_url: str, auth: Dict[str, str], source_ip: str | None) -> None:
+        self.index = index
+        self.ws_url = re.sub(r"^http", "ws", base_url)
+        self.agent_id = auth["agent_id"]
+        self.tenant_id = auth["tenant_id"]
+        self.source_ip = source_ip
+        self.sequence = 0
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {auth['token']}"},
+            timeout=60,
+            transport=httpx.AsyncHTTPTransport(local_address=source_ip) if source_ip else None,
+        )
+
+    def next_id(self) -> str:
+        self.sequence += 1
+        return f"{self.index}-{self.sequence}"
+
+    def connect(self, path: str):
+        extra = {"local_addr": (self.source_ip, 0)} if self.source_ip else {}
+        return websockets.connect(self.ws_url + path, open_timeout=30, max_size=None, **extra)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def _check(response: httpx.Response) -> None:
+    if response.status_code >= 400:
+        raise ScenarioError(f"http_{response.status_code}")
+
+
+def _chat_payload(text: str) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc).isoformat()
+    return {"messages": [{"role": "user", "content": text, "timestamp": now}]}
+
+
+async def _receive_until_complete(ws: Any, start: float) -> float:
+    """Read events until ``status: complete`` and return the time from ``start`` to the first event."""
+
+    first: float | None = None
+    while True:
+        try:
+            event = json.loads(await ws.recv())
+        except ConnectionClosed as exc:
+            code = exc.rcvd.code if exc.rcvd else None
+            raise ScenarioError("rate_limited" if code == 4008 else f"ws_closed_{code}") from exc
+        if event.get("type") == "ping":
+            continue
+        if first is None:
+            first = time.perf_counter() - start
+        if event.get("status") == "complete":
+            return first
+
+
+@scenario("chat")
+async def chat(user: VirtualUser) -> None:
+    response = await user.client.post("/api/v1/chat", json=_chat_payload(f"Build a workflow {user.next_id()}"))
+    _check(response)
+
+
+@scenario("ws_chat")
+async def ws_chat(user: VirtualUser) -> float:
+    start = time.perf_counter()
+    async with user.connect(f"/ws/chat?session_id=load-{user.next_id()}") as ws:
+        await ws.send(json.dumps(_chat_payload("Summarize my transactions")))
+        return await _receive_until_complete(ws, start)
+
+
+@scenario("run")
+async def run_agent(user: VirtualUser) -> None:
+    response = await user.client.post(f"/api/v1/agents/{user.agent_id}/run", json={"amount": user.sequence})
+    _check(response)
+
+
+@scenario("ws_run")
+async def ws_run(user: VirtualUser) -> float:
+    path = f"/api/v1/agents/ws/agents/{user.agent_id}/run?tenant_id={user.tenant_id}&session_id=load-{user.next_id()}"
+    start = time.perf_counter()
+    async with user.connect(path) as ws:
+        return await _receive_until_complete(ws, start)
+
+
+def _knowledge_text(seed: str, paragraphs: int = 6) -> str:
+    rng = random.Random(seed)
+    vocab = ["invoice", "ledger", "refund", "chargeback", "settlement", "payout", "fee", "account", "policy"]
+    return "\n\n".join(" ".join(rng.choice(vocab) for _ in range(80)) for _ in range(paragraphs))
+
+
+@scenario("knowledge_upload")
+async def knowledge_upload(user: VirtualUser) -> None:
+    name = f"load-{user.next_id()}.txt"
+    response = await user.client.post(
+        f"/api/v1/agents/{user.agent_id}/knowledge/upload",
+        files={"file": (name, _knowledge_text(name).encode(), "text/plain")},
+    )
+    _check(response)
+
+
+@scenario("knowledge_search")
+async def knowledge_search(user: VirtualUser) -> None:
+    query = random.choice(["refund policy", "settlement fee", "chargeback ledger", "payout account"])
+    response = await user.client.get(f"/api/v1/agents/{user.agent_id}/knowledge/search", params={"q": query})
+    _check(response)
+
+
+def _transactions_csv(rows: int, seed: str) -> bytes:
+    rng = random.Random(seed)
+    lines = ["date,amount,description,type"]
+    for i in range(rows):
+        lines.append(f"2024-{1 + i % 12:02d}-{1 + i % 28:02d},{rng.uniform(1, 500):.2f},Payment {i},debit")
+    return ("\n".join(lines) + "\n").encode()
+
+
+@scenario("ingest")
+async def ingest(user: VirtualUser) -> None:
+    name = f"load-{user.next_id()}.csv"
+    response = await user.client.post(
+        "/api/v1/ingest/", files={"file": (name, _transactions_csv(200, name), "text/csv")}
+    )
+    _check(response)
+
+
+class Stats:
+    """Latencies and outcomes per scenario."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {name: [] for name in SCENARIOS}
+        self.first_event: Dict[str, List[float]] = {name: [] for name in SCENARIOS}
+        self.errors: Dict[str, Counter] = {name: Counter() for name in SCENARIOS}
+
+    def summary(self, seconds: float) -> Dict[str, Any]:
+        scenarios = {}
+        total = failed = 0
+        for name, samples in self.latencies.items():
+            errors = sum(self.errors[name].values())
+            count = len(samples) + errors
+            if not count:
+                continue
+            total += count
+            failed += errors
+            entry: Dict[str, Any] = {
+                "count": count,
+                "ok": len(samples),
+                "errors": dict(self.errors[name]),
+                "error_rate": round(errors / count, 4),
+                "throughput_rps": round(len(samples) / seconds, 3),
+            }
+            if samples:
+                entry.update(_latency_summary(samples))
+            if self.first_event[name]:
+                entry["first_event_p50_ms"] = round(percentile(self.first_event[name], 50) * 1000, 3)
+                entry["first_event_p95_ms"] = round(percentile(self.first_event[name], 95) * 1000, 3)
+            scenarios[name] = entry
+        return {
+            "requests": total,
+            "throughput_rps": round((total - failed) / seconds, 3),
+            "error_rate": round(failed / total, 4) if total else 0.0,
+            "scenarios": scenarios,
+        }
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        f"{label}_ms": round(percentile(samples, pct) * 1000, 3)
+        for label, pct in (("p50", 50), ("p90", 90), ("p95", 95), ("p99", 99), ("max", 100))
+    }
+
+
+async def _loop_lag(samples: List[float], stop: asyncio.Event, interval: float = 0.05) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - start - interval))
+
+
+_LAG_LINE = re.compile(r'^event_loop_lag_seconds_(bucket|sum|count)(?:\{le="([^"]+)"\})? (\S+)$', re.M)
+
+
+async def _scrape_server_lag(client: httpx.AsyncClient) -> Dict[str, Any] | None:
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    parsed: Dict[str, Any] = {"buckets": {}}
+    for kind, le, value in _LAG_LINE.findall(response.text):
+        if kind == "bucket":
+            parsed["buckets"][float(le)] = float(value)
+        else:
+            parsed[kind] = float(value)
+    return parsed if "count" in parsed else None
+
+
+def _server_lag_delta(before: Dict[str, Any] | None, after: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    """Lag observed between two scrapes; percentiles are histogram bucket upper bounds.
+
+    With several workers each scrape reaches one of them, so the delta is a sample.
+    """
+
+    if not after:
+        return None
+    before = before or {"buckets": {}, "count": 0.0, "sum": 0.0}
+    count = after["count"] - before["count"]
+    if count <= 0:
+        return None
+    result: Dict[str, Any] = {"samples": int(count), "mean_ms": round((after["sum"] - before["sum"]) / count * 1000, 3)}
+    for label, pct in (("p50", 50), ("p99", 99)):
+        for bound in sorted(after["buckets"]):
+            if after["buckets"][bound] - before["buckets"].get(bound, 0.0) >= count * pct / 100:
+                result[f"{label}_le_ms"] = bound * 1000
+                break
+    return result
+
+
+def _parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def _source_ip(index: int) -> str:
+    return f"127.0.{1 + index // 250}.{2 + index % 250}"
+
+
+async def _setup(base_url: str) -> Dict[str, str]:
+    """Register a tenant and create an agent with a small workflow and some knowledge."""
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={"email": f"load-{uuid4().hex[:12]}@example.com", "password": uuid4().hex, "tenant_name": "loadtest"},
+        )
+        response.raise_for_status()
+        token = response.json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        tenant_id = (await client.get("/api/v1/auth/me")).json()["tenant_id"]
+
+        nodes = [
+            {"id": node_id, "type": tool, "label": node_id, "data": {}, "position": {"x": i, "y": 0}}
+            for i, (node_id, tool) in enumerate([("fetch", "fetch"), ("score", "score"), ("flag", "flag"), ("notify", "notify")])
+        ]
+        edges = [
+            {"id": "e1", "source": "fetch", "target": "score"},
+            {"id": "e2", "source": "fetch", "target": "flag"},
+            {"id": "e3", "source": "score", "target": "notify"},
+            {"id": "e4", "source": "flag", "target": "notify"},
+        ]
+        response = await client.post("/api/v1/agents/", json={"name": "loadtest", "config": {}})
+        response.raise_for_status()
+        agent_id = response.json()["id"]
+        response = await client.post(f"/api/v1/agents/{agent_id}/workflow", json={"nodes": nodes, "edges": edges})
+        response.raise_for_status()
+        response = await client.post(
+            f"/api/v1/agents/{agent_id}/knowledge/upload",
+            files={"file": ("seed.txt", _knowledge_text("seed", 20).encode(), "text/plain")},
+        )
+        response.raise_for_status()
+    return {"token": token, "tenant_id": tenant_id, "agent_id": agent_id}
+
+
+async def run_load(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    auth = await _setup(base_url)
+    names, weights = zip(*args.mix.items())
+    users = [
+        VirtualUser(i, base_url, auth, _source_ip(i) if args.source_ips else None) for i in range(args.users)
+    ]
+    stats = Stats()
+    recording = False
+    deadline = time.perf_counter() + args.warmup + args.duration
+
+    async def user_loop(user: VirtualUser) -> None:
+        await asyncio.sleep(random.uniform(0, args.ramp))
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                first = await SCENARIOS[name](user)
+            except ScenarioError as exc:
+                if recording:
+                    stats.errors[name][exc.kind] += 1
+            except Exception as exc:
+                if recording:
+                    stats.errors[name][type(exc).__name__] += 1
+            else:
+                if recording:
+                    stats.latencies[name].append(time.perf_counter() - start)
+                    if first is not None:
+                        stats.first_event[name].append(first)
+            if args.think_ms:
+                await asyncio.sleep(random.expovariate(1000 / args.think_ms))
+
+    lag: List[float] = []
+    stop = asyncio.Event()
+    tasks = [asyncio.ensure_future(user_loop(user)) for user in users]
+    try:
+        await asyncio.sleep(args.warmup)
+        server_before = await _scrape_server_lag(users[0].client)
+        recording = True
+        lag_task = asyncio.ensure_future(_loop_lag(lag, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await lag_task
+        server_after = await _scrape_server_lag(users[0].client)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*(user.aclose() for user in users))
+
+    report = stats.summary(elapsed)
+    report["client_loop_lag"] = _latency_summary(lag) if lag else None
+    report["server_loop_lag"] = _server_lag_delta(server_before, server_after)
+    return report
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _start_app(workers: int) -> tuple[asyncio.subprocess.Process, str]:
+    port = _free_port()
+    env = {**os.environ, "RATE_LIMIT_PER_MINUTE": str(10**9)}
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "gaigentic_backend.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(600):
+            if proc.returncode is not None:
+                raise RuntimeError(f"server exited with code {proc.returncode}")
+            try:
+                if (await client.get("/healthz")).status_code == 200:
+                    return proc, base_url
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("server did not become healthy within 60s")
+
+
+async def _stop_app(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is None:
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), 30)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+
+
+class BackgroundBackends:
+    """Fake backends on their own thread so their work does not skew client loop lag."""
+
+    def __init__(self, latency_ms: float, jitter_ms: float) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+
+    def __enter__(self) -> "BackgroundBackends":
+        self.thread.start()
+        self.servers = asyncio.run_coroutine_threadsafe(
+            start_fake_backends(self.latency_ms, self.jitter_ms), self.loop
+        ).result()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        asyncio.run_coroutine_threadsafe(stop_fake_backends(self.servers), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    runs = []
+    if args.base_url:
+        runs.append({"target": args.base_url, **await run_load(args, args.base_url)})
+    else:
+        for workers in args.workers:
+            proc, base_url = await _start_app(workers)
+            try:
+                runs.append({"workers": workers, **await run_load(args, base_url)})
+            finally:
+                await _stop_app(proc)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "cpus": os.cpu_count(),
+            "users": args.users,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "think_ms": args.think_ms,
+            "mix": args.mix,
+            "latency_ms": args.latency_ms,
+            "source_ips": args.source_ips,
+        },
+        "runs": runs,
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="target a running server instead of starting one")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="uvicorn worker counts to compare")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before recording")
+    parser.add_argument("--ramp", type=float, default=2.0, help="spread user start times over this many seconds")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between a user's requests")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX), help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="fake LLM/Superagent/embedding latency")
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--source-ips",
+        action="store_true",
+        help="bind each user to its own 127.0.x.y address so per-client rate limits apply per user (Linux)",
+    )
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.base_url:
+        report = asyncio.run(main(arguments))
+    else:
+        with BackgroundBackends(arguments.latency_ms, arguments.jitter_ms):
+            report = asyncio.run(main(arguments))
+    text = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
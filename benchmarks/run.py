@@ -0,0 +1,457 @@
+"""Benchmark suite for the hot paths of the backend.
+
+Run from the repository root::
+
+    python benchmarks/run.py --output results.json
+
+Tool, LLM and embedding calls go to local fake servers (see
+``fake_services.py``) whose latency is set with ``--latency-ms``. Database
+benchmarks (ingestion and memory retrieval) only run when ``DATABASE_URL``
+points at PostgreSQL with pgvector and are reported as skipped otherwise.
+Results are printed as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from fake_services import start_fake_backends, stop_fake_backends  # noqa: E402
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Awaitable[List[Dict[str, Any]]]]] = {}
+
+
+def benchmark(name: str):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _result(name: str, params: Dict[str, Any], samples: List[float], seconds: float, units: int, unit: str) -> Dict[str, Any]:
+    """Summarize per-operation ``samples`` (seconds) measured over ``seconds`` of wall time."""
+
+    return {
+        "name": name,
+        "params": params,
+        "status": "ok",
+        "iterations": len(samples),
+        "seconds": round(seconds, 6),
+        "unit": unit,
+        "units": units,
+        "units_per_sec": round(units / seconds, 3) if seconds else None,
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "p50_ms": round(percentile(samples, 50) * 1000, 4),
+        "p95_ms": round(percentile(samples, 95) * 1000, 4),
+        "p99_ms": round(percentile(samples, 99) * 1000, 4),
+    }
+
+
+def _status(name: str, status: str, reason: str) -> Dict[str, Any]:
+    return {"name": name, "status": status, "reason": reason}
+
+
+async def _measure(op: Callable[[], Awaitable[Any]], iterations: int, concurrency: int = 1) -> tuple[List[float], float]:
+    """Run ``op`` ``iterations`` times with up to ``concurrency`` in flight."""
+
+    samples: List[float] = []
+    remaining = iter(range(iterations))
+
+    async def worker() -> None:
+        for _ in remaining:
+            start = time.perf_counter()
+            await op()
+            samples.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def _measure_sync(op: Callable[[], Any], iterations: int) -> tuple[List[float], float]:
+    samples: List[float] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        op()
+        samples.append(time.perf_counter() - start)
+    return samples, time.perf_counter() - started
+
+
+def _layered_workflow(width: int, depth: int) -> Dict[str, Any]:
+    """DAG of ``depth`` layers of ``width`` nodes, each fully connected to the next layer."""
+
+    nodes, edges = [], []
+    for layer in range(depth):
+        for col in range(width):
+            node_id = f"n{layer}_{col}"
+            nodes.append(
+                {"id": node_id, "type": f"tool{col}", "label": node_id, "data": {}, "position": {"x": col, "y": layer}}
+            )
+            if layer:
+                edges.extend(
+                    {"id": f"e{layer}_{src}_{col}", "source": f"n{layer - 1}_{src}", "target": node_id}
+                    for src in range(width)
+                )
+    return {"nodes": nodes, "edges": edges}
+
+
+class _StaticSession:
+    """Stands in for ``SessionLocal`` so tool calls skip the agent lookup query."""
+
+    def __init__(self, agent: Any) -> None:
+        self.agent = agent
+
+    def __call__(self) -> "_StaticSession":
+        return self
+
+    async def __aenter__(self) -> "_StaticSession":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def get(self, model: Any, key: Any) -> Any:
+        return self.agent if key == self.agent.id else None
+
+
+@benchmark("workflow")
+async def bench_workflow(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from gaigentic_backend.services import tool_executor
+    from gaigentic_backend.services.workflow_executor import build_plan, run_workflow_stream
+
+    shapes = [(1, 1), (1, 5), (5, 1), (5, 5)] if args.quick else [(1, 1), (1, 5), (1, 25), (5, 1), (25, 1), (5, 5)]
+    tenant_id = uuid4()
+    results = []
+    for width, depth in shapes:
+        agent = SimpleNamespace(
+            id=uuid4(), tenant_id=tenant_id, config={"workflow": _layered_workflow(width, depth)}
+        )
+        plan = build_plan(agent)
+        original = tool_executor.SessionLocal
+        tool_executor.SessionLocal = _StaticSession(agent)
+
+        async def run_once() -> None:
+            async for _ in run_workflow_stream(agent.id, {"amount": 10}, tenant_id, agent, plan):
+                pass
+
+        try:
+            samples, seconds = await _measure(run_once, args.iterations, args.concurrency)
+        finally:
+            tool_executor.SessionLocal = original
+        steps = width * depth * len(samples)
+        result = _result(
+            "workflow.run_stream",
+            {"width": width, "depth": depth, "concurrency": args.concurrency},
+            samples,
+            seconds,
+            steps,
+            "steps",
+        )
+        result["runs_per_sec"] = round(len(samples) / seconds, 3)
+        results.append(result)
+    return results
+
+
+@benchmark("conditions")
+async def bench_conditions(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from gaigentic_backend.services.condition_evaluator import evaluate_condition
+
+    ctx = {"context": {"approved": True}, "upstream": {"a": {"ok": True}}, "output": {"status": "ok"}}
+    expressions = {
+        "empty": None,
+        "lookup": "context['approved']",
+        "nested": "upstream['a']['ok']",
+        "literal": "[output['status'], context['approved']]",
+    }
+    iterations = args.iterations * 100
+    results = []
+    for label, expr in expressions.items():
+        samples, seconds = _measure_sync(lambda: evaluate_condition(expr, ctx), iterations)
+        results.append(_result("condition.evaluate", {"expression": label}, samples, seconds, iterations, "evaluations"))
+    return results
+
+
+def _sample_text(words: int) -> str:
+    rng = random.Random(7)
+    vocab = ["ledger", "invoice", "balance", "payment", "account", "reconcile", "the", "of", "and", "to"]
+    sentences = []
+    while words > 0:
+        n = min(words, rng.randint(6, 20))
+        sentences.append(" ".join(rng.choice(vocab) for _ in range(n)).capitalize() + ".")
+        words -= n
+    return "\n\n".join(" ".join(sentences[i : i + 5]) for i in range(0, len(sentences), 5))
+
+
+@benchmark("chunking")
+async def bench_chunking(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    try:
+        from gaigentic_backend.services.chunking import split_text
+    except Exception as exc:  # tokenizer download unavailable offline
+        return [_status("chunking.split_text", "error", str(exc))]
+
+    results = []
+    for words in ([2_000] if args.quick else [2_000, 50_000]):
+        text = _sample_text(words)
+        for overlap in (0, 50):
+            try:
+                samples, seconds = _measure_sync(
+                    lambda: split_text(text, max_tokens=500, overlap=overlap), max(1, args.iterations // 5)
+                )
+            except Exception as exc:
+                return [_status("chunking.split_text", "error", str(exc))]
+            results.append(
+                _result(
+                    "chunking.split_text",
+                    {"words": words, "overlap": overlap},
+                    samples,
+                    seconds,
+                    len(text) * len(samples),
+                    "chars",
+                )
+            )
+    return results
+
+
+def _transactions_csv(rows: int) -> bytes:
+    start = datetime(2024, 1, 1)
+    lines = ["date,amount,description,type"]
+    for i in range(rows):
+        day = (start + timedelta(days=i % 365)).date().isoformat()
+        lines.append(f"{day},{(i * 37) % 1000 / 10:.2f},Payment {i},{'debit' if i % 2 else 'credit'}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+@benchmark("parsing")
+async def bench_parsing(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from gaigentic_backend.services.file_parser import parse_file
+
+    rows = 1_000 if args.quick else 10_000
+    data = _transactions_csv(rows)
+
+    def parse() -> None:
+        parse_file(SimpleNamespace(file=io.BytesIO(data), filename="bench.csv"))
+
+    samples, seconds = _measure_sync(parse, max(1, args.iterations // 10))
+    return [_result("ingestion.parse_file", {"rows": rows}, samples, seconds, rows * len(samples), "rows")]
+
+
+def _postgres_configured() -> bool:
+    return os.environ["DATABASE_URL"].startswith("postgresql")
+
+
+@benchmark("database")
+async def bench_database(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    names = ["ingestion.store_transactions", "memory.fetch_context"]
+    if not _postgres_configured():
+        return [_status(name, "skipped", "DATABASE_URL is not PostgreSQL") for name in names]
+    try:
+        from gaigentic_backend.database import SessionLocal
+        from gaigentic_backend.models.agent import Agent
+        from gaigentic_backend.models.knowledge_chunk import KnowledgeChunk
+        from gaigentic_backend.models.tenant import Tenant
+        from gaigentic_backend.models.transaction import Transaction
+        from gaigentic_backend.services.file_parser import parse_file
+        from gaigentic_backend.services.knowledge_store import content_hash
+        from gaigentic_backend.services.memory_adapter import fetch_context_for_agent
+        from gaigentic_backend.services.tenant_partitions import drop_tenant_partitions, ensure_tenant_partitions
+        from fake_services import fake_embedding
+    except Exception as exc:
+        return [_status(name, "error", str(exc)) for name in names]
+
+    tenant = Tenant(id=uuid4(), name="benchmark")
+    agent = Agent(id=uuid4(), tenant_id=tenant.id, name="benchmark", config={})
+    async with SessionLocal() as session:
+        session.add(tenant)
+        await session.flush()
+        await ensure_tenant_partitions(await session.connection(), tenant.id)
+        session.add(agent)
+        await session.commit()
+
+    results = []
+    try:
+        rows = 1_000 if args.quick else 5_000
+        records = parse_file(SimpleNamespace(file=io.BytesIO(_transactions_csv(rows)), filename="bench.csv"))
+        batch = iter(range(max(1, args.iterations // 10)))
+
+        async def store() -> None:
+            source = f"bench-{next(batch)}.csv"
+            async with SessionLocal() as session:
+                session.add_all(
+                    Transaction(tenant_id=tenant.id, source_file_name=source, **rec) for rec in records
+                )
+                await session.commit()
+
+        samples, seconds = await _measure(store, max(1, args.iterations // 10))
+        results.append(
+            _result("ingestion.store_transactions", {"rows": rows}, samples, seconds, rows * len(samples), "rows")
+        )
+
+        chunks = 200 if args.quick else 2_000
+        async with SessionLocal() as session:
+            session.add_all(
+                KnowledgeChunk(
+                    tenant_id=tenant.id,
+                    agent_id=agent.id,
+                    source_file="bench.txt",
+                    chunk_index=i,
+                    text=f"chunk {i}",
+                    content_hash=content_hash(f"chunk {i}"),
+                    embedding=fake_embedding(f"chunk {i}"),
+                    # Matches what the fake OpenAI server returns for the default backend.
+                    embedding_model="openai:text-embedding-3-small",
+                    embedding_dim=1536,
+                )
+                for i in range(chunks)
+            )
+            await session.commit()
+        queries = iter(range(args.iterations))
+        samples, seconds = await _measure(
+            lambda: fetch_context_for_agent(agent.id, f"chunk {next(queries) % chunks}", tenant_id=tenant.id),
+            args.iterations,
+            args.concurrency,
+        )
+        results.append(
+            _result("memory.fetch_context", {"chunks": chunks, "concurrency": args.concurrency}, samples, seconds, len(samples), "queries")
+        )
+    finally:
+        async with SessionLocal() as session:
+            await session.delete(await session.get(Tenant, tenant.id))
+            await drop_tenant_partitions(await session.connection(), tenant.id)
+            await session.commit()
+    return results
+
+
+@benchmark("plugins")
+async def bench_plugins(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from gaigentic_backend.services.plugin_executor import plugin_pool, run_plugin, run_plugin_batch
+
+    single = "output = {'total': input['amount'] * 2}"
+    batch = "outputs = [{'total': row['amount'] * 2} for row in inputs]"
+    records = [{"amount": i} for i in range(1_000 if args.quick else 10_000)]
+    tenant_id = uuid4()
+    plugin_pool.start()
+    try:
+        await run_plugin(single, {"amount": 1}, tenant_id)  # warm a worker
+        samples, seconds = await _measure(
+            lambda: run_plugin(single, {"amount": 1}, tenant_id), args.iterations, args.concurrency
+        )
+        results = [
+            _result("plugin.run", {"concurrency": args.concurrency}, samples, seconds, len(samples), "executions")
+        ]
+        for code, label, is_batch in ((single, "per_record", False), (batch, "rows", True)):
+            samples, seconds = await _measure(
+                lambda: run_plugin_batch(code, records, tenant_id, batch=is_batch), max(1, args.iterations // 20)
+            )
+            results.append(
+                _result(
+                    "plugin.run_batch",
+                    {"mode": label, "records": len(records)},
+                    samples,
+                    seconds,
+                    len(records) * len(samples),
+                    "records",
+                )
+            )
+    finally:
+        await plugin_pool.close()
+    return results
+
+
+@benchmark("external")
+async def bench_external(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from gaigentic_backend.services.embedding import get_embedding
+    from gaigentic_backend.services.llm_router import run_llm
+
+    messages = [{"role": "user", "content": "Summarize the ledger"}]
+    queries = itertools.count()
+    results = []
+    for name, op in (
+        ("llm.run", lambda: run_llm("openai", "gpt-4o-mini", messages, {})),
+        # Distinct texts, so concurrent requests are batched rather than coalesced.
+        ("embedding.create", lambda: get_embedding(f"quarterly balance {next(queries)}")),
+    ):
+        samples, seconds = await _measure(op, args.iterations, args.concurrency)
+        results.append(
+            _result(name, {"concurrency": args.concurrency}, samples, seconds, len(samples), "requests")
+        )
+    return results
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+    os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+    os.environ.setdefault("APP_ENV", "benchmark")
+    servers = await start_fake_backends(args.latency_ms, args.jitter_ms)
+    results: List[Dict[str, Any]] = []
+    try:
+        for name in args.only or list(BENCHMARKS):
+            try:
+                results.extend(await BENCHMARKS[name](args))
+            except Exception as exc:
+                results.append(_status(name, "error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        await stop_fake_backends(servers)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "database": "postgresql" if _postgres_configured() else "none",
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="fake service response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency up to this value")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs and fewer iterations")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.iterations = min(args.iterations, 40)
+    return args
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = asyncio.run(main(arguments))
+    text = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
@@ -0,0 +1,17 @@
+"""Move every tenant's knowledge chunks and message history into its own partition."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from backend.gaigentic_backend.services.tenant_partitions import partition_all_tenants
+
+
+async def main() -> None:
+    created = await partition_all_tenants()
+    print(f"Created {len(created)} partitions")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
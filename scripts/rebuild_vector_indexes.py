@@ -0,0 +1,16 @@
+"""Rebuild the embedding indexes at the configured precision and dimensions."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from backend.gaigentic_backend.services.vector_index import rebuild_vector_indexes
+
+
+async def main() -> None:
+    await rebuild_vector_indexes()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import bulk_executor as be
+
+
+def test_run_bulk_bounded_concurrency_and_aggregated_log(monkeypatch):
+    active = 0
+    peak = 0
+    logged = []
+
+    async def fake_run_workflow(agent_id, context, tenant_id, agent, plan=None):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if context["n"] == 3:
+            raise HTTPException(status_code=400, detail="bad input")
+        return {"steps": {"score": context["n"] * 10}, "status": "complete"}
+
+    class FakeSink:
+        async def submit(self, record):
+            logged.append(record)
+
+    monkeypatch.setattr(be, "run_workflow", fake_run_workflow)
+    monkeypatch.setattr(be, "execution_log_sink", FakeSink())
+    agent = SimpleNamespace(id=uuid4(), config={"workflow": {"nodes": [], "edges": []}})
+
+    async def scenario():
+        inputs = be.iterate_inputs([{"n": i} for i in range(10)])
+        return [event async for event in be.run_bulk(agent, None, inputs, uuid4(), 3, {"count": 10})]
+
+    events = asyncio.run(scenario())
+    items, summary = events[:-1], events[-1]["summary"]
+    assert peak <= 3
+    assert sorted(e["index"] for e in items) == list(range(10))
+    assert summary == {"total": 10, "succeeded": 9, "failed": 1, "status": "partial"}
+    assert len(logged) == 1
+    assert logged[0]["output_result"]["errors"] == [{"index": 3, "error": "bad input"}]
+    assert logged[0]["input_context"] == {"bulk": True, "count": 10}
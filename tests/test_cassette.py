@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import cassette
+
+
+def test_record_then_replay(monkeypatch, tmp_path):
+    monkeypatch.setattr(cassette, "cassette_store", cassette.CassetteStore(str(tmp_path)))
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return {"answer": 42}
+
+    async def scenario():
+        with cassette.use_cassette("record"):
+            recorded = await cassette.through_cassette("tool", {"b": 1, "a": [1, 2]}, call)
+        # A fresh store proves the entry was persisted, not just cached.
+        monkeypatch.setattr(cassette, "cassette_store", cassette.CassetteStore(str(tmp_path)))
+        with cassette.use_cassette("replay"):
+            replayed = await cassette.through_cassette("tool", {"a": [1, 2], "b": 1}, call)
+        return recorded, replayed
+
+    recorded, replayed = asyncio.run(scenario())
+    assert recorded == replayed == {"answer": 42}
+    assert len(calls) == 1
+
+
+def test_replay_miss_raises(monkeypatch, tmp_path):
+    monkeypatch.setattr(cassette, "cassette_store", cassette.CassetteStore(str(tmp_path)))
+
+    async def call():
+        raise AssertionError("network call in replay mode")
+
+    async def scenario():
+        with cassette.use_cassette("replay"):
+            await cassette.through_cassette("llm", {"model": "x"}, call)
+
+    with pytest.raises(cassette.CassetteMiss):
+        asyncio.run(scenario())
+
+
+def test_off_mode_passes_through(monkeypatch):
+    monkeypatch.setattr(cassette.settings, "cassette_mode", "off")
+
+    async def call():
+        return "live"
+
+    assert asyncio.run(cassette.through_cassette("llm", {}, call)) == "live"
@@ -0,0 +1,50 @@
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import chunking
+
+PROSE = " ".join(f"Sentence number {i} describes a ledger entry." for i in range(60))
+
+
+def _tokens(text):
+    return len(chunking.get_encoder().encode(text))
+
+
+def test_short_document_keeps_paragraphs_and_tables():
+    text = "Intro paragraph.\n\n| account | amount |\n| 1001 | 20 |\n\r\nClosing words."
+    assert chunking.split_text(text) == ["Intro paragraph.\n\n| account | amount |\n| 1001 | 20 |\n\nClosing words."]
+
+
+def test_chunks_respect_budget_and_sentence_boundaries():
+    chunks = chunking.split_text(PROSE, max_tokens=40)
+    assert len(chunks) > 1
+    assert all(_tokens(chunk) <= 40 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+    assert " ".join(chunks) == PROSE
+
+
+def test_overlap_repeats_tail_of_previous_chunk():
+    chunks = chunking.split_text(PROSE, max_tokens=40, overlap=15)
+    for previous, current in zip(chunks, chunks[1:]):
+        first_sentence = current.split(". ")[0] + "."
+        assert previous.endswith(first_sentence)
+
+
+def test_streamed_pieces_match_whole_text():
+    text = "\n\n".join([PROSE[:300], "Line one\nLine two", PROSE[300:]])
+    pieces = (text[i : i + 7] for i in range(0, len(text), 7))
+    assert list(chunking.iter_chunks(pieces, max_tokens=30, overlap=5)) == chunking.split_text(text, 30, 5)
+
+
+def test_overlap_must_fit_budget():
+    with pytest.raises(ValueError):
+        chunking.split_text(PROSE, max_tokens=10, overlap=10)
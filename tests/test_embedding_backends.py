@@ -0,0 +1,102 @@
+import asyncio
+import math
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import embedding
+
+
+def _cosine(a, b):
+    return sum(x * y for x, y in zip(a, b)) / math.sqrt(sum(x * x for x in a) * sum(y * y for y in b))
+
+
+def test_hash_backend_is_deterministic_and_padded():
+    backend = embedding.get_backend({"backend": "hash", "dimensions": 256})
+    first, again, other = asyncio.run(backend(["refund policy", "refund policy", "quarterly revenue"]))
+
+    assert len(first) == 1536 and first[256:] == [0.0] * 1280
+    assert first == again
+    related = asyncio.run(backend(["refund policy details"]))[0]
+    assert _cosine(first, related) > _cosine(first, other)
+
+
+def test_width_is_learned_and_enforced():
+    class Flaky(embedding.EmbeddingBackend):
+        name = "flaky"
+
+        def __init__(self):
+            super().__init__("v1")
+            self.widths = iter([768, 1024])
+
+        async def embed(self, texts):
+            return [[1.0] * next(self.widths) for _ in texts]
+
+    backend = Flaky()
+    assert len(asyncio.run(backend(["a"]))[0]) == 1536
+    assert backend.dimensions == 768
+    with pytest.raises(embedding.EmbeddingMismatchError):
+        asyncio.run(backend(["b"]))
+
+
+def test_openai_sends_only_configured_dimensions(monkeypatch):
+    calls = []
+
+    class FakeEmbeddings:
+        async def create(self, model, input, **options):
+            calls.append(options)
+            data = [SimpleNamespace(index=i, embedding=[1.0] * 1536) for i in range(len(input))]
+            return SimpleNamespace(data=data)
+
+    monkeypatch.setattr(embedding.settings, "openai_api_key", "key")
+    monkeypatch.setattr(embedding.openai, "AsyncOpenAI", lambda api_key: SimpleNamespace(embeddings=FakeEmbeddings()))
+    learned = embedding.OpenAIEmbeddings("text-embedding-ada-002")
+    asyncio.run(learned(["a"]))
+    asyncio.run(learned(["b"]))
+    asyncio.run(embedding.OpenAIEmbeddings("text-embedding-3-large", 1536)(["c"]))
+    assert calls == [{}, {}, {"dimensions": 1536}]
+
+
+def test_agent_setting_overrides_tenant_and_default():
+    tenant = {"embedding": {"backend": "ollama", "model": "mxbai-embed-large"}}
+    agent = {"embedding": {"backend": "hash"}}
+
+    assert embedding.backend_for(agent, tenant).key == "hash:sha256"
+    assert embedding.backend_for({"use_memory": True}, tenant).key == "ollama:mxbai-embed-large"
+    assert embedding.backend_for(None, None).key == "openai:text-embedding-3-small"
+    assert embedding.get_backend({"backend": "hash"}) is embedding.get_backend({"backend": "hash"})
+
+
+@pytest.mark.parametrize("spec", [{"backend": "word2vec"}, {"backend": "openai", "dimensions": 3072}])
+def test_invalid_backend_settings_are_rejected(spec):
+    with pytest.raises(ValueError):
+        embedding.get_backend(spec)
+
+
+@pytest.mark.parametrize(
+    "spec, accepted",
+    [
+        ({"backend": "openai"}, True),
+        ({"backend": "openai", "model": "text-embedding-ada-002"}, False),
+        ({"backend": "ollama"}, False),
+        ({"backend": "ollama", "dimensions": 384}, True),
+        ({"backend": "hash"}, False),
+        ({"backend": "hash", "dimensions": 512}, True),
+    ],
+)
+def test_prefix_index_only_serves_prefix_safe_vectors(monkeypatch, spec, accepted):
+    monkeypatch.setattr(embedding.settings, "vector_index_dimensions", 512)
+    if accepted:
+        embedding.get_backend(spec)
+    else:
+        with pytest.raises(ValueError, match="VECTOR_INDEX_DIMENSIONS"):
+            embedding.get_backend(spec)
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import embedding
+
+
+calls = []
+
+
+async def fake_embed(texts):
+    calls.append(list(texts))
+    await asyncio.sleep(0.01)
+    return [[float(len(text))] for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def test_identical_requests_share_one_call():
+    dispatcher = embedding.EmbeddingDispatcher(fake_embed, max_batch=8, max_wait=0.005)
+
+    async def run():
+        return await asyncio.gather(*(dispatcher.embed("same question") for _ in range(5)))
+
+    assert asyncio.run(run()) == [[13.0]] * 5
+    assert calls == [["same question"]]
+
+
+def test_distinct_requests_are_batched_up_to_max_batch():
+    dispatcher = embedding.EmbeddingDispatcher(fake_embed, max_batch=3, max_wait=0.05)
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    async def run():
+        return await asyncio.gather(*(dispatcher.embed(text) for text in texts))
+
+    assert asyncio.run(run()) == [[1.0], [2.0], [3.0], [4.0]]
+    assert calls == [["a", "bb", "ccc"], ["dddd"]]
+
+
+def test_late_request_waits_for_next_batch():
+    dispatcher = embedding.EmbeddingDispatcher(fake_embed, max_batch=8, max_wait=0.005)
+
+    async def run():
+        first = asyncio.ensure_future(dispatcher.embed("early"))
+        await asyncio.sleep(0.05)
+        await dispatcher.embed("late")
+        await first
+
+    asyncio.run(run())
+    assert calls == [["early"], ["late"]]
+
+
+def test_timed_out_caller_does_not_cancel_shared_request():
+    dispatcher = embedding.EmbeddingDispatcher(fake_embed, max_batch=8, max_wait=0.0)
+
+    async def run():
+        impatient = asyncio.wait_for(dispatcher.embed("slow"), 0.001)
+        patient = dispatcher.embed("slow")
+        return await asyncio.gather(impatient, patient, return_exceptions=True)
+
+    impatient, patient = asyncio.run(run())
+    assert isinstance(impatient, asyncio.TimeoutError)
+    assert patient == [4.0]
+
+
+def test_failure_reaches_every_waiter():
+    async def failing(texts):
+        raise RuntimeError("provider down")
+
+    dispatcher = embedding.EmbeddingDispatcher(failing, max_batch=8, max_wait=0.001)
+
+    async def run():
+        return await asyncio.gather(dispatcher.embed("x"), dispatcher.embed("y"), return_exceptions=True)
+
+    assert [str(result) for result in asyncio.run(run())] == ["provider down", "provider down"]
+    assert dispatcher._inflight == {}
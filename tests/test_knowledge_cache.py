@@ -0,0 +1,79 @@
+import asyncio
+import os
+import sys
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import knowledge_cache as kc
+
+
+def _hits():
+    return kc.KNOWLEDGE_CACHE_HITS._value.get()
+
+
+def test_normalized_queries_share_an_entry():
+    kc.clear()
+    agent_id = uuid4()
+    kc.store(kc.cache_key(agent_id, 0, "hybrid", "Refund  Policy "), ["r"])
+    hits = _hits()
+    assert kc.get_cached(kc.cache_key(agent_id, 0, "hybrid", "refund policy")) == ["r"]
+    assert _hits() == hits + 1
+    assert kc.get_cached(kc.cache_key(agent_id, 0, "lexical", "refund policy")) is None
+
+
+def test_new_generation_misses():
+    kc.clear()
+    agent_id = uuid4()
+    kc.store(kc.cache_key(agent_id, 3, "hybrid", "fees"), ["old"])
+    assert kc.get_cached(kc.cache_key(agent_id, 4, "hybrid", "fees")) is None
+
+
+def test_entries_expire(monkeypatch):
+    kc.clear()
+    now = [100.0]
+    monkeypatch.setattr(kc.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(kc.settings, "knowledge_cache_ttl", 10)
+    key = kc.cache_key(uuid4(), 0, "hybrid", "fees")
+    kc.store(key, ["r"])
+    now[0] += 9
+    assert kc.get_cached(key) == ["r"]
+    now[0] += 1
+    assert kc.get_cached(key) is None
+    assert key not in kc._results
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    kc.clear()
+    monkeypatch.setattr(kc.settings, "knowledge_cache_size", 2)
+    a, b, c = (kc.cache_key(uuid4(), 0, "hybrid", q) for q in "abc")
+    kc.store(a, [1])
+    kc.store(b, [2])
+    kc.get_cached(a)
+    kc.store(c, [3])
+    assert list(kc._results) == [a, c]
+
+
+def test_zero_size_disables_cache(monkeypatch):
+    kc.clear()
+    monkeypatch.setattr(kc.settings, "knowledge_cache_size", 0)
+    key = kc.cache_key(uuid4(), 0, "hybrid", "fees")
+    kc.store(key, ["r"])
+    assert kc.get_cached(key) is None
+
+
+def test_bump_generation_increments_in_sql():
+    statements = []
+
+    class FakeSession:
+        async def execute(self, stmt):
+            statements.append(stmt)
+
+    asyncio.run(kc.bump_generation(FakeSession(), uuid4()))
+    sql = str(statements[0])
+    assert sql.startswith("UPDATE agent SET knowledge_generation=(agent.knowledge_generation +")
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.models.knowledge_chunk import KnowledgeChunk
+from gaigentic_backend.services import knowledge_search as ks
+
+
+def _rows(*ids):
+    return [SimpleNamespace(id=i) for i in ids]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, lexical, vector):
+        self.lexical = lexical
+        self.vector = vector
+        self.queries = []
+
+    async def execute(self, stmt):
+        kind = "lexical" if "websearch_to_tsquery" in str(stmt) else "vector"
+        self.queries.append(kind)
+        return FakeResult(getattr(self, kind))
+
+
+def _search(session, mode="hybrid", on_fallback=None):
+    return asyncio.run(
+        ks.hybrid_search(
+            session,
+            "ACC-1001 refund",
+            KnowledgeChunk.id,
+            agent_id=uuid4(),
+            limit=3,
+            key=lambda r: r.id,
+            mode=mode,
+            on_fallback=on_fallback,
+        )
+    )
+
+
+def test_reciprocal_rank_fusion_prefers_items_in_both_rankings():
+    fused = ks.reciprocal_rank_fusion([_rows("a", "b", "c"), _rows("d", "c", "a")], key=lambda r: r.id)
+    assert [r.id for r in fused] == ["a", "c", "d", "b"]
+
+
+def test_hybrid_fuses_lexical_and_vector(monkeypatch):
+    async def fake_embedding(text, backend=None):
+        return [0.1] * 1536
+
+    monkeypatch.setattr(ks, "get_embedding", fake_embedding)
+    session = FakeSession(_rows("x", "y"), _rows("y", "z"))
+    assert [r.id for r in _search(session)] == ["y", "x", "z"]
+    assert session.queries == ["lexical", "vector"]
+
+
+def test_slow_embedding_falls_back_to_lexical(monkeypatch):
+    async def slow_embedding(text, backend=None):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(ks, "get_embedding", slow_embedding)
+    monkeypatch.setattr(ks.settings, "knowledge_embedding_timeout", 0.01)
+    session = FakeSession(_rows("x", "y"), _rows("z"))
+    fallbacks = []
+    assert [r.id for r in _search(session, on_fallback=lambda: fallbacks.append(1))] == ["x", "y"]
+    assert session.queries == ["lexical"]
+    assert fallbacks == [1]
+
+
+def test_lexical_mode_skips_embedding(monkeypatch):
+    monkeypatch.setattr(ks, "get_embedding", None)  # any embedding call would fail
+    session = FakeSession(_rows("x"), _rows("z"))
+    assert [r.id for r in _search(session, mode="lexical")] == ["x"]
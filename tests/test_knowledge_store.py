@@ -0,0 +1,103 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import knowledge_store as ks
+from gaigentic_backend.services.embedding import EmbeddingMismatchError, get_backend
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+
+class FakeSession:
+    def __init__(self, stored, other_model=None):
+        self.stored = stored
+        self.other_model = other_model
+        self.deleted = []
+        self.updated = []
+        self.inserted = []
+
+    async def execute(self, stmt, params=None):
+        if stmt.is_select and "embedding_model" in str(stmt):
+            stored = [SimpleNamespace(embedding_model=self.other_model, embedding_dim=768)]
+            return FakeResult(stored if self.other_model else [])
+        if stmt.is_select:
+            return FakeResult(
+                [
+                    SimpleNamespace(id=row_id, content_hash=ks.content_hash(text), chunk_index=index)
+                    for index, (row_id, text) in enumerate(self.stored)
+                ]
+            )
+        if stmt.is_delete:
+            self.deleted.extend(stmt.whereclause.clauses[0].right.value)
+        elif stmt.is_update:
+            self.updated.extend(params)
+        elif stmt.is_insert:
+            self.inserted.extend(params)
+
+
+def test_only_new_chunks_are_embedded(monkeypatch):
+    embedded = []
+
+    async def fake_embeddings(texts, backend=None):
+        embedded.extend(texts)
+        return [[0.0] for _ in texts]
+
+    monkeypatch.setattr(ks, "get_embeddings", fake_embeddings)
+    ids = [uuid4() for _ in range(3)]
+    session = FakeSession(list(zip(ids, ["intro", "old terms", "contacts"])))
+
+    result = asyncio.run(
+        ks.sync_knowledge_file(session, uuid4(), uuid4(), "policy.txt", ["intro", "new terms", "new terms", "contacts"])
+    )
+
+    assert result == {"chunks": 3, "embedded": 1, "unchanged": 2, "moved": 0, "deleted": 1}
+    assert embedded == ["new terms"]
+    assert [row["chunk_index"] for row in session.inserted] == [1]
+    assert session.inserted[0]["content_hash"] == ks.content_hash("new terms")
+    assert session.deleted == [ids[1]]
+    assert session.updated == []
+
+
+def test_reordered_chunks_are_reindexed(monkeypatch):
+    monkeypatch.setattr(ks, "get_embeddings", None)  # any embedding call would fail
+    ids = [uuid4(), uuid4()]
+    tenant_id = uuid4()
+    session = FakeSession(list(zip(ids, ["a", "b"])))
+
+    result = asyncio.run(ks.sync_knowledge_file(session, tenant_id, uuid4(), "doc.txt", ["b", "a"]))
+
+    assert (result["embedded"], result["moved"]) == (0, 2)
+    assert sorted(session.updated, key=lambda row: row["chunk_index"]) == [
+        {"id": ids[1], "tenant_id": tenant_id, "chunk_index": 0},
+        {"id": ids[0], "tenant_id": tenant_id, "chunk_index": 1},
+    ]
+
+
+def test_mixing_embedding_models_is_rejected_before_embedding(monkeypatch):
+    monkeypatch.setattr(ks, "get_embeddings", None)  # any embedding call would fail
+    session = FakeSession([], other_model="ollama:nomic-embed-text")
+    backend = get_backend({"backend": "hash"})
+
+    with pytest.raises(EmbeddingMismatchError, match="ollama:nomic-embed-text"):
+        asyncio.run(ks.sync_knowledge_file(session, uuid4(), uuid4(), "doc.txt", ["new"], backend))
+    assert session.inserted == []
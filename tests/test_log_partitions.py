@@ -0,0 +1,35 @@
+from datetime import date
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import log_partitions as lp
+
+
+def test_partition_name():
+    assert lp.partition_name("execution_log", date(2026, 3, 1)) == "execution_log_p202603"
+
+
+def test_expired_partitions_respects_cutoff():
+    names = [
+        "execution_log_p202511",
+        "execution_log_p202512",
+        "execution_log_p202601",
+        "execution_log_default",
+        "execution_step_p202511",
+    ]
+    assert lp.expired_partitions("execution_log", names, date(2026, 1, 1)) == [
+        "execution_log_p202511",
+        "execution_log_p202512",
+    ]
+
+
+def test_add_months_crosses_year():
+    assert lp._add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert lp._add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
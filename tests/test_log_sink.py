@@ -0,0 +1,81 @@
+import asyncio
+import json
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import log_sink as ls
+
+
+def test_json_size_exceeds_matches_serialized_size():
+    small = {"steps": {"a": {"score": 1}}, "status": "complete"}
+    large = {"steps": {str(i): "x" * 100 for i in range(50)}}
+    assert not ls.json_size_exceeds(small, len(json.dumps(small)) + 10)
+    assert ls.json_size_exceeds(large, 1000)
+
+
+def test_json_size_exceeds_rejects_unserializable():
+    with pytest.raises(TypeError):
+        ls.json_size_exceeds({"value": object()}, 1000)
+
+
+def test_sink_batches_and_drains_on_stop(monkeypatch):
+    batches = []
+
+    async def fake_write(records):
+        batches.append(list(records))
+
+    monkeypatch.setattr(ls, "write_records", fake_write)
+
+    async def scenario():
+        sink = ls.ExecutionLogSink(max_queue=100, batch_size=3, flush_interval=0.05)
+        sink.start()
+        for i in range(7):
+            await sink.submit({"n": i})
+        await asyncio.sleep(0.2)
+        await sink.submit({"n": 7})
+        await sink.stop()
+
+    asyncio.run(scenario())
+    flat = [r["n"] for batch in batches for r in batch]
+    assert flat == list(range(8))
+    assert max(len(b) for b in batches) <= 3
+
+
+def test_sink_writes_inline_when_not_started(monkeypatch):
+    batches = []
+
+    async def fake_write(records):
+        batches.append(records)
+
+    monkeypatch.setattr(ls, "write_records", fake_write)
+    sink = ls.ExecutionLogSink(max_queue=10, batch_size=5, flush_interval=1)
+    asyncio.run(sink.submit({"n": 1}))
+    assert batches == [[{"n": 1}]]
+
+
+def test_failed_batch_is_retried_in_halves(monkeypatch):
+    attempts = []
+    written = []
+
+    async def fake_batch(records):
+        attempts.append(len(records))
+        if any(r.get("bad") for r in records):
+            raise ValueError("bad record")
+        written.extend(r["n"] for r in records)
+
+    monkeypatch.setattr(ls, "_write_batch", fake_batch)
+    dropped = ls.LOG_RECORDS_DROPPED._value.get()
+    records = [{"n": i, "bad": i == 5} for i in range(8)]
+    asyncio.run(ls.write_records(records))
+    assert sorted(written) == [0, 1, 2, 3, 4, 6, 7]
+    assert ls.LOG_RECORDS_DROPPED._value.get() == dropped + 1
+    assert attempts == [8, 4, 4, 2, 1, 1, 2]
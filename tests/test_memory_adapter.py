@@ -29,7 +29,7 @@ class FakeSession:
     def __init__(self):
         self.added = []
         self.committed = False
-        self.agent = SimpleNamespace(id=uuid4(), tenant_id=uuid4())
+        self.agent = SimpleNamespace(id=uuid4(), tenant_id=uuid4(), config={})
         now = datetime.utcnow()
         self.chat_rows = [
             {
@@ -53,12 +53,14 @@ class FakeSession:
                 "created_at": now - timedelta(minutes=5),
             }
         ]
+        self.open = 0
 
     async def __aenter__(self):
+        self.open += 1
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        pass
+        self.open -= 1
 
     async def execute(self, stmt):
         sql = str(stmt)
@@ -84,22 +86,27 @@ class FakeSession:
 def test_store_message(monkeypatch):
     session = FakeSession()
     monkeypatch.setattr(ma, "SessionLocal", lambda: session)
+    sessions_open = []
 
-    async def fake_embed(text):
+    async def fake_embed(text, backend=None):
+        sessions_open.append(session.open)
         return [0.0] * 1536
 
     monkeypatch.setattr(ma, "get_embedding", fake_embed)
 
     asyncio.run(ma.store_message(session.agent.id, "user", "hello"))
     assert session.added, "message not added"
+    assert session.added[0].embedding_model == "openai:text-embedding-3-small"
     assert session.committed
+    assert sessions_open == [0]
 
 
 def test_fetch_context_for_agent(monkeypatch):
     session = FakeSession()
     monkeypatch.setattr(ma, "SessionLocal", lambda: session)
+    monkeypatch.setattr(ma, "ReadSessionLocal", lambda: session)
 
-    async def fake_embed(text):
+    async def fake_embed(text, backend=None):
         return [0.0] * 1536
 
     monkeypatch.setattr(ma, "get_embedding", fake_embed)
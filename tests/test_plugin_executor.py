@@ -0,0 +1,187 @@
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import plugin_executor as pe
+
+LOOP_FOREVER = "x = 0\nwhile True:\n    x += 1\n"
+
+
+def _pool(**overrides):
+    options = dict(size=1, timeout=5, cpu_seconds=5, memory_mb=0, max_tasks=100, tenant_concurrency=2)
+    options.update(overrides)
+    return pe.PluginWorkerPool(**options)
+
+
+def test_run_plugin_uses_worker_pool(monkeypatch):
+    monkeypatch.setattr(pe, "plugin_pool", _pool())
+
+    async def scenario():
+        try:
+            return await pe.run_plugin("output = {'total': sum(input['values'])}", {"values": [1, 2, 3]})
+        finally:
+            await pe.plugin_pool.close()
+
+    assert asyncio.run(scenario()) == {"total": 6}
+
+
+def test_run_plugin_rejects_forbidden_code():
+    with pytest.raises(ValueError):
+        asyncio.run(pe.run_plugin("import os", {}))
+
+
+def test_timeout_kills_and_replaces_worker():
+    pool = _pool(timeout=0.5)
+
+    async def scenario():
+        try:
+            with pytest.raises(TimeoutError):
+                await pool.run(LOOP_FOREVER, {})
+            return await pool.run("output = 1", {})
+        finally:
+            await pool.close()
+
+    assert asyncio.run(scenario()) == {"result": 1}
+
+
+def test_cpu_limit_terminates_worker():
+    pool = _pool(timeout=10, cpu_seconds=1)
+
+    async def scenario():
+        try:
+            with pytest.raises(RuntimeError):
+                await pool.run(LOOP_FOREVER, {})
+        finally:
+            await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_workers_recycled_after_max_tasks():
+    pool = _pool(max_tasks=2)
+
+    async def scenario():
+        pids = []
+        try:
+            for _ in range(3):
+                await pool.run("output = 1", {})
+                pids.append(next(iter(pool._workers)).process.pid)
+        finally:
+            await pool.close()
+        return pids
+
+    pids = asyncio.run(scenario())
+    assert pids[0] != pids[1] == pids[2]
+
+
+def test_pipe_transfers_run_off_the_event_loop(monkeypatch):
+    pool = _pool()
+    calls = []
+    to_thread = asyncio.to_thread
+
+    async def recording_to_thread(func, *args):
+        calls.append(func.__name__)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(pe.asyncio, "to_thread", recording_to_thread)
+
+    async def scenario():
+        try:
+            return await pool.run("output = {'rows': len(input['rows'])}", {"rows": [0] * 100_000})
+        finally:
+            await pool.close()
+
+    assert asyncio.run(scenario()) == {"rows": 100_000}
+    assert calls == ["send", "recv"]
+
+
+def test_idle_tenant_slots_are_dropped(monkeypatch):
+    pool = _pool(tenant_concurrency=1)
+    seen = []
+
+    async def fake_run(digest, code, mode, payload):
+        seen.append(pool._tenant_slots["t1"])
+        await asyncio.sleep(0)
+        return payload
+
+    monkeypatch.setattr(pool, "_run", fake_run)
+
+    async def scenario():
+        return await asyncio.gather(*(pool.run("output = 1", i, tenant_id="t1") for i in range(3)))
+
+    assert asyncio.run(scenario()) == [0, 1, 2]
+    assert seen[0] is seen[1] is seen[2]
+    assert pool._tenant_slots == {}
+
+
+def test_plugin_errors_are_reported():
+    pool = _pool()
+
+    async def scenario():
+        try:
+            with pytest.raises(RuntimeError, match="ZeroDivisionError"):
+                await pool.run("output = 1 / 0", {})
+        finally:
+            await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_validate_plugin_caches_by_code_hash(monkeypatch):
+    code = "output = input"
+    digest = pe.validate_plugin(code)
+    assert digest == pe.code_hash(code)
+    monkeypatch.setattr(pe, "FORBIDDEN_RE", None)
+    assert pe.validate_plugin(code) == digest
+
+
+def test_batch_plugin_rows_and_columns(monkeypatch):
+    monkeypatch.setattr(pe, "plugin_pool", _pool(size=2))
+    records = [{"amount": i} for i in range(7)]
+
+    async def scenario():
+        try:
+            rows = await pe.run_plugin_batch(
+                "outputs = [{'score': r['amount'] * 2} for r in inputs]", records, batch=True, chunk_size=3
+            )
+            cols = await pe.run_plugin_batch(
+                "outputs = {'score': [a + 1 for a in columns['amount']]}",
+                records,
+                batch=True,
+                columnar=True,
+                chunk_size=3,
+            )
+            # A single-record plugin may use any names, including ``outputs``.
+            legacy = await pe.run_plugin_batch(
+                "outputs = input['amount']\noutput = outputs - 1", records, columnar=True, chunk_size=3
+            )
+            return rows, cols, legacy
+        finally:
+            await pe.plugin_pool.close()
+
+    rows, cols, legacy = asyncio.run(scenario())
+    assert [r["score"] for r in rows] == [i * 2 for i in range(7)]
+    assert [r["score"] for r in cols] == [i + 1 for i in range(7)]
+    assert [r["result"] for r in legacy] == [i - 1 for i in range(7)]
+
+
+def test_batch_plugin_must_return_one_result_per_record(monkeypatch):
+    monkeypatch.setattr(pe, "plugin_pool", _pool())
+
+    async def scenario():
+        try:
+            with pytest.raises(RuntimeError, match="one result per input record"):
+                await pe.run_plugin_batch("outputs = []", [{"a": 1}], batch=True)
+        finally:
+            await pe.plugin_pool.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import profiling
+
+
+def test_percentile_interpolates():
+    assert profiling.percentile([10, 20, 30, 40], 50) == 25
+    assert profiling.percentile([5], 95) == 5
+    assert profiling.percentile([], 50) == 0.0
+
+
+def test_summarize_steps_groups_by_node():
+    steps = [
+        {"node_id": "a", "tool": "t", "duration_ms": d, "queue_wait_ms": 0, "tool_ms": d - 1}
+        for d in (10, 20, 30)
+    ]
+    summary = profiling.summarize_steps(steps)
+    assert summary["a"]["samples"] == 3
+    assert summary["a"]["duration_ms"]["p50"] == 20
+    assert summary["a"]["tool_ms"]["p50"] == 19
+
+
+def test_skipped_steps_are_counted_apart_from_timings():
+    steps = [
+        {"node_id": "a", "status": status, "duration_ms": d, "queue_wait_ms": 0, "tool_ms": d}
+        for status, d in [
+            ("skipped", 0.01), ("skipped", 0.02), ("success", 30), ("skipped", 0.01), ("success", 50)
+        ]
+    ]
+    steps.append({"node_id": "b", "status": "skipped", "duration_ms": 0.01, "queue_wait_ms": 0, "tool_ms": 0})
+    summary = profiling.summarize_steps(steps)
+    assert (summary["a"]["samples"], summary["a"]["skipped"]) == (2, 3)
+    assert summary["a"]["duration_ms"] == {"p50": 40, "p95": 49}
+    assert (summary["b"]["samples"], summary["b"]["skipped"]) == (0, 1)
+    assert summary["b"]["duration_ms"]["p50"] == 0
+
+
+def test_critical_path_and_slack():
+    nodes = ["start", "fast", "slow", "end"]
+    edges = [("start", "fast"), ("start", "slow"), ("fast", "end"), ("slow", "end")]
+    durations = {"start": 5, "fast": 10, "slow": 40, "end": 5}
+    result = profiling.critical_path(nodes, edges, durations)
+    assert result["path"] == ["start", "slow", "end"]
+    assert result["length_ms"] == 50
+    assert result["slack_ms"]["fast"] == 30
+    assert result["slack_ms"]["slow"] == 0
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.schemas.chat import ChatMessage
+from gaigentic_backend.services import llm_chat
+from gaigentic_backend.services import response_cache as rc
+from gaigentic_backend.services.embedding import get_backend
+
+
+def test_lookup_requires_similarity_threshold(monkeypatch):
+    rc.clear()
+    monkeypatch.setattr(rc.settings, "chat_cache_threshold", 0.9)
+    rc.store("agent", 0, [1.0, 0.0], "refunds")
+    rc.store("agent", 0, [0.0, 1.0], "fees")
+    assert rc.lookup("agent", 0, [2.0, 0.2]) == "refunds"
+    assert rc.lookup("agent", 0, [1.0, 1.0]) is None
+    assert rc.lookup("other", 0, [1.0, 0.0]) is None
+
+
+def test_other_generation_and_expired_answers_are_dropped(monkeypatch):
+    rc.clear()
+    now = [0.0]
+    monkeypatch.setattr(rc.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rc.settings, "chat_cache_ttl", 10)
+    rc.store("agent", 1, [1.0, 0.0], "old")
+    assert rc.lookup("agent", 2, [1.0, 0.0]) is None
+    assert "agent" not in rc._answers
+
+    rc.store("agent", 2, [1.0, 0.0], "new")
+    now[0] = 10
+    assert rc.lookup("agent", 2, [1.0, 0.0]) is None
+
+
+def test_size_is_bounded_per_scope(monkeypatch):
+    rc.clear()
+    monkeypatch.setattr(rc.settings, "chat_cache_size", 2)
+    for i in range(3):
+        rc.store("agent", 0, [1.0, float(i)], i)
+    assert [entry.response for entry in rc._answers["agent"]] == [1, 2]
+
+
+def test_total_size_evicts_least_recently_used_scope(monkeypatch):
+    rc.clear()
+    monkeypatch.setattr(rc.settings, "chat_cache_max_entries", 3)
+    rc.store("a", 0, [1.0, 0.0], "a1")
+    rc.store("b", 0, [1.0, 0.0], "b1")
+    rc.store("a", 0, [0.0, 1.0], "a2")
+    assert rc.lookup("b", 0, [1.0, 0.0]) == "b1"
+    rc.store("c", 0, [1.0, 0.0], "c1")
+    rc.store("c", 0, [0.0, 1.0], "c2")
+    assert list(rc._answers) == ["b", "c"]
+    assert rc._size == 3
+    assert rc._answers["c"][0].vector.typecode == "f"
+
+
+def _message(content, role="user"):
+    return ChatMessage(role=role, content=content, timestamp="2024-01-01T00:00:00")
+
+
+def test_chat_reuses_answer_to_paraphrased_question(monkeypatch):
+    rc.clear()
+    calls = []
+
+    async def fake_llm(provider, model, history, options):
+        calls.append(history[-1]["content"])
+        return "Refunds take five days."
+
+    monkeypatch.setattr(llm_chat, "run_llm", fake_llm)
+    monkeypatch.setattr(rc.settings, "chat_cache_threshold", 0.8)
+    agent = SimpleNamespace(id=uuid4(), knowledge_generation=0)
+    backend = get_backend({"backend": "hash"})
+    sme = llm_chat.ChatSME(provider="openai")
+
+    async def ask(content, generation=0, history=()):
+        agent.knowledge_generation = generation
+        return await sme.chat([*history, _message(content)], agent=agent, backend=backend)
+
+    first = asyncio.run(ask("How long does a refund take?"))
+    assert asyncio.run(ask("how long does a refund take")) is first
+    assert calls == ["How long does a refund take?"]
+
+    asyncio.run(ask("How long does a refund take?", generation=1))
+    asyncio.run(ask("How long does a refund take?", history=[_message("Hi"), _message("Hello", "assistant")]))
+    asyncio.run(ask("Which cards do you issue?"))
+    assert len(calls) == 4
+
+    short = llm_chat.ChatSME(provider="openai", max_tokens=16)
+    asyncio.run(short.chat([_message("How long does a refund take?")], agent=agent, backend=backend))
+    assert len(calls) == 5
@@ -0,0 +1,58 @@
+import asyncio
+import os
+import sys
+from uuid import UUID
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import tenant_partitions as tp
+
+TENANT = UUID("12345678-1234-5678-1234-567812345678")
+
+
+class FakeResult:
+    rowcount = 3
+
+
+class FakeConnection:
+    def __init__(self, existing=()):
+        self.dialect = type("Dialect", (), {"name": "postgresql"})()
+        self.existing = set(existing)
+        self.statements = []
+
+    async def scalar(self, stmt, params=None):
+        return params["name"] in self.existing
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt))
+        return FakeResult()
+
+
+def test_partition_name_matches_migration():
+    assert tp.partition_name("knowledge_chunk", TENANT) == "knowledge_chunk_t12345678123456781234567812345678"
+
+
+def test_missing_partitions_are_filled_from_default_then_attached():
+    conn = FakeConnection(existing={tp.partition_name("message_history", TENANT)})
+
+    created = asyncio.run(tp.ensure_tenant_partitions(conn, TENANT))
+
+    name = tp.partition_name("knowledge_chunk", TENANT)
+    assert created == [name]
+    create, move, attach = conn.statements[1:]
+    assert create.startswith(f'CREATE TABLE "{name}" (LIKE knowledge_chunk')
+    assert "DELETE FROM knowledge_chunk_default" in move
+    assert "text_tsv" not in move  # generated column
+    assert attach == f"ALTER TABLE knowledge_chunk ATTACH PARTITION \"{name}\" FOR VALUES IN ('{TENANT}')"
+
+
+def test_other_dialects_are_skipped():
+    conn = FakeConnection()
+    conn.dialect.name = "sqlite"
+    assert asyncio.run(tp.ensure_tenant_partitions(conn, TENANT)) == []
+    assert conn.statements == []
@@ -0,0 +1,129 @@
+import asyncio
+import importlib.util
+import os
+import sqlite3
+import sys
+from types import SimpleNamespace
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.models.tenant_stats import TenantStats
+from gaigentic_backend.routes import analytics
+from gaigentic_backend.services import tenant_stats as ts
+
+VERSIONS = os.path.join(
+    os.path.dirname(__file__), "..", "backend", "gaigentic_backend", "migrations", "versions"
+)
+
+
+class FakeSession:
+    def __init__(self, rowcount=1, stats=None):
+        self.rowcount = rowcount
+        self.stats = stats
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(rowcount=self.rowcount)
+
+    async def get(self, model, key):
+        return self.stats
+
+
+def _sql(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_bump_adds_deltas_in_one_upsert():
+    session = FakeSession()
+    asyncio.run(ts.bump_tenant_stats(session, uuid4(), executions=3, duration_ms=120))
+
+    (stmt,) = session.statements
+    sql = _sql(stmt)
+    assert "ON CONFLICT (tenant_id) DO UPDATE" in sql
+    assert "execution_count = (tenant_stats.execution_count + excluded.execution_count)" in sql
+    params = stmt.compile().params
+    assert (params["execution_count"], params["total_duration_ms"], params["agent_count"]) == (3, 120, 0)
+
+
+@pytest.mark.parametrize("rowcount, counted", [(1, True), (0, False)])
+def test_ingested_file_is_counted_only_when_new(rowcount, counted):
+    session = FakeSession(rowcount=rowcount)
+    assert asyncio.run(ts.record_ingested_file(session, uuid4(), "march.csv")) is counted
+
+    assert "ON CONFLICT (tenant_id, source_file_name) DO NOTHING" in _sql(session.statements[0])
+    assert len(session.statements) == (2 if counted else 1)
+    if counted:
+        assert session.statements[1].compile().params["ingested_file_count"] == 1
+
+
+def _migration_sql(filename):
+    spec = importlib.util.spec_from_file_location(filename, os.path.join(VERSIONS, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    statements = []
+    module.op = SimpleNamespace(
+        execute=statements.append, create_table=lambda *a, **k: None, create_index=lambda *a, **k: None
+    )
+    module.upgrade()
+    return statements
+
+
+def test_backfill_counts_existing_rows():
+    db = sqlite3.connect(":memory:")
+    db.executescript(
+        """
+        CREATE TABLE tenant (id TEXT);
+        CREATE TABLE agent (tenant_id TEXT);
+        CREATE TABLE transactions (tenant_id TEXT, source_file_name TEXT);
+        CREATE TABLE execution_log (tenant_id TEXT, duration_ms INTEGER);
+        CREATE TABLE tenant_stats (
+            tenant_id TEXT, agent_count INT, ingested_file_count INT, execution_count INT, total_duration_ms INT
+        );
+        CREATE TABLE ingested_file (tenant_id TEXT, source_file_name TEXT);
+        INSERT INTO tenant VALUES ('a'), ('b');
+        INSERT INTO agent VALUES ('a'), ('a');
+        INSERT INTO transactions VALUES ('a', 'jan.csv'), ('a', 'jan.csv'), ('a', 'feb.csv');
+        INSERT INTO execution_log VALUES ('a', 100), ('a', 50);
+        """
+    )
+    for sql in _migration_sql("8f3a1c2d9e47_add_tenant_stats_table.py") + _migration_sql(
+        "b2d6f8a4c1e3_add_ingested_file_table.py"
+    ):
+        db.execute(sql)
+
+    assert db.execute("SELECT * FROM tenant_stats ORDER BY tenant_id").fetchall() == [
+        ("a", 2, 2, 2, 150),
+        ("b", 0, 0, 0, 0),
+    ]
+    assert db.execute("SELECT * FROM ingested_file ORDER BY source_file_name").fetchall() == [
+        ("a", "feb.csv"),
+        ("a", "jan.csv"),
+    ]
+
+
+def test_stats_endpoint_reads_rollup():
+    tenant_id = uuid4()
+    stats = TenantStats(
+        tenant_id=tenant_id, agent_count=2, ingested_file_count=1, execution_count=4, total_duration_ms=1000
+    )
+
+    result = asyncio.run(analytics.tenant_stats(tenant_id, FakeSession(stats=stats), tenant_id, None))
+    assert result == {"agents": 2, "ingested_files": 1, "executions": 4, "avg_duration_ms": 250}
+
+    empty = asyncio.run(analytics.tenant_stats(tenant_id, FakeSession(), tenant_id, None))
+    assert empty == {"agents": 0, "ingested_files": 0, "executions": 0, "avg_duration_ms": 0}
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(analytics.tenant_stats(tenant_id, FakeSession(stats=stats), uuid4(), None))
+    assert exc.value.status_code == 403
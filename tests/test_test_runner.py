@@ -0,0 +1,93 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import test_runner as tr
+
+
+def test_compare_outputs_skips_deepdiff_when_equal(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("DeepDiff should not run")
+
+    monkeypatch.setattr(tr, "DeepDiff", fail)
+    result = tr.compare_outputs({"a": 1, "b": [1, 2]}, {"b": [1, 2], "a": 1})
+    assert result["status"] == "pass"
+
+
+def test_compare_outputs_falls_back_to_deepdiff():
+    assert tr.compare_outputs({"a": [1, 2]}, {"a": [2, 1]})["status"] == "pass"
+    assert tr.compare_outputs({"a": 1}, {"a": 2})["status"] == "fail"
+
+
+def test_run_test_suite_streams_results_and_records_history(monkeypatch):
+    active = 0
+    peak = 0
+    recorded = []
+
+    async def fake_run_workflow(agent_id, context, tenant_id, agent=None, plan=None):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"value": context["n"]}
+
+    async def fake_record(rows):
+        recorded.extend(rows)
+
+    monkeypatch.setattr(tr, "run_workflow", fake_run_workflow)
+    monkeypatch.setattr(tr, "record_test_runs", fake_record)
+    agent = SimpleNamespace(id=uuid4())
+    tests = [
+        SimpleNamespace(id=uuid4(), name=f"t{i}", input_context={"n": i}, expected_output={"value": -1 if i in (2, 5) else i})
+        for i in range(6)
+    ]
+
+    async def scenario():
+        return [event async for event in tr.run_test_suite(agent, None, tests, uuid4(), 2)]
+
+    events = asyncio.run(scenario())
+    summary = events[-1]["summary"]
+    assert peak <= 2
+    assert summary["total"] == 6
+    assert summary["passed"] == 4 and summary["failed"] == 2
+    assert len(recorded) == 6
+    assert len({row["suite_id"] for row in recorded}) == 1
+
+
+def test_single_run_records_errors(monkeypatch):
+    from fastapi import HTTPException
+
+    from gaigentic_backend.routes import testing
+
+    recorded = []
+    agent_id, tenant_id = uuid4(), uuid4()
+    test = SimpleNamespace(agent_id=agent_id, tenant_id=tenant_id, input_context={}, expected_output={})
+
+    class FakeSession:
+        async def get(self, model, key):
+            return test
+
+    async def failing_run_test(*args):
+        raise HTTPException(status_code=400, detail="Invalid node condition")
+
+    async def fake_record(rows):
+        recorded.extend(rows)
+
+    monkeypatch.setattr(testing, "run_test", failing_run_test)
+    monkeypatch.setattr(testing, "record_test_runs", fake_record)
+    test_id = uuid4()
+    with pytest.raises(HTTPException):
+        asyncio.run(testing.run_agent_test(agent_id, test_id, FakeSession(), tenant_id, None, None))
+    assert [(r["test_id"], r["status"]) for r in recorded] == [(test_id, "error")]
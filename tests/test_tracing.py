@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.config import settings
+from gaigentic_backend.services import tracing
+
+
+def test_parse_traceparent():
+    header = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+    assert tracing.parse_traceparent(header) == ("a" * 32, "b" * 16, True)
+    assert tracing.parse_traceparent("00-bad-header-01") is None
+    assert tracing.parse_traceparent(None) is None
+
+
+def test_spans_nest_and_export_to_jsonl(monkeypatch, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "tracing_exporters", ["jsonl"])
+    monkeypatch.setattr(settings, "tracing_file", str(path))
+    monkeypatch.setattr(settings, "tracing_sample_rate", 1.0)
+    monkeypatch.setattr(tracing, "_tracer", tracing._Tracer())
+
+    async def child():
+        with tracing.span("llm.call", provider="openai"):
+            await asyncio.sleep(0)
+
+    async def scenario():
+        token = tracing.set_request_id("req-1")
+        try:
+            with tracing.span("POST /run") as root:
+                await asyncio.gather(child(), child())
+        finally:
+            tracing.reset_request_id(token)
+        await tracing._tracer.flush()
+        return root
+
+    root = asyncio.run(scenario())
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [s["name"] for s in spans] == ["llm.call", "llm.call", "POST /run"]
+    assert {s["trace_id"] for s in spans} == {root.trace_id}
+    assert all(s["parent_id"] == root.span_id for s in spans[:2])
+    assert all(s["attributes"]["request.id"] == "req-1" for s in spans)
+
+
+def test_unsampled_root_suppresses_children(monkeypatch):
+    monkeypatch.setattr(settings, "tracing_exporters", ["jsonl"])
+    monkeypatch.setattr(settings, "tracing_sample_rate", 0.0)
+    monkeypatch.setattr(tracing, "_tracer", tracing._Tracer())
+
+    with tracing.span("GET /health") as root:
+        with tracing.span("db.query") as inner:
+            assert inner.sampled is False
+            assert inner.trace_id == root.trace_id
+    assert tracing._tracer._buffer == []
+
+
+def test_remote_parent_is_continued(monkeypatch):
+    monkeypatch.setattr(settings, "tracing_exporters", ["jsonl"])
+    header = "00-" + "c" * 32 + "-" + "d" * 16 + "-01"
+    with tracing.span("GET /agents", traceparent=header) as root:
+        assert root.trace_id == "c" * 32
+        assert root.parent_id == "d" * 16
+        assert tracing.propagation_headers()["traceparent"].startswith("00-" + "c" * 32)
+
+
+def test_shutdown_closes_otlp_client(monkeypatch):
+    monkeypatch.setattr(settings, "tracing_exporters", ["otlp"])
+    tracer = tracing._Tracer()
+
+    async def scenario():
+        await tracer.flush()  # builds the exporters
+        (exporter,) = tracer._exporters
+        await tracer.shutdown()
+        return exporter
+
+    exporter = asyncio.run(scenario())
+    assert exporter._client.is_closed
+    assert tracer._exporters is None
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import re
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.config import settings
+from gaigentic_backend.models.knowledge_chunk import KnowledgeChunk
+from gaigentic_backend.services import vector_index as vi
+
+QUERY = [0.5, -0.1, 0.0, 0.2] + [0.01] * 1532
+
+
+def _sql(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _configure(monkeypatch, precision, dimensions=1536):
+    monkeypatch.setattr(settings, "vector_index_precision", precision)
+    monkeypatch.setattr(settings, "vector_index_dimensions", dimensions)
+
+
+def test_binary_quantize_keeps_sign_of_leading_dimensions():
+    assert vi.quantize(QUERY, "binary", 4) == "1001"
+    assert vi.quantize(QUERY, "half", 2) == [0.5, -0.1]
+
+
+def test_full_index_orders_by_exact_distance_only(monkeypatch):
+    _configure(monkeypatch, "full")
+    stmt = vi.nearest(select(KnowledgeChunk.text), KnowledgeChunk.embedding, KnowledgeChunk.id, QUERY, 5)
+    assert " IN (" not in _sql(stmt)
+
+
+@pytest.mark.parametrize(
+    "precision, dimensions, operator",
+    [("half", 1536, "<=>"), ("binary", 1536, "<~>"), ("half", 256, "<=>")],
+)
+def test_reduced_index_shortlists_on_index_expression(monkeypatch, precision, dimensions, operator):
+    _configure(monkeypatch, precision, dimensions)
+    monkeypatch.setattr(settings, "vector_rerank_candidates", 40)
+    stmt = vi.nearest(
+        select(KnowledgeChunk.text), KnowledgeChunk.embedding, KnowledgeChunk.id, QUERY, 5, max_distance=0.3
+    )
+
+    sql = _sql(stmt)
+    indexed = re.search(r"hnsw \(\((.*)\) \w+\)$", vi.index_ddl("knowledge_chunk")).group(1)
+    assert f"ORDER BY {indexed.replace('embedding', 'knowledge_chunk.embedding')} {operator}" in sql
+    assert re.search(r"ORDER BY knowledge_chunk.embedding <=> \S+\s+LIMIT \S+$", sql)
+    assert stmt.compile(dialect=postgresql.dialect()).params["param_2"] == 40
+
+
+def test_invalid_configuration_is_rejected():
+    with pytest.raises(ValueError):
+        vi.index_ddl("knowledge_chunk", "int8")
+    with pytest.raises(ValueError):
+        vi.index_ddl("knowledge_chunk", "half", 2048)
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt))
+
+
+@pytest.mark.parametrize("limit, ef_search", [(5, 100), (300, 300), (5000, 1000)])
+def test_widen_scan_raises_ef_search_to_the_shortlist(monkeypatch, limit, ef_search):
+    monkeypatch.setattr(settings, "vector_rerank_candidates", 100)
+    monkeypatch.setattr(vi, "engine", SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+    session = RecordingSession()
+    asyncio.run(vi.widen_scan(session, limit))
+    assert session.statements == [f"SET LOCAL hnsw.ef_search = {ef_search}"]
+
+
+def test_iterative_scan_keeps_order_unless_reranked(monkeypatch):
+    _configure(monkeypatch, "half")
+    monkeypatch.setattr(settings, "vector_iterative_scan", True)
+    monkeypatch.setattr(vi, "engine", SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+    session = RecordingSession()
+    asyncio.run(vi.widen_scan(session, 5))
+    _configure(monkeypatch, "full")
+    asyncio.run(vi.widen_scan(session, 5))
+    assert session.statements[1::2] == [
+        "SET LOCAL hnsw.iterative_scan = relaxed_order",
+        "SET LOCAL hnsw.iterative_scan = strict_order",
+    ]
+
+
+def test_widen_scan_is_skipped_off_postgres():
+    session = RecordingSession()
+    asyncio.run(vi.widen_scan(session, 5))
+    assert session.statements == []
@@ -0,0 +1,32 @@
+import asyncio
+import os
+import sys
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SUPERAGENT_URL", "http://localhost")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("LLM_PROVIDERS_ENABLED", '["openai"]')
+os.environ.setdefault("APP_ENV", "test")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+from gaigentic_backend.services import workflow_executor as we
+
+
+def test_memory_is_fetched_for_the_run_message(monkeypatch):
+    calls = []
+
+    async def fake_fetch(agent_id, current_user_message, *, tenant_id=None):
+        calls.append((current_user_message, tenant_id))
+        return []
+
+    monkeypatch.setattr(we, "fetch_context_for_agent", fake_fetch)
+    plan = we.WorkflowPlan(order=[], node_map={}, edges_by_source={}, edges_by_target={}, use_memory=True)
+    tenant_id = uuid4()
+
+    async def run(context):
+        return [event async for event in we.run_workflow_stream(uuid4(), context, tenant_id, plan=plan)]
+
+    asyncio.run(run({"message": "Is ACC-1001 overdue?"}))
+    asyncio.run(run({"amount": 12}))
+    assert calls == [("Is ACC-1001 overdue?", tenant_id), ('{"amount": 12}', tenant_id)]